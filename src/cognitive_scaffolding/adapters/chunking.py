@@ -0,0 +1,68 @@
+"""Token-budget text chunking for RAG ingestion.
+
+Tokens are approximated as whitespace-delimited words, which tracks
+subword-tokenizer counts closely enough for sizing embedding inputs without
+pulling in a tokenizer dependency. Chunks are sliced from the original text,
+so newlines and spacing inside a chunk are preserved.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import List, Optional
+
+_TOKEN = re.compile(r"\S+")
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of chunk text, insensitive to whitespace differences."""
+    normalized = " ".join(text.split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class TextChunker:
+    """Splits text into windows of at most ``max_tokens`` with ``overlap`` tokens shared.
+
+    Args:
+        max_tokens: Token budget per chunk
+        overlap: Tokens repeated at the start of the next chunk (< max_tokens);
+            defaults to max_tokens // 8
+        min_chars: Chunks shorter than this are dropped
+    """
+
+    def __init__(self, max_tokens: int = 256, overlap: Optional[int] = None, min_chars: int = 10):
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be >= 1")
+        if overlap is None:
+            overlap = max_tokens // 8
+        if not 0 <= overlap < max_tokens:
+            raise ValueError("overlap must be >= 0 and < max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+        self.min_chars = min_chars
+
+    @staticmethod
+    def count_tokens(text: str) -> int:
+        return len(_TOKEN.findall(text))
+
+    def split(self, text: str) -> List[str]:
+        spans = [m.span() for m in _TOKEN.finditer(text)]
+        if not spans:
+            return []
+        if len(spans) <= self.max_tokens:
+            chunk = text[spans[0][0]:spans[-1][1]]
+            return [chunk] if len(chunk) >= self.min_chars else []
+
+        chunks = []
+        step = self.max_tokens - self.overlap
+        start = 0
+        while start < len(spans):
+            window = spans[start:start + self.max_tokens]
+            chunk = text[window[0][0]:window[-1][1]]
+            if len(chunk) >= self.min_chars:
+                chunks.append(chunk)
+            if start + self.max_tokens >= len(spans):
+                break
+            start += step
+        return chunks
@@ -0,0 +1,211 @@
+"""Columnar exporter - streams flat rows to typed, columnar batch files.
+
+Consumes any iterable of flat dicts (ETLAdapter.format_many() output,
+ExperimentRunner.rows(), ...) and writes them in fixed-size batches so a
+million-row export never holds more than one batch in memory.
+
+Formats:
+- "parquet": Arrow record batches via pyarrow (one row group per batch)
+- "numpy":   NumPy structured arrays, one ``part-NNNNN.npy`` file per batch
+- "csv":     stdlib csv, flushed after each batch (always available)
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+FORMATS = ("parquet", "numpy", "csv")
+DEFAULT_BATCH_SIZE = 10_000
+
+
+def default_format() -> str:
+    """Best columnar format available in this environment."""
+    if PYARROW_AVAILABLE:
+        return "parquet"
+    if NUMPY_AVAILABLE:
+        return "numpy"
+    return "csv"
+
+
+def _batched(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ColumnarExporter:
+    """Writes flat rows as typed columnar batches.
+
+    Args:
+        schema: Column name -> logical type ("str", "int", "float", "bool", "list"),
+            e.g. ETLAdapter.schema(). Columns missing from a row are written as null.
+        format: One of FORMATS; defaults to the best one installed.
+        batch_size: Rows per batch / row group / part file.
+    """
+
+    def __init__(
+        self,
+        schema: Dict[str, str],
+        format: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.schema = dict(schema)
+        self.format = format or default_format()
+        if self.format not in FORMATS:
+            raise ValueError(f"Unsupported export format: {self.format}")
+        if self.format == "parquet" and not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow not installed")
+        if self.format == "numpy" and not NUMPY_AVAILABLE:
+            raise ImportError("numpy not installed")
+        self.batch_size = max(1, batch_size)
+
+    def write(self, rows: Iterable[Dict[str, Any]], path: str | Path) -> int:
+        """Stream rows to ``path`` and return the number of rows written.
+
+        For the numpy format ``path`` is a directory of part files.
+        """
+        path = Path(path)
+        batches = _batched(rows, self.batch_size)
+        if self.format == "parquet":
+            return self._write_parquet(batches, path)
+        if self.format == "numpy":
+            return self._write_numpy(batches, path)
+        return self._write_csv(batches, path)
+
+    # ── Value coercion ──────────────────────────────────────────
+
+    def _column(self, batch: List[Dict[str, Any]], name: str) -> List[Any]:
+        kind = self.schema[name]
+        values = []
+        for row in batch:
+            value = row.get(name)
+            if value is not None:
+                if kind == "list":
+                    value = [str(v) for v in value]
+                elif kind == "float":
+                    value = float(value)
+                elif kind == "int":
+                    value = int(value)
+                elif kind == "bool":
+                    value = bool(value)
+                else:
+                    value = str(value)
+            values.append(value)
+        return values
+
+    # ── Parquet ─────────────────────────────────────────────────
+
+    def arrow_schema(self):
+        """The pyarrow schema equivalent of ``self.schema``."""
+        type_map = {
+            "str": pa.string(),
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "bool": pa.bool_(),
+            "list": pa.list_(pa.string()),
+        }
+        return pa.schema([(name, type_map[kind]) for name, kind in self.schema.items()])
+
+    def _write_parquet(self, batches: Iterator[List[Dict[str, Any]]], path: Path) -> int:
+        schema = self.arrow_schema()
+        total = 0
+        with pq.ParquetWriter(str(path), schema) as writer:
+            for batch in batches:
+                arrays = [pa.array(self._column(batch, name), type=field.type)
+                          for name, field in zip(self.schema, schema)]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                total += len(batch)
+        return total
+
+    # ── NumPy ───────────────────────────────────────────────────
+
+    def _numpy_batch(self, batch: List[Dict[str, Any]]):
+        fields = []
+        columns = {}
+        for name, kind in self.schema.items():
+            values = self._column(batch, name)
+            if kind == "float":
+                values = [math.nan if v is None else v for v in values]
+                dtype = "f8"
+            elif kind == "int":
+                values = [0 if v is None else v for v in values]
+                dtype = "i8"
+            elif kind == "bool":
+                values = [bool(v) for v in values]
+                dtype = "?"
+            else:
+                if kind == "list":
+                    values = [json.dumps(v) if v is not None else "" for v in values]
+                else:
+                    values = ["" if v is None else v for v in values]
+                dtype = f"U{max(1, max(len(v) for v in values))}"
+            fields.append((name, dtype))
+            columns[name] = values
+        arr = np.empty(len(batch), dtype=fields)
+        for name in self.schema:
+            arr[name] = columns[name]
+        return arr
+
+    def _write_numpy(self, batches: Iterator[List[Dict[str, Any]]], path: Path) -> int:
+        path.mkdir(parents=True, exist_ok=True)
+        total = 0
+        for i, batch in enumerate(batches):
+            np.save(path / f"part-{i:05d}.npy", self._numpy_batch(batch), allow_pickle=False)
+            total += len(batch)
+        return total
+
+    # ── CSV ─────────────────────────────────────────────────────
+
+    def _write_csv(self, batches: Iterator[List[Dict[str, Any]]], path: Path) -> int:
+        names = list(self.schema)
+        total = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            for batch in batches:
+                columns = [self._column(batch, name) for name in names]
+                for i in range(len(batch)):
+                    writer.writerow([self._csv_value(name, columns[j][i]) for j, name in enumerate(names)])
+                f.flush()
+                total += len(batch)
+        return total
+
+    def _csv_value(self, name: str, value: Any) -> Any:
+        if value is None:
+            return ""
+        if self.schema[name] == "list":
+            return json.dumps(value)
+        return value
+
+
+def read_numpy_parts(path: str | Path) -> Iterator[Any]:
+    """Iterate the structured arrays written by the numpy format, in order."""
+    if not NUMPY_AVAILABLE:
+        raise ImportError("numpy not installed")
+    for part in sorted(Path(path).glob("part-*.npy")):
+        yield np.load(part, allow_pickle=False)
@@ -3,15 +3,57 @@
 Designed for data pipeline ingestion with flat, queryable fields.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator
 
 from cognitive_scaffolding.adapters.base import BaseAdapter
 from cognitive_scaffolding.core.models import ArtifactRecord, LayerName
 
+CONTROL_VECTOR_FIELDS = [
+    "language_level", "abstraction", "rigor", "math_density",
+    "domain_specificity", "cognitive_load", "transfer_distance",
+]
+
 
 class ETLAdapter(BaseAdapter):
     """Formats artifacts as flat structured records for data pipelines."""
 
+    @staticmethod
+    def schema() -> Dict[str, str]:
+        """Column name -> logical type ("str", "int", "float", "bool", "list").
+
+        Ordered exactly as format() emits the columns, so sinks can build
+        typed tables without inspecting rows.
+        """
+        columns: Dict[str, str] = {
+            "artifact_id": "str",
+            "record_id": "str",
+            "topic": "str",
+            "audience_id": "str",
+            "audience_name": "str",
+            "expertise_level": "str",
+            "profile_name": "str",
+            "revision": "int",
+            "created_at": "str",
+            "updated_at": "str",
+        }
+        for field in CONTROL_VECTOR_FIELDS:
+            columns[f"cv_{field}"] = "float"
+        columns["score"] = "float"
+        columns["penalty_applied"] = "bool"
+        columns["penalty_reason"] = "str"
+        columns["missing_required"] = "list"
+        for layer in LayerName:
+            columns[f"layer_{layer.value}_populated"] = "bool"
+            columns[f"layer_{layer.value}_confidence"] = "float"
+        columns["layers_populated"] = "list"
+        columns["num_layers"] = "int"
+        return columns
+
+    def format_many(self, records: Iterable[ArtifactRecord]) -> Iterator[Dict[str, Any]]:
+        """Lazily format a stream of records, one flat row at a time."""
+        for record in records:
+            yield self.format(record)
+
     def format(self, record: ArtifactRecord) -> Dict[str, Any]:
         """Convert artifact to a flat dictionary suitable for ETL pipelines.
 
@@ -35,13 +77,8 @@ class ETLAdapter(BaseAdapter):
 
         # Control vector as flat fields
         cv = artifact.audience.control_vector
-        result["cv_language_level"] = cv.language_level
-        result["cv_abstraction"] = cv.abstraction
-        result["cv_rigor"] = cv.rigor
-        result["cv_math_density"] = cv.math_density
-        result["cv_domain_specificity"] = cv.domain_specificity
-        result["cv_cognitive_load"] = cv.cognitive_load
-        result["cv_transfer_distance"] = cv.transfer_distance
+        for field in CONTROL_VECTOR_FIELDS:
+            result[f"cv_{field}"] = getattr(cv, field)
 
         # Evaluation
         if evaluation:
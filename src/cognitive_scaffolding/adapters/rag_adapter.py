@@ -3,24 +3,109 @@
 Designed for vector store ingestion with rich metadata.
 """
 
-from typing import Any, Dict, List
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 
 from cognitive_scaffolding.adapters.base import BaseAdapter
-from cognitive_scaffolding.core.models import ArtifactRecord, LayerName
+from cognitive_scaffolding.adapters.chunking import TextChunker, content_hash
+from cognitive_scaffolding.core.models import ArtifactRecord, CognitiveArtifact, LayerName
+
+DEFAULT_WRITE_BUFFER = 1 << 20  # 1 MiB
 
 
 class RAGAdapter(BaseAdapter):
-    """Formats artifacts as document chunks with metadata for vector stores."""
+    """Formats artifacts as document chunks with metadata for vector stores.
+
+    Args:
+        chunker: Optional TextChunker; long fields are split into token-budget
+            windows with overlap (chunk IDs gain a ``_<n>`` suffix). Without
+            one, each content field becomes a single chunk.
+        dedupe: Skip chunks whose content hash was already emitted in the
+            same format() / iter_chunks() call, so identical text (e.g.
+            template fallbacks shared across audiences) is embedded once.
+    """
+
+    MIN_CHARS = 10
+
+    def __init__(self, chunker: Optional[TextChunker] = None, dedupe: bool = False):
+        self.chunker = chunker
+        self.dedupe = dedupe
 
     def format(self, record: ArtifactRecord) -> List[Dict[str, Any]]:
         """Convert artifact to a list of document chunks for RAG ingestion.
 
         Each chunk has 'content', 'metadata', and 'chunk_id'.
         """
-        artifact = record.artifact
-        chunks: List[Dict[str, Any]] = []
+        base_metadata = self._base_metadata(record)
+        seen: Optional[Set[str]] = set() if self.dedupe else None
+        return [
+            {
+                "chunk_id": chunk_id,
+                "content": text,
+                "metadata": {
+                    **base_metadata,
+                    "layer": layer,
+                    "field": field,
+                    "confidence": confidence,
+                },
+            }
+            for chunk_id, layer, field, text, confidence in self._iter_fields(record.artifact, seen)
+        ]
+
+    def iter_chunks(
+        self,
+        records: Iterable[ArtifactRecord],
+        seen: Optional[Set[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream chunks across many records without materializing them.
+
+        Unlike format(), per-chunk fields ('layer', 'field', 'confidence') sit
+        at the top level and 'metadata' is one read-only mapping shared by
+        every chunk of the same artifact. Use to_document() (or write_jsonl())
+        to get the format()-shaped dict.
 
-        base_metadata = {
+        With dedupe enabled, content hashes are tracked across the whole batch;
+        pass ``seen`` to carry them across several calls.
+        """
+        if self.dedupe and seen is None:
+            seen = set()
+        elif not self.dedupe:
+            seen = None
+        for record in records:
+            base_metadata = MappingProxyType(self._base_metadata(record))
+            for chunk_id, layer, field, text, confidence in self._iter_fields(record.artifact, seen):
+                yield {
+                    "chunk_id": chunk_id,
+                    "content": text,
+                    "metadata": base_metadata,
+                    "layer": layer,
+                    "field": field,
+                    "confidence": confidence,
+                }
+
+    @staticmethod
+    def to_document(chunk: Mapping[str, Any]) -> Dict[str, Any]:
+        """Expand an iter_chunks() chunk into the format() shape."""
+        return {
+            "chunk_id": chunk["chunk_id"],
+            "content": chunk["content"],
+            "metadata": {
+                **chunk["metadata"],
+                "layer": chunk["layer"],
+                "field": chunk["field"],
+                "confidence": chunk["confidence"],
+            },
+        }
+
+    @staticmethod
+    def _base_metadata(record: ArtifactRecord) -> Dict[str, Any]:
+        artifact = record.artifact
+        return {
             "topic": artifact.topic,
             "audience_id": artifact.audience.audience_id,
             "expertise_level": artifact.audience.expertise_level,
@@ -29,6 +114,16 @@ class RAGAdapter(BaseAdapter):
             "score": artifact.evaluation.overall_score if artifact.evaluation else None,
         }
 
+    def _iter_fields(
+        self,
+        artifact: CognitiveArtifact,
+        seen: Optional[Set[str]] = None,
+    ) -> Iterator[Tuple[str, str, str, str, float]]:
+        """Yield (chunk_id, layer, field, text, confidence) per significant content field.
+
+        Fields are split by the chunker when one is configured; chunks whose
+        hash is already in ``seen`` are skipped (and new hashes added).
+        """
         for layer in LayerName:
             output = artifact.get_layer(layer)
             if output is None:
@@ -37,21 +132,18 @@ class RAGAdapter(BaseAdapter):
             # Create one chunk per significant content field
             for field, value in output.content.items():
                 text = self._to_text(value)
-                if not text or len(text) < 10:
+                if not text or len(text) < self.MIN_CHARS:
                     continue
-
-                chunks.append({
-                    "chunk_id": f"{artifact.artifact_id}_{layer.value}_{field}",
-                    "content": text,
-                    "metadata": {
-                        **base_metadata,
-                        "layer": layer.value,
-                        "field": field,
-                        "confidence": output.confidence,
-                    },
-                })
-
-        return chunks
+                base_id = f"{artifact.artifact_id}_{layer.value}_{field}"
+                pieces = self.chunker.split(text) if self.chunker else [text]
+                for i, piece in enumerate(pieces):
+                    if seen is not None:
+                        digest = content_hash(piece)
+                        if digest in seen:
+                            continue
+                        seen.add(digest)
+                    chunk_id = f"{base_id}_{i}" if len(pieces) > 1 else base_id
+                    yield chunk_id, layer.value, field, piece, output.confidence
 
     @staticmethod
     def _to_text(value: Any) -> str:
@@ -66,3 +158,65 @@ class RAGAdapter(BaseAdapter):
                 parts.append(f"{k}: {v}")
             return "\n".join(parts)
         return str(value) if value else ""
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def write_jsonl(
+    chunks: Iterable[Mapping[str, Any]],
+    path: str | Path,
+    compress: Optional[bool] = None,
+    buffer_size: int = DEFAULT_WRITE_BUFFER,
+) -> int:
+    """Write chunks as JSON Lines (NDJSON), one format()-shaped document per line.
+
+    Accepts both iter_chunks() chunks and format() dicts. Lines are buffered
+    and flushed every ``buffer_size`` characters. Output is gzip-compressed
+    when ``compress`` is true or, if unset, when the path ends in ``.gz``.
+
+    Returns the number of chunks written.
+    """
+    path = Path(path)
+    if compress is None:
+        compress = path.suffix == ".gz"
+    opener = gzip.open if compress else open
+
+    count = 0
+    buffered = 0
+    lines: List[str] = []
+    with opener(path, "wt", encoding="utf-8") as f:
+        for chunk in chunks:
+            doc = RAGAdapter.to_document(chunk) if "layer" in chunk else chunk
+            line = json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+            lines.append(line)
+            buffered += len(line) + 1
+            count += 1
+            if buffered >= buffer_size:
+                f.write("\n".join(lines) + "\n")
+                lines = []
+                buffered = 0
+        if lines:
+            f.write("\n".join(lines) + "\n")
+    return count
+
+
+def read_jsonl(path: str | Path, compress: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+    """Stream documents back from a (optionally gzipped) JSONL file.
+
+    Mirrors write_jsonl(): the file is read as gzip when ``compress`` is true
+    or, if unset, when the path ends in ``.gz`` or starts with the gzip magic
+    bytes (so ``write_jsonl(path, compress=True)`` output reads back as-is).
+    """
+    path = Path(path)
+    if compress is None:
+        if path.suffix == ".gz":
+            compress = True
+        else:
+            with open(path, "rb") as f:
+                compress = f.read(2) == GZIP_MAGIC
+    opener = gzip.open if compress else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
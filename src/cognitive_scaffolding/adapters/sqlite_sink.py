@@ -0,0 +1,169 @@
+"""SQLite sink - bulk-loads ETLAdapter rows into a local SQLite table.
+
+Rows are written in batches with ``executemany`` inside one transaction per
+batch, on a WAL-mode connection tuned for bulk ingestion. The table schema
+is generated from ETLAdapter.schema(), so the fixed cv_* and
+layer_*_populated/confidence columns are real typed columns, not JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from cognitive_scaffolding.adapters.etl_adapter import ETLAdapter
+from cognitive_scaffolding.core.models import ArtifactRecord
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+SQLITE_TYPES = {
+    "str": "TEXT",
+    "int": "INTEGER",
+    "float": "REAL",
+    "bool": "INTEGER",
+    "list": "TEXT",  # JSON-encoded
+}
+
+BULK_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": "-65536",  # 64 MiB
+    "mmap_size": "268435456",  # 256 MiB
+}
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class SQLiteSink:
+    """Streams ArtifactRecords into a SQLite table of flat ETL rows.
+
+    Args:
+        db_path: SQLite database file (created if missing)
+        table: Target table name
+        batch_size: Rows per executemany/commit
+        adapter: ETLAdapter used to flatten records
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        table: str = "artifacts",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        adapter: Optional[ETLAdapter] = None,
+    ):
+        if not _IDENTIFIER.match(table):
+            raise ValueError(f"Invalid table name: {table!r}")
+        self.db_path = Path(db_path)
+        self.table = table
+        self.batch_size = max(1, batch_size)
+        self.adapter = adapter or ETLAdapter()
+        self.schema = ETLAdapter.schema()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # ── Connection ──────────────────────────────────────────────
+
+    def connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.db_path))
+            for name, value in BULK_PRAGMAS.items():
+                self._conn.execute(f"PRAGMA {name}={value}")
+            self._conn.execute(self.create_table_sql())
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> SQLiteSink:
+        self.connect()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ── Schema ──────────────────────────────────────────────────
+
+    def create_table_sql(self) -> str:
+        columns = []
+        for name, kind in self.schema.items():
+            col = f"{name} {SQLITE_TYPES[kind]}"
+            if name == "record_id":
+                col += " PRIMARY KEY"
+            columns.append(col)
+        return f"CREATE TABLE IF NOT EXISTS {self.table} ({', '.join(columns)})"
+
+    def insert_sql(self) -> str:
+        names = list(self.schema)
+        placeholders = ", ".join("?" for _ in names)
+        return f"INSERT OR REPLACE INTO {self.table} ({', '.join(names)}) VALUES ({placeholders})"
+
+    def _to_params(self, row: Dict[str, Any]) -> tuple:
+        params = []
+        for name, kind in self.schema.items():
+            value = row.get(name)
+            if value is not None:
+                if kind == "list":
+                    value = json.dumps(value)
+                elif kind == "bool":
+                    value = int(value)
+            params.append(value)
+        return tuple(params)
+
+    # ── Writing ─────────────────────────────────────────────────
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Write pre-formatted ETL rows; returns the number of rows written."""
+        conn = self.connect()
+        sql = self.insert_sql()
+        total = 0
+        batch: List[tuple] = []
+        for row in rows:
+            batch.append(self._to_params(row))
+            if len(batch) >= self.batch_size:
+                total += self._flush(conn, sql, batch)
+                batch = []
+        if batch:
+            total += self._flush(conn, sql, batch)
+        return total
+
+    def write(self, records: Iterable[ArtifactRecord]) -> int:
+        """Format and write a stream of ArtifactRecords; returns rows written."""
+        return self.write_rows(self.adapter.format_many(records))
+
+    @staticmethod
+    def _flush(conn: sqlite3.Connection, sql: str, batch: List[tuple]) -> int:
+        with conn:
+            conn.executemany(sql, batch)
+        return len(batch)
+
+    # ── Reading ─────────────────────────────────────────────────
+
+    def count(self) -> int:
+        return self.connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def read_rows(self, where: str = "", params: tuple = ()) -> List[Dict[str, Any]]:
+        """Read rows back as dicts, decoding bool and JSON list columns."""
+        conn = self.connect()
+        sql = f"SELECT {', '.join(self.schema)} FROM {self.table}"
+        if where:
+            sql += f" WHERE {where}"
+        rows = []
+        for values in conn.execute(sql, params):
+            row: Dict[str, Any] = {}
+            for (name, kind), value in zip(self.schema.items(), values):
+                if value is not None:
+                    if kind == "list":
+                        value = json.loads(value)
+                    elif kind == "bool":
+                        value = bool(value)
+                row[name] = value
+            rows.append(row)
+        return rows
@@ -0,0 +1,262 @@
+"""Local in-process vector index for RAGAdapter chunks.
+
+An offline stand-in for an external vector DB, for retrieval smoke tests
+and local RAG serving over compiled artifacts:
+
+- HashingEmbedder: signed hashing-trick bag of words/bigrams, optionally
+  TF-IDF weighted at build time. Deterministic, no model download.
+- LocalVectorIndex: exact NumPy top-k for small collections, IVF-style
+  coarse quantizer (spherical k-means lists, probe the nearest few) once
+  the collection exceeds ``ivf_threshold``.
+- save()/load(): vectors persisted as .npy and reopened memory-mapped.
+
+Requires numpy (optional dependency).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from cognitive_scaffolding.adapters.rag_adapter import RAGAdapter, read_jsonl, write_jsonl
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbedder:
+    """Hashing-trick text embedder over unigrams and bigrams.
+
+    Each token is hashed (crc32, stable across processes) into one of ``dim``
+    buckets with a hash-derived sign; counts are log-scaled and the vector is
+    L2-normalized.
+    """
+
+    def __init__(self, dim: int = 1024, bigrams: bool = True):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy not installed")
+        self.dim = dim
+        self.bigrams = bigrams
+
+    def _features(self, text: str) -> List[str]:
+        words = _WORD.findall(text.lower())
+        features = list(words)
+        if self.bigrams:
+            features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+        return features
+
+    def embed_raw(self, text: str):
+        """Unnormalized log-count vector (float32)."""
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            h = zlib.crc32(feature.encode("utf-8"))
+            vec[h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        np.copysign(np.log1p(np.abs(vec)), vec, out=vec)
+        return vec
+
+    def embed(self, text: str, idf=None):
+        vec = self.embed_raw(text)
+        if idf is not None:
+            vec *= idf
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else vec
+
+
+class LocalVectorIndex:
+    """Brute-force / IVF vector index over RAG chunk documents.
+
+    Args:
+        embedder: HashingEmbedder to use (default: 1024-dim)
+        use_idf: Reweight hashed features by inverse document frequency
+        ivf_threshold: Collections at least this large get a coarse quantizer
+        n_lists: Number of IVF lists (default: ~sqrt(n))
+        n_probe: Lists scanned per query in IVF mode
+    """
+
+    META_FILE = "index.json"
+    DOCS_FILE = "docs.jsonl"
+
+    def __init__(
+        self,
+        embedder: Optional[HashingEmbedder] = None,
+        use_idf: bool = True,
+        ivf_threshold: int = 4096,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+    ):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy not installed")
+        self.embedder = embedder or HashingEmbedder()
+        self.use_idf = use_idf
+        self.ivf_threshold = ivf_threshold
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+
+        self.docs: List[Dict[str, Any]] = []
+        self._pending: List[Any] = []
+        self._raw = None  # (n, dim) unweighted vectors, kept so IDF can be recomputed
+        self.vectors = None  # (n, dim) float32, L2-normalized
+        self.idf = None
+        self.centroids = None  # (n_lists, dim) or None when brute force
+        self.assignments = None  # (n,) list id per vector
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @property
+    def is_ivf(self) -> bool:
+        return self.centroids is not None
+
+    # ── Building ────────────────────────────────────────────────
+
+    def add(self, chunks: Iterable[Mapping[str, Any]]) -> int:
+        """Add RAGAdapter chunks (format() dicts or iter_chunks() chunks).
+
+        Call build() before searching. Returns the number of chunks added.
+        """
+        if self.vectors is not None and self._raw is None:
+            raise RuntimeError("Index was loaded from disk and is read-only")
+        added = 0
+        for chunk in chunks:
+            doc = RAGAdapter.to_document(chunk) if "layer" in chunk else dict(chunk)
+            self.docs.append(doc)
+            self._pending.append(self.embedder.embed_raw(doc["content"]))
+            added += 1
+        return added
+
+    def build(self, seed: int = 0, iterations: int = 10) -> None:
+        """Finalize vectors (IDF + normalization) and train the quantizer if needed."""
+        if self._pending:
+            new = np.stack(self._pending).astype(np.float32)
+            self._raw = new if self._raw is None else np.concatenate([self._raw, new])
+            self._pending = []
+        if self._raw is None:
+            return
+
+        weighted = self._raw.copy()
+        if self.use_idf:
+            df = np.count_nonzero(self._raw, axis=0).astype(np.float32)
+            n = self._raw.shape[0]
+            self.idf = (np.log((1.0 + n) / (1.0 + df)) + 1.0).astype(np.float32)
+            weighted *= self.idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.vectors = weighted / norms
+
+        if self.vectors.shape[0] >= self.ivf_threshold:
+            self._train_ivf(seed, iterations)
+        else:
+            self.centroids = None
+            self.assignments = None
+
+    def _train_ivf(self, seed: int, iterations: int) -> None:
+        """Spherical k-means coarse quantizer."""
+        n = self.vectors.shape[0]
+        k = self.n_lists or max(1, int(math.sqrt(n)))
+        k = min(k, n)
+        rng = np.random.default_rng(seed)
+        centroids = self.vectors[rng.choice(n, size=k, replace=False)].copy()
+        assignments = np.zeros(n, dtype=np.int32)
+        for _ in range(iterations):
+            assignments = np.argmax(self.vectors @ centroids.T, axis=1).astype(np.int32)
+            for j in range(k):
+                members = self.vectors[assignments == j]
+                if len(members):
+                    c = members.sum(axis=0)
+                    norm = np.linalg.norm(c)
+                    if norm > 0:
+                        centroids[j] = c / norm
+        self.centroids = centroids.astype(np.float32)
+        self.assignments = assignments
+
+    # ── Querying ────────────────────────────────────────────────
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[float, Dict[str, Any]]]:
+        """Return up to k (cosine score, document) pairs, best first."""
+        if self._pending:
+            self.build()
+        if self.vectors is None or k <= 0:
+            return []
+        q = self.embedder.embed(query, self.idf if self.use_idf else None)
+
+        if self.is_ivf:
+            probe = min(self.n_probe, len(self.centroids))
+            lists = np.argsort(-(self.centroids @ q))[:probe]
+            candidates = np.flatnonzero(np.isin(self.assignments, lists))
+        else:
+            candidates = np.arange(self.vectors.shape[0])
+        if candidates.size == 0:
+            return []
+
+        scores = np.asarray(self.vectors[candidates] @ q)
+        k = min(k, candidates.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), self.docs[int(candidates[i])]) for i in top]
+
+    # ── Persistence ─────────────────────────────────────────────
+
+    def save(self, directory: str | Path) -> None:
+        """Persist vectors (.npy), quantizer, IDF and documents to a directory."""
+        if self._pending:
+            self.build()
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "vectors.npy": np.ascontiguousarray(self.vectors) if self.vectors is not None else None,
+            "idf.npy": self.idf,
+            "centroids.npy": self.centroids if self.is_ivf else None,
+            "assignments.npy": self.assignments if self.is_ivf else None,
+        }
+        for name, array in arrays.items():
+            if array is not None:
+                np.save(directory / name, array)
+            else:
+                # Left over from an earlier save of a different kind of index
+                (directory / name).unlink(missing_ok=True)
+        write_jsonl(self.docs, directory / self.DOCS_FILE)
+        meta = {
+            "dim": self.embedder.dim,
+            "bigrams": self.embedder.bigrams,
+            "use_idf": self.use_idf,
+            "ivf_threshold": self.ivf_threshold,
+            "n_lists": self.n_lists,
+            "n_probe": self.n_probe,
+            "count": len(self.docs),
+        }
+        (directory / self.META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> LocalVectorIndex:
+        """Reopen a saved index; vectors are memory-mapped read-only by default."""
+        directory = Path(directory)
+        meta = json.loads((directory / cls.META_FILE).read_text(encoding="utf-8"))
+        index = cls(
+            embedder=HashingEmbedder(dim=meta["dim"], bigrams=meta["bigrams"]),
+            use_idf=meta["use_idf"],
+            ivf_threshold=meta["ivf_threshold"],
+            n_lists=meta["n_lists"],
+            n_probe=meta["n_probe"],
+        )
+        mode = "r" if mmap else None
+        if (directory / "vectors.npy").exists():
+            index.vectors = np.load(directory / "vectors.npy", mmap_mode=mode)
+        if (directory / "idf.npy").exists():
+            index.idf = np.load(directory / "idf.npy")
+        if (directory / "centroids.npy").exists():
+            index.centroids = np.load(directory / "centroids.npy")
+            index.assignments = np.load(directory / "assignments.npy", mmap_mode=mode)
+        index.docs = list(read_jsonl(directory / cls.DOCS_FILE))
+        return index
@@ -0,0 +1,379 @@
+"""Artifact stores - persist ArtifactRecords outside process memory.
+
+Stores let callers drop full records (13 nested LayerOutputs each) and keep
+only a record_id reference, fetching the record back on demand.
+
+SQLiteArtifactStore is also content-addressed: records put with a
+content_key() - a hash of everything that determines a compile's output -
+can be found again by that key, so the conductor can serve a repeat
+request from disk instead of recompiling it. It can compress records with
+a preset dictionary trained on the records already stored (see
+core.compression).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from cognitive_scaffolding.core.compression import CompressionDictionary, Compressor, is_frame, train_dictionary
+from cognitive_scaffolding.core.models import ArtifactRecord, AudienceControlVector
+from cognitive_scaffolding.core.serialization import is_packed
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactStore(ABC):
+    """Abstract base for ArtifactRecord persistence."""
+
+    @abstractmethod
+    def put(self, record: ArtifactRecord) -> str:
+        """Persist a record and return the ID it can be fetched by."""
+        ...
+
+    @abstractmethod
+    def get(self, record_id: str) -> Optional[ArtifactRecord]:
+        """Fetch a record by ID, or None if it is not stored."""
+        ...
+
+    @abstractmethod
+    def record_ids(self) -> Iterator[str]:
+        """Iterate over all stored record IDs."""
+        ...
+
+    def get_by_key(self, key: str) -> Optional[ArtifactRecord]:
+        """Fetch the record stored under a content_key(), if the store indexes them."""
+        return None
+
+    def __contains__(self, record_id: str) -> bool:
+        return self.get(record_id) is not None
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.record_ids())
+
+
+class FileArtifactStore(ArtifactStore):
+    """One file per record under a root directory.
+
+    Records are written in the compact binary encoding (``<id>.bin``, see
+    ArtifactRecord.to_bytes); ``<id>.json`` files from older versions are
+    still read.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, record_id: str, suffix: str = ".bin") -> Path:
+        return self.root / f"{record_id}{suffix}"
+
+    def put(self, record: ArtifactRecord) -> str:
+        path = self._path(record.record_id)
+        tmp = path.with_suffix(".bin.tmp")
+        tmp.write_bytes(record.to_bytes())
+        tmp.replace(path)
+        self._path(record.record_id, ".json").unlink(missing_ok=True)
+        return record.record_id
+
+    def get(self, record_id: str) -> Optional[ArtifactRecord]:
+        path = self._path(record_id)
+        legacy = self._path(record_id, ".json")
+        try:
+            if path.exists():
+                return ArtifactRecord.from_bytes(path.read_bytes())
+            if legacy.exists():
+                return ArtifactRecord.model_validate_json(legacy.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Failed to load record {record_id}: {e}")
+        return None
+
+    def record_ids(self) -> Iterator[str]:
+        paths = list(self.root.glob("*.bin")) + list(self.root.glob("*.json"))
+        yield from sorted({path.stem for path in paths})
+
+    def __contains__(self, record_id: str) -> bool:
+        return self._path(record_id).exists() or self._path(record_id, ".json").exists()
+
+
+def content_key(
+    topic: str,
+    audience_id: str,
+    profile_name: str,
+    audience_vector: Optional[AudienceControlVector] = None,
+    overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+    model: Optional[str] = None,
+    **extra: Any,
+) -> str:
+    """Hash of the inputs that determine a compiled artifact.
+
+    Two compiles with the same key would produce the same artifact, so a
+    stored record under that key can stand in for a new compile. ``extra``
+    carries any further inputs (e.g. domain_id, fused).
+    """
+    parts = {
+        "topic": topic,
+        "audience_id": audience_id,
+        "profile": profile_name,
+        "vector": audience_vector.model_dump() if audience_vector else None,
+        "overrides": overrides or {},
+        "model": model,
+        **extra,
+    }
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+STORE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+}
+
+DEFAULT_TRAINING_SAMPLES = 200
+
+_COLUMNS = ("record_id", "content_key", "topic", "audience_id", "profile", "score", "revision", "model", "created_at", "body")
+
+
+class SQLiteArtifactStore(ArtifactStore):
+    """Records in one SQLite table, indexed by content key and query columns.
+
+    Each row keeps the encoded record (ArtifactRecord.to_bytes) plus typed columns (topic, audience,
+    profile, overall score, revision, model) for find(). Putting a record
+    whose content key is already stored under another record_id replaces
+    the older record. The store is safe to share between threads.
+
+    With ``compression`` set, bodies are stored as compressed frames using
+    the newest dictionary trained for that codec (train_compression()).
+    Dictionaries are kept in the database, so records written with an
+    older dictionary - or before compression was enabled - stay readable.
+
+    Args:
+        db_path: SQLite database file (created if missing)
+        compression: Codec for new records ("zlib" or "zstd"), or None for JSON
+    """
+
+    def __init__(self, db_path: str | Path, compression: Optional[str] = None):
+        self.db_path = Path(db_path)
+        self.compression = compression
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._dictionaries: List[CompressionDictionary] = []
+        self._compressor: Optional[Compressor] = None
+
+    # ── Connection ──────────────────────────────────────────────
+
+    def connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            for name, value in STORE_PRAGMAS.items():
+                conn.execute(f"PRAGMA {name}={value}")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS records ("
+                    "record_id TEXT PRIMARY KEY, content_key TEXT, topic TEXT, audience_id TEXT, "
+                    "profile TEXT, score REAL, revision INTEGER, model TEXT, created_at TEXT, body BLOB)"
+                )
+                conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS records_content_key ON records (content_key)")
+                conn.execute("CREATE INDEX IF NOT EXISTS records_topic ON records (topic, audience_id)")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS dictionaries ("
+                    "dict_id INTEGER PRIMARY KEY, codec TEXT, data BLOB, created_at TEXT)"
+                )
+            self._dictionaries = [
+                CompressionDictionary(codec, data)
+                for codec, data in conn.execute("SELECT codec, data FROM dictionaries ORDER BY created_at")
+            ]
+            self._conn = conn
+            self._build_compressor()
+        return self._conn
+
+    def _build_compressor(self) -> None:
+        active = next((d for d in reversed(self._dictionaries) if d.codec == self.compression), None)
+        self._compressor = Compressor(active, codec=self.compression or "zlib", known=self._dictionaries)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> SQLiteArtifactStore:
+        self.connect()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ── Writing ─────────────────────────────────────────────────
+
+    def put(self, record: ArtifactRecord, key: Optional[str] = None, model: Optional[str] = None) -> str:
+        """Persist a record, indexed under ``key`` (default: metadata["content_key"])."""
+        metadata = record.artifact.metadata
+        key = key or metadata.get("content_key")
+        if model is None:
+            models = metadata.get("provenance", {}).get("models") or []
+            model = ",".join(models) or None
+        evaluation = record.artifact.evaluation
+        row = (
+            record.record_id,
+            key,
+            record.artifact.topic,
+            record.artifact.audience.audience_id,
+            record.profile_name,
+            evaluation.overall_score if evaluation else None,
+            record.current_revision,
+            model,
+            datetime.now(timezone.utc).isoformat(),
+        )
+        body = record.to_bytes()
+        with self._lock:
+            conn = self.connect()
+            row += (self._encode(body),)
+            with conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO records ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                    row,
+                )
+        return record.record_id
+
+    def _encode(self, body: bytes) -> bytes:
+        if self.compression is None:
+            return body
+        return self._compressor.compress(body)
+
+    def delete(self, record_id: str) -> bool:
+        with self._lock:
+            conn = self.connect()
+            with conn:
+                return conn.execute("DELETE FROM records WHERE record_id = ?", (record_id,)).rowcount > 0
+
+    # ── Reading ─────────────────────────────────────────────────
+
+    def _select(self, column: str, where: str = "", params: tuple = (), suffix: str = "") -> List[Any]:
+        sql = f"SELECT {column} FROM records"
+        if where:
+            sql += f" WHERE {where}"
+        with self._lock:
+            return [row[0] for row in self.connect().execute(sql + suffix, params)]
+
+    def _load(self, body: str | bytes) -> Optional[ArtifactRecord]:
+        # Older rows hold JSON text, or compressed JSON
+        try:
+            if isinstance(body, bytes) and is_frame(body):
+                body = self._compressor.decompress(body)
+            if isinstance(body, bytes) and is_packed(body):
+                return ArtifactRecord.from_bytes(body)
+            return ArtifactRecord.model_validate_json(body)
+        except Exception as e:
+            logger.warning(f"Failed to load stored record: {e}")
+            return None
+
+    def get(self, record_id: str) -> Optional[ArtifactRecord]:
+        bodies = self._select("body", "record_id = ?", (record_id,))
+        return self._load(bodies[0]) if bodies else None
+
+    def get_by_key(self, key: str) -> Optional[ArtifactRecord]:
+        bodies = self._select("body", "content_key = ?", (key,))
+        return self._load(bodies[0]) if bodies else None
+
+    def find(
+        self,
+        topic: Optional[str] = None,
+        audience_id: Optional[str] = None,
+        profile_name: Optional[str] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        revision: Optional[int] = None,
+        min_revision: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[ArtifactRecord]:
+        """Records matching every given filter, best-scoring first.
+
+        Score bounds are inclusive; records without an evaluation never
+        match a score filter.
+        """
+        filters = {
+            "topic = ?": topic,
+            "audience_id = ?": audience_id,
+            "profile = ?": profile_name,
+            "score >= ?": min_score,
+            "score <= ?": max_score,
+            "revision = ?": revision,
+            "revision >= ?": min_revision,
+        }
+        clauses = [clause for clause, value in filters.items() if value is not None]
+        params = tuple(value for value in filters.values() if value is not None)
+        suffix = " ORDER BY score DESC, created_at DESC"
+        if limit is not None:
+            suffix += f" LIMIT {int(limit)}"
+        bodies = self._select("body", " AND ".join(clauses), params, suffix)
+        return [r for r in (self._load(b) for b in bodies) if r is not None]
+
+    def record_ids(self) -> Iterator[str]:
+        yield from self._select("record_id", suffix=" ORDER BY created_at")
+
+    def __contains__(self, record_id: str) -> bool:
+        return bool(self._select("1", "record_id = ?", (record_id,)))
+
+    def __len__(self) -> int:
+        return self._select("COUNT(*)")[0]
+
+    # ── Compression ─────────────────────────────────────────────
+
+    def train_compression(
+        self,
+        codec: Optional[str] = None,
+        sample_size: int = DEFAULT_TRAINING_SAMPLES,
+    ) -> CompressionDictionary:
+        """Train a dictionary on a random sample of stored records and use it for new ones.
+
+        Existing rows are left as they are; call recompress() to rewrite them.
+
+        Raises:
+            ValueError: If the store holds no records to sample.
+        """
+        codec = codec or self.compression or "zlib"
+        bodies = self._select("body", suffix=f" ORDER BY RANDOM() LIMIT {int(sample_size)}")
+        samples = [record.to_bytes() for record in map(self._load, bodies) if record is not None]
+        if not samples:
+            raise ValueError("No stored records to train a compression dictionary on")
+
+        dictionary = train_dictionary(samples, codec)
+        with self._lock:
+            conn = self.connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO dictionaries (dict_id, codec, data, created_at) VALUES (?, ?, ?, ?)",
+                    (dictionary.dict_id, codec, dictionary.data, datetime.now(timezone.utc).isoformat()),
+                )
+            self._dictionaries.append(dictionary)
+            self.compression = codec
+            self._build_compressor()
+        logger.info(f"Trained {codec} dictionary {dictionary.dict_id:#010x} ({len(dictionary.data)} bytes)")
+        return dictionary
+
+    def recompress(self) -> int:
+        """Rewrite every stored body in the current encoding and compression; returns rows rewritten."""
+        with self._lock:
+            conn = self.connect()
+            rows = conn.execute("SELECT record_id, body FROM records").fetchall()
+            updates = []
+            for record_id, body in rows:
+                record = self._load(body)
+                if record is not None:
+                    updates.append((self._encode(record.to_bytes()), record_id))
+            with conn:
+                conn.executemany("UPDATE records SET body = ? WHERE record_id = ?", updates)
+        return len(updates)
+
+    def stored_bytes(self) -> int:
+        """Total size of the stored record bodies."""
+        return self._select("COALESCE(SUM(LENGTH(CAST(body AS BLOB))), 0)")[0]
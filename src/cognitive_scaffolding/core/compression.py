@@ -0,0 +1,216 @@
+"""Dictionary compression for stored artifacts.
+
+Compiled artifacts repeat the same JSON keys, template phrasing and
+fallback boilerplate across topics and audiences, but a single record is
+too small for a compressor to learn much from. A preset dictionary trained
+on a sample of records primes the compressor with that shared material.
+
+Codecs:
+- "zstd": zstandard with a trained dictionary (when zstandard is installed)
+- "zlib": stdlib zlib with a preset dictionary built by train_dictionary()
+
+Compressed frames are self-describing - a codec byte and the dictionary
+ID precede the payload - so a reader holding several dictionaries (e.g.
+after retraining) can decompress frames written with any of them.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import re
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+CODECS = ("zlib", "zstd")
+DEFAULT_LEVELS = {"zlib": 9, "zstd": 9}
+# zlib can only reference the last 32 KiB, so a larger dictionary is wasted
+DICT_SIZES = {"zlib": 32 * 1024, "zstd": 64 * 1024}
+
+_CODEC_IDS = {"zlib": 1, "zstd": 2}
+_HEADER = struct.Struct(">BI")  # codec id, dictionary id (0 = none)
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[^"\x00-\x1f\x7f-\xff]+|[\x00-\x1f\x7f-\xff]+|"')
+_SENTENCE_BREAK = re.compile(rb"(?<=[.?!,;:]) ")
+MIN_FRAGMENT = 8
+MAX_FRAGMENT = 1024
+
+
+def default_codec() -> str:
+    """Best codec available in this environment."""
+    return "zstd" if ZSTD_AVAILABLE else "zlib"
+
+
+def _check_codec(codec: str) -> None:
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported codec: {codec}")
+    if codec == "zstd" and not ZSTD_AVAILABLE:
+        raise ImportError("zstandard not installed")
+
+
+@dataclass(frozen=True)
+class CompressionDictionary:
+    """A trained preset dictionary for one codec."""
+    codec: str
+    data: bytes
+
+    @property
+    def dict_id(self) -> int:
+        return zlib.crc32(self.data) or 1
+
+
+def _train_fragments(samples: List[bytes], size: int) -> bytes:
+    """Build a raw preset dictionary from fragments shared across samples.
+
+    Samples are split into JSON strings, runs of other printable text and
+    runs of binary bytes (the length prefixes of msgpack/marshal encodings);
+    those tokens, adjacent token pairs and the sentence pieces of long text are
+    candidates, scored by the bytes they would save ((documents - 1) *
+    length). The best candidates are packed most-frequent-last, since
+    compressors reach the end of a dictionary most cheaply.
+    """
+    doc_freq: collections.Counter = collections.Counter()
+    for sample in samples:
+        tokens = _TOKEN.findall(sample)
+        pieces = set(tokens)
+        pieces.update(a + b for a, b in zip(tokens, tokens[1:]))
+        for token in tokens:
+            if len(token) > 40:
+                pieces.update(_SENTENCE_BREAK.split(token))
+        doc_freq.update(p for p in pieces if MIN_FRAGMENT <= len(p) <= MAX_FRAGMENT)
+
+    ranked = sorted(
+        ((count - 1) * len(piece), count, piece) for piece, count in doc_freq.items() if count > 1
+    )
+    chosen = []
+    total = 0
+    for _, count, piece in reversed(ranked):
+        if total + len(piece) <= size:
+            chosen.append((count, piece))
+            total += len(piece)
+    chosen.sort()
+    return b"".join(piece for _, piece in chosen)
+
+
+def train_dictionary(
+    samples: Iterable[bytes],
+    codec: Optional[str] = None,
+    size: Optional[int] = None,
+) -> CompressionDictionary:
+    """Train a preset dictionary from sample records (serialized bytes).
+
+    zstd uses zstandard's trainer, falling back to the fragment trainer
+    when there are too few samples for it; zlib always uses the fragment
+    trainer.
+    """
+    codec = codec or default_codec()
+    _check_codec(codec)
+    size = size or DICT_SIZES[codec]
+    samples = list(samples)
+    if codec == "zstd":
+        try:
+            return CompressionDictionary(codec, zstandard.train_dictionary(size, samples).as_bytes())
+        except zstandard.ZstdError as e:
+            logger.info(f"zstd dictionary training failed ({e}), using fragment dictionary")
+    return CompressionDictionary(codec, _train_fragments(samples, size))
+
+
+class Compressor:
+    """Compresses bytes into self-describing frames, optionally with a dictionary.
+
+    Args:
+        dictionary: Preset dictionary for new frames (its codec wins over ``codec``)
+        codec: Codec for new frames when there is no dictionary
+        level: Compression level (default per codec)
+        known: Older dictionaries to accept when decompressing
+    """
+
+    def __init__(
+        self,
+        dictionary: Optional[CompressionDictionary] = None,
+        codec: Optional[str] = None,
+        level: Optional[int] = None,
+        known: Iterable[CompressionDictionary] = (),
+    ):
+        self.codec = dictionary.codec if dictionary else (codec or default_codec())
+        _check_codec(self.codec)
+        self.level = level if level is not None else DEFAULT_LEVELS[self.codec]
+        self.dictionary = dictionary
+        self._dictionaries: Dict[int, CompressionDictionary] = {}
+        for known_dictionary in known:
+            self.add_dictionary(known_dictionary)
+        if dictionary is not None:
+            self.add_dictionary(dictionary)
+        self._local = threading.local()  # zstandard (de)compressors are not thread-safe
+
+    def add_dictionary(self, dictionary: CompressionDictionary) -> None:
+        """Accept frames written with ``dictionary`` in decompress()."""
+        self._dictionaries[dictionary.dict_id] = dictionary
+
+    # ── zstd contexts, one per thread and dictionary ────────────
+
+    def _zstd(self, kind: str, dictionary: Optional[CompressionDictionary]):
+        cache = self._local.__dict__.setdefault(kind, {})
+        key = dictionary.dict_id if dictionary else 0
+        if key not in cache:
+            dict_data = zstandard.ZstdCompressionDict(dictionary.data) if dictionary else None
+            if kind == "compress":
+                cache[key] = zstandard.ZstdCompressor(level=self.level, dict_data=dict_data)
+            else:
+                cache[key] = zstandard.ZstdDecompressor(dict_data=dict_data)
+        return cache[key]
+
+    # ── Frames ──────────────────────────────────────────────────
+
+    def compress(self, data: bytes) -> bytes:
+        dictionary = self.dictionary
+        if self.codec == "zstd":
+            payload = self._zstd("compress", dictionary).compress(data)
+        elif dictionary is not None:
+            compressor = zlib.compressobj(self.level, zdict=dictionary.data)
+            payload = compressor.compress(data) + compressor.flush()
+        else:
+            payload = zlib.compress(data, self.level)
+        header = _HEADER.pack(_CODEC_IDS[self.codec], dictionary.dict_id if dictionary else 0)
+        return header + payload
+
+    def decompress(self, frame: bytes) -> bytes:
+        """Decompress a frame written by any Compressor with a known dictionary.
+
+        Raises:
+            ValueError: If the frame is malformed or its dictionary is unknown.
+        """
+        if len(frame) < _HEADER.size:
+            raise ValueError("Truncated compression frame")
+        codec_id, dict_id = _HEADER.unpack_from(frame)
+        codec = next((name for name, value in _CODEC_IDS.items() if value == codec_id), None)
+        if codec is None:
+            raise ValueError(f"Unknown codec id in compression frame: {codec_id}")
+        dictionary = None
+        if dict_id:
+            dictionary = self._dictionaries.get(dict_id)
+            if dictionary is None:
+                raise ValueError(f"Frame needs unknown compression dictionary {dict_id:#010x}")
+        payload = frame[_HEADER.size:]
+        if codec == "zstd":
+            _check_codec(codec)
+            return self._zstd("decompress", dictionary).decompress(payload)
+        if dictionary is not None:
+            decompressor = zlib.decompressobj(zdict=dictionary.data)
+            return decompressor.decompress(payload) + decompressor.flush()
+        return zlib.decompress(payload)
+
+
+def is_frame(data: bytes) -> bool:
+    """Whether ``data`` looks like a Compressor frame."""
+    return bool(data) and data[0] in _CODEC_IDS.values()
@@ -38,7 +38,8 @@ class DataLoader:
 
     def _ensure_concepts(self) -> Dict[str, Concept]:
         if self._concepts is None:
-            self._concepts = {}
+            # Build fully before publishing so concurrent callers never see a partial cache
+            loaded: Dict[str, Concept] = {}
             concepts_dir = self.data_dir / "concepts"
             if concepts_dir.exists():
                 for f in concepts_dir.glob("*.yaml"):
@@ -46,14 +47,15 @@ class DataLoader:
                     if data:
                         try:
                             concept = Concept(**data)
-                            self._concepts[concept.concept_id] = concept
+                            loaded[concept.concept_id] = concept
                         except Exception as e:
                             logger.warning(f"Invalid concept {f.name}: {e}")
+            self._concepts = loaded
         return self._concepts
 
     def _ensure_audiences(self) -> Dict[str, Audience]:
         if self._audiences is None:
-            self._audiences = {}
+            loaded: Dict[str, Audience] = {}
             audiences_dir = self.data_dir / "audiences"
             if audiences_dir.exists():
                 for f in audiences_dir.glob("*.yaml"):
@@ -63,7 +65,7 @@ class DataLoader:
                         if "audience_id" in data:
                             try:
                                 aud = Audience(**data)
-                                self._audiences[aud.audience_id] = aud
+                                loaded[aud.audience_id] = aud
                             except Exception as e:
                                 logger.warning(f"Invalid audience {f.name}: {e}")
                         else:
@@ -72,14 +74,15 @@ class DataLoader:
                                 if isinstance(val, dict) and "audience_id" in val:
                                     try:
                                         aud = Audience(**val)
-                                        self._audiences[aud.audience_id] = aud
+                                        loaded[aud.audience_id] = aud
                                     except Exception as e:
                                         logger.warning(f"Invalid audience {key} in {f.name}: {e}")
+            self._audiences = loaded
         return self._audiences
 
     def _ensure_domains(self) -> Dict[str, Domain]:
         if self._domains is None:
-            self._domains = {}
+            loaded: Dict[str, Domain] = {}
             domains_dir = self.data_dir / "domains"
             if domains_dir.exists():
                 for f in domains_dir.glob("*.yaml"):
@@ -87,9 +90,10 @@ class DataLoader:
                     if data:
                         try:
                             domain = Domain(**data)
-                            self._domains[domain.domain_id] = domain
+                            loaded[domain.domain_id] = domain
                         except Exception as e:
                             logger.warning(f"Invalid domain {f.name}: {e}")
+            self._domains = loaded
         return self._domains
 
     def get_concept(self, concept_id: str) -> Optional[Concept]:
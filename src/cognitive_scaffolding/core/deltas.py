@@ -0,0 +1,85 @@
+"""Reverse deltas between JSON-style dicts - the storage format of revision history.
+
+A delta produced by ``diff(new, old)`` turns ``new`` back into ``old``:
+
+    {"set": {key: old_value}, "unset": [key, ...], "patch": {key: sub_delta}}
+
+Keys whose values are dicts on both sides are diffed recursively, so a
+revision that regenerates one layer stores only the changed fields of that
+layer - unchanged layers do not appear at all. Empty parts are omitted and
+identical inputs give ``{}``.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict
+
+
+def diff(new: Dict[str, Any], old: Dict[str, Any]) -> Dict[str, Any]:
+    """Reverse delta that turns ``new`` into ``old``."""
+    set_: Dict[str, Any] = {}
+    patch: Dict[str, Any] = {}
+    for key, old_value in old.items():
+        if key not in new:
+            set_[key] = old_value
+        elif new[key] != old_value:
+            if isinstance(old_value, dict) and isinstance(new[key], dict):
+                patch[key] = diff(new[key], old_value)
+            else:
+                set_[key] = old_value
+    unset = [key for key in new if key not in old]
+
+    delta: Dict[str, Any] = {}
+    if set_:
+        delta["set"] = set_
+    if unset:
+        delta["unset"] = unset
+    if patch:
+        delta["patch"] = patch
+    return delta
+
+
+def apply(state: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a delta to ``state`` in place and return it."""
+    for key in delta.get("unset", ()):
+        state.pop(key, None)
+    for key, value in delta.get("set", {}).items():
+        state[key] = copy.deepcopy(value)
+    for key, sub_delta in delta.get("patch", {}).items():
+        apply(state[key], sub_delta)
+    return state
+
+
+def compose(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+    """One delta equivalent to applying ``first`` and then ``second``."""
+    set_ = dict(first.get("set", {}))
+    unset = [key for key in first.get("unset", ()) if key not in set_]
+    patch = dict(first.get("patch", {}))
+
+    for key in second.get("unset", ()):
+        set_.pop(key, None)
+        patch.pop(key, None)
+        if key not in unset:
+            unset.append(key)
+    for key, value in second.get("set", {}).items():
+        patch.pop(key, None)
+        if key in unset:
+            unset.remove(key)
+        set_[key] = value
+    for key, sub_delta in second.get("patch", {}).items():
+        if key in set_:
+            set_[key] = apply(copy.deepcopy(set_[key]), sub_delta)
+        elif key in patch:
+            patch[key] = compose(patch[key], sub_delta)
+        else:
+            patch[key] = sub_delta
+
+    delta: Dict[str, Any] = {}
+    if set_:
+        delta["set"] = set_
+    if unset:
+        delta["unset"] = unset
+    if patch:
+        delta["patch"] = patch
+    return delta
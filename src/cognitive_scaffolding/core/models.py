@@ -3,10 +3,12 @@
 from __future__ import annotations
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin
 from pydantic import BaseModel, Field
 import uuid
 
+from cognitive_scaffolding.core import deltas, serialization
+
 
 class LayerName(str, Enum):
     """Cognitive layers: diagnostic (pre-assessment) + 7 content layers + new layers + synthesis."""
@@ -25,6 +27,9 @@ class LayerName(str, Enum):
     SYNTHESIS = "synthesis"
 
 
+_LAYERS = {layer.value: layer for layer in LayerName}
+
+
 class AudienceControlVector(BaseModel):
     """7-dimensional audience control vector."""
     language_level: float = Field(0.5, ge=0.0, le=1.0, description="Vocabulary complexity (0=simple, 1=expert)")
@@ -67,6 +72,7 @@ class EvaluationResult(BaseModel):
     penalty_reason: Optional[str] = None
     missing_required: List[str] = Field(default_factory=list)
     weights_used: Dict[str, float] = Field(default_factory=dict)
+    degraded_layers: Dict[str, str] = Field(default_factory=dict)  # layer -> "fallback" | "skipped"
 
 
 class CognitiveArtifact(BaseModel):
@@ -121,15 +127,109 @@ class CognitiveArtifact(BaseModel):
             ctx[name] = output.content
         return ctx
 
+    def to_bytes(self, fmt: Optional[str] = None) -> bytes:
+        """Compact binary encoding (see core.serialization); read back with from_bytes()."""
+        return serialization.pack(self._to_plain(), fmt)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> CognitiveArtifact:
+        """Rebuild an artifact from to_bytes() output, skipping validation (trusted data only).
+
+        Layers whose provenance recorded equal config dicts (concept, audience
+        and domain data) share one decoded dict, as in a fresh compile.
+        """
+        return cls._from_plain(serialization.unpack(data))
+
+    def _to_plain(self) -> Dict[str, Any]:
+        plain = self.model_dump(mode="json")
+        # Every layer's provenance config repeats the same concept, audience
+        # and domain dicts; encode each distinct one once
+        shared: List[Dict[str, Any]] = []
+        seen: Dict[str, List[int]] = {}  # config key -> indexes into shared
+        for name in _LAYERS:
+            output = plain[name]
+            if output is None:
+                continue
+            refs = {}
+            config = output["provenance"].get("config")
+            if isinstance(config, dict):
+                for key, value in config.items():
+                    if isinstance(value, dict) and value:
+                        candidates = seen.setdefault(key, [])
+                        index = next((i for i in candidates if shared[i] == value), None)
+                        if index is None:
+                            index = len(shared)
+                            shared.append(value)
+                            candidates.append(index)
+                        refs[key] = index
+                config.update(dict.fromkeys(refs))
+            output["config_refs"] = refs
+        plain["shared"] = shared
+        return plain
+
+    @classmethod
+    def _from_plain(cls, plain: Dict[str, Any]) -> CognitiveArtifact:
+        shared = plain.pop("shared")
+        for name in _LAYERS:
+            output = plain.get(name)
+            if output is not None:
+                config = output["provenance"].get("config")
+                for key, index in output.pop("config_refs").items():
+                    config[key] = shared[index]
+        return _construct(cls, plain)
+
+
+def _revive(annotation: Any, value: Any) -> Any:
+    """Turn the JSON form of a field value back into its annotated type."""
+    if value is None:
+        return None
+    origin = get_origin(annotation)
+    args = [arg for arg in get_args(annotation) if arg is not type(None)]
+    if origin is Union:
+        return _revive(args[0], value) if len(args) == 1 else value
+    if origin is list and args:
+        return [_revive(args[0], item) for item in value]
+    if origin is dict and len(args) == 2:
+        return {key: _revive(args[1], item) for key, item in value.items()}
+    if not isinstance(annotation, type) or annotation is Any:
+        return value
+    if issubclass(annotation, BaseModel) and isinstance(value, dict):
+        return _construct(annotation, value)
+    if issubclass(annotation, datetime) and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if issubclass(annotation, Enum):
+        return annotation(value)
+    return value
+
+
+def _construct(model: type, plain: Dict[str, Any]) -> Any:
+    """Rebuild ``model`` from ``model_dump(mode="json")`` output without validation.
+
+    Nested models, datetimes and enums are revived from each field's
+    annotation, so new fields need no changes here.
+    """
+    fields = model.model_fields
+    return model.model_construct(**{
+        name: _revive(fields[name].annotation, value) if name in fields else value
+        for name, value in plain.items()
+    })
+
 
 class ArtifactRevision(BaseModel):
-    """A single revision in an artifact's history."""
+    """A single revision in an artifact's history.
+
+    ``delta`` is a reverse delta (see core.deltas) that turns the artifact
+    as of this revision back into the artifact as of ``delta_base`` - the
+    previous revision, or an older one once history has been compacted.
+    """
     revision_id: int
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     changed_layers: List[str] = Field(default_factory=list)
     reason: str = ""
     score_before: Optional[float] = None
     score_after: Optional[float] = None
+    delta: Optional[Dict[str, Any]] = None
+    delta_base: Optional[int] = None
 
 
 class ArtifactRecord(BaseModel):
@@ -141,12 +241,80 @@ class ArtifactRecord(BaseModel):
     profile_name: str = ""
 
     def add_revision(self, changed_layers: List[str], reason: str = "",
-                     score_before: Optional[float] = None, score_after: Optional[float] = None) -> None:
-        self.current_revision += 1
-        self.revision_history.append(ArtifactRevision(
-            revision_id=self.current_revision,
+                     score_before: Optional[float] = None, score_after: Optional[float] = None,
+                     before: Optional[Dict[str, Any]] = None) -> None:
+        """Record a revision of the (already updated) artifact.
+
+        ``before`` is ``artifact.model_dump(mode="json")`` taken before the
+        changes; when given, the revision stores a delta back to it so the
+        previous revision can be reconstruct()ed without keeping a full copy.
+        """
+        revision = ArtifactRevision(
+            revision_id=self.current_revision + 1,
             changed_layers=changed_layers,
             reason=reason,
             score_before=score_before,
             score_after=score_after,
-        ))
+        )
+        if before is not None:
+            revision.delta = deltas.diff(self.artifact.model_dump(mode="json"), before)
+            revision.delta_base = self.current_revision
+        self.current_revision += 1
+        self.revision_history.append(revision)
+
+    def to_bytes(self, fmt: Optional[str] = None) -> bytes:
+        """Compact binary encoding (see core.serialization); read back with from_bytes()."""
+        plain = self.model_dump(mode="json", exclude={"artifact"})
+        plain["artifact"] = self.artifact._to_plain()
+        return serialization.pack(plain, fmt)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> ArtifactRecord:
+        """Rebuild a record from to_bytes() output, skipping validation (trusted data only)."""
+        plain = serialization.unpack(data)
+        artifact = CognitiveArtifact._from_plain(plain.pop("artifact"))
+        return _construct(cls, {**plain, "artifact": artifact})
+
+    def reconstruct(self, revision_id: int) -> CognitiveArtifact:
+        """Rebuild the artifact as it was at ``revision_id``.
+
+        Raises:
+            ValueError: If the revision is unknown, predates the recorded
+                deltas, or was squashed away by compact().
+        """
+        if revision_id == self.current_revision:
+            return self.artifact.model_copy(deep=True)
+        by_id = {r.revision_id: r for r in self.revision_history}
+        state = self.artifact.model_dump(mode="json")
+        current = self.current_revision
+        while current > revision_id:
+            revision = by_id.get(current)
+            if revision is None or revision.delta is None or revision.delta_base < revision_id:
+                raise ValueError(f"Revision {revision_id} of record {self.record_id} cannot be reconstructed")
+            deltas.apply(state, revision.delta)
+            current = revision.delta_base
+        return CognitiveArtifact.model_validate(state)
+
+    def compact(self, keep_last: int) -> int:
+        """Squash all but the newest ``keep_last`` revision deltas into one.
+
+        The newest ``keep_last`` revisions stay reconstructable, as does the
+        oldest revision the deltas reach (usually the initial compilation);
+        the revisions in between keep their metadata but lose their content.
+        Returns the number of deltas dropped.
+        """
+        with_delta = [r for r in self.revision_history if r.delta is not None]
+        older = with_delta[:max(0, len(with_delta) - keep_last)]
+        if not older:
+            return 0
+        by_id = {r.revision_id: r for r in self.revision_history}
+        anchor = older[-1]
+        merged, base, dropped = anchor.delta, anchor.delta_base, 0
+        while base in by_id and by_id[base].delta is not None:
+            previous = by_id[base]
+            merged = deltas.compose(merged, previous.delta)
+            base = previous.delta_base
+            previous.delta = previous.delta_base = None
+            dropped += 1
+        anchor.delta, anchor.delta_base = merged, base
+        return dropped
@@ -4,9 +4,11 @@ Score = sum(w_k * x_k) / sum(w_k)
 
 - Disabled layers excluded from both numerator and denominator
 - Required layers that are enabled but empty trigger penalty (0.7 multiplier)
+- Layers a compile deadline degraded are listed in degraded_layers; skipped
+  optional layers score as enabled-but-empty
 """
 
-from typing import Dict
+from typing import Dict, Optional
 from cognitive_scaffolding.core.models import CognitiveArtifact, EvaluationResult, LayerName
 
 
@@ -14,22 +16,38 @@ REQUIRED_PENALTY = 0.7
 
 
 class LayerConfig:
-    """Configuration for a single layer in a profile."""
-    def __init__(self, enabled: bool = True, required: bool = False, weight: float = 1.0):
+    """Configuration for a single layer in a profile.
+
+    ``max_tokens`` caps the layer's generation length (None = client default);
+    ``timeout_ms`` bounds its AI call before the template fallback is used
+    (None = no limit).
+    """
+    def __init__(
+        self,
+        enabled: bool = True,
+        required: bool = False,
+        weight: float = 1.0,
+        max_tokens: Optional[int] = None,
+        timeout_ms: Optional[float] = None,
+    ):
         self.enabled = enabled
         self.required = required
         self.weight = weight
+        self.max_tokens = max_tokens
+        self.timeout_ms = timeout_ms
 
 
 def score_artifact(
     artifact: CognitiveArtifact,
     layer_configs: Dict[str, LayerConfig],
+    degraded_layers: Optional[Dict[str, str]] = None,
 ) -> EvaluationResult:
     """Score an artifact based on its populated layers and profile configuration.
 
     Args:
         artifact: The cognitive artifact to score
         layer_configs: Per-layer configuration (enabled, required, weight)
+        degraded_layers: Layers degraded to meet a deadline ("fallback" / "skipped")
 
     Returns:
         EvaluationResult with overall score and per-layer breakdown
@@ -84,4 +102,5 @@ def score_artifact(
         penalty_reason=penalty_reason,
         missing_required=missing_required,
         weights_used=weights_used,
+        degraded_layers=dict(degraded_layers or {}),
     )
@@ -0,0 +1,91 @@
+"""Compact binary encoding for trusted model data.
+
+Encodes the plain Python tree of a model (dicts, lists, strings, numbers)
+with msgpack when it is installed, or stdlib marshal otherwise. Blobs start
+with a two-byte header (format, layout version) so either reader can tell
+what it was given; a marshal blob stays readable without msgpack.
+
+The loaders in core.models rebuild models with ``model_construct``, skipping
+validation - only decode blobs this application wrote itself.
+"""
+
+from __future__ import annotations
+
+import marshal
+import struct
+from typing import Any, Optional
+
+from pydantic_core import to_jsonable_python
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+FORMATS = ("msgpack", "marshal")
+LAYOUT_VERSION = 1
+
+# Format ids are >= 0x80 so blobs never start like JSON ("{") or a
+# core.compression frame (codec ids 1-2)
+_FORMAT_IDS = {"msgpack": 0x81, "marshal": 0x82}
+_FORMAT_NAMES = {value: name for name, value in _FORMAT_IDS.items()}
+_HEADER = struct.Struct(">BB")
+
+
+def default_format() -> str:
+    """Best encoding available in this environment."""
+    return "msgpack" if MSGPACK_AVAILABLE else "marshal"
+
+
+def _encode(data: Any, fmt: str) -> bytes:
+    if fmt == "msgpack":
+        return msgpack.packb(data, use_bin_type=True)
+    try:
+        return marshal.dumps(data)
+    except ValueError as e:  # marshal rejects subclasses and unknown types
+        raise TypeError(str(e)) from e
+
+
+def pack(data: Any, fmt: Optional[str] = None) -> bytes:
+    """Encode a tree of plain Python values.
+
+    Values neither encoder supports natively (datetimes, enums, ... inside
+    free-form dicts) are converted to their JSON form first.
+    """
+    fmt = fmt or default_format()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported encoding: {fmt}")
+    if fmt == "msgpack" and not MSGPACK_AVAILABLE:
+        raise ImportError("msgpack not installed")
+    try:
+        payload = _encode(data, fmt)
+    except TypeError:
+        payload = _encode(to_jsonable_python(data), fmt)
+    return _HEADER.pack(_FORMAT_IDS[fmt], LAYOUT_VERSION) + payload
+
+
+def unpack(blob: bytes) -> Any:
+    """Decode a blob written by pack().
+
+    Raises:
+        ValueError: If the blob has no recognised header.
+        ImportError: If it is a msgpack blob and msgpack is not installed.
+    """
+    if len(blob) < _HEADER.size:
+        raise ValueError("Truncated encoded blob")
+    format_id, version = _HEADER.unpack_from(blob)
+    fmt = _FORMAT_NAMES.get(format_id)
+    if fmt is None or version != LAYOUT_VERSION:
+        raise ValueError(f"Unrecognised encoding header: {format_id:#x}/{version}")
+    payload = memoryview(blob)[_HEADER.size:]
+    if fmt == "msgpack":
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("msgpack not installed")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    return marshal.loads(payload)
+
+
+def is_packed(blob: bytes) -> bool:
+    """Whether ``blob`` looks like pack() output."""
+    return bool(blob) and blob[0] in _FORMAT_NAMES
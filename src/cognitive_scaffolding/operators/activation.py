@@ -23,11 +23,9 @@ class ActivationOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
-        return f"""Generate attention-activation content for the topic "{topic}".
+        return """Generate attention-activation content for the topic.
 
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Language level: {cv.language_level:.1f}, Cognitive load: {cv.cognitive_load:.1f}
+Calibrate to the brief's language_level and cognitive_load.
 
 Produce a JSON object with these keys:
 - "hook": A compelling opening hook (1-2 sentences)
@@ -2,17 +2,42 @@
 
 from __future__ import annotations
 
+import inspect
 import json
 import logging
 import re
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from cognitive_scaffolding.core.models import AudienceProfile, LayerName, LayerOutput
+from cognitive_scaffolding.operators.streaming import IncrementalJSONParser
+from cognitive_scaffolding.orchestrator.cancellation import CancellationToken
 
 logger = logging.getLogger(__name__)
 
+# AIClient.generate() returns this sentinel instead of raising when the
+# provider fails; such output is never parsed as layer content. utils/ is
+# not part of the installed package, so keep a copy for when it is absent.
+try:
+    from utils.ai_client import FALLBACK_PREFIX as AI_UNAVAILABLE_PREFIX
+except ImportError:
+    AI_UNAVAILABLE_PREFIX = "[AI unavailable:"
+
+# Smallest prompt prefix (in tokens) Anthropic caches for Sonnet/Opus models;
+# shorter system prompts are sent uncached at the normal input price
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+
+def _accepts_cancel_token(method: Callable) -> bool:
+    """Whether an AI client method takes a ``cancel_token`` keyword."""
+    try:
+        parameters = inspect.signature(method).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "cancel_token" or p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters)
+
 
 class BaseOperator(ABC):
     """Abstract base for all cognitive operators.
@@ -24,6 +49,7 @@ class BaseOperator(ABC):
 
     layer_name: LayerName  # Subclasses must set this
     expected_keys: List[str] = []  # Subclasses declare expected output keys
+    depends_on: List[LayerName] = []  # Layers whose context this operator reads
 
     def __init__(self, ai_client=None):
         self.ai_client = ai_client
@@ -46,26 +72,315 @@ class BaseOperator(ABC):
         config = config or {}
         prompt = self.build_prompt(topic, audience, context, config)
 
-        if self.ai_client and self.ai_client.is_available():
-            raw = self.ai_client.generate(prompt)
+        ai_used = False
+        usage = None
+        token = None
+        if self.use_ai(config):
+            system = self.build_system_prompt(topic, audience, config)
+            token = self.layer_token(config)
+            raw, usage = self.call_ai(
+                prompt, system, token, stream=bool(config.get("stream")), **self.generation_options(config),
+            )
+            ai_used = not raw.startswith(AI_UNAVAILABLE_PREFIX)
+            if not ai_used:
+                logger.warning(f"{self.layer_name.value}: AI call failed, using fallback ({raw})")
+                raw = self.generate_fallback(topic, audience, context, config)
         else:
             raw = self.generate_fallback(topic, audience, context, config)
 
-        content = self.parse_output(raw)
-        confidence = self.estimate_confidence(content)
+        output = self.build_output(self.parse_output(raw), ai_used, config, usage)
+        if token is not None and token.cancelled:
+            output.provenance["cancelled"] = token.reason
+        return output
+
+    def execute_stream(
+        self,
+        topic: str,
+        audience: AudienceProfile,
+        context: Dict[str, Any],
+        config: Optional[Dict[str, Any]] = None,
+        on_field: Optional[Callable[[str, Any], None]] = None,
+    ) -> LayerOutput:
+        """Execute with token streaming, reporting top-level fields as they complete.
+
+        ``on_field(key, value)`` is called for each field the moment its JSON
+        value closes. The stream is cancelled as soon as the output stops
+        looking like this operator's schema (not a JSON object, or a key
+        outside expected_keys); fields already delivered are kept and the
+        template fallback fills in the rest.
+        Clients without stream() get a normal execute() whose fields are
+        reported once it finishes.
+        """
+        config = config or {}
+        if not (self.use_ai(config) and hasattr(self.ai_client, "stream")):
+            output = self.execute(topic, audience, context, config)
+            if on_field:
+                for key, value in output.content.items():
+                    on_field(key, value)
+            return output
+
+        prompt = self.build_prompt(topic, audience, context, config)
+        system = self.build_system_prompt(topic, audience, config)
+        parser = IncrementalJSONParser()
+        token = self.layer_token(config)
+        options = self.generation_options(config)
+        if token is not None and token.remaining() is not None:
+            options["timeout"] = token.remaining()
+        chunks = self.ai_client.stream(prompt, system=system, **options)
+        reason = None
+        try:
+            for chunk in chunks:
+                if token is not None and token.cancelled:
+                    reason = token.reason
+                    break
+                if not parser.text and chunk.startswith(AI_UNAVAILABLE_PREFIX):
+                    reason = chunk
+                    break
+                for key, value in parser.feed(chunk):
+                    if self.expected_keys and key not in self.expected_keys:
+                        reason = f"off-schema key {key!r}"
+                        break
+                    if on_field:
+                        on_field(key, value)
+                if reason:
+                    break
+                if parser.failed:
+                    reason = "output is not a JSON object"
+                    break
+                if parser.done:
+                    break
+        except Exception as e:
+            reason = f"stream failed: {e}"
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+        if reason is None and not parser.done:
+            reason = "stream ended before the JSON object closed"
+        if reason is not None:
+            logger.warning(f"{self.layer_name.value}: cancelling streamed output ({reason}), using fallback")
+            fallback = self.parse_output(self.generate_fallback(topic, audience, context, config))
+            delivered = {k: v for k, v in parser.fields.items() if not self.expected_keys or k in self.expected_keys}
+            if on_field:
+                for key, value in fallback.items():
+                    if key not in delivered:
+                        on_field(key, value)
+            output = self.build_output({**fallback, **delivered}, bool(delivered), config)
+            output.provenance["stream_cancelled"] = reason
+        else:
+            usage = getattr(self.ai_client, "last_usage", None)
+            output = self.build_output(parser.fields, True, config, usage)
+        output.provenance["streamed"] = True
+        return output
+
+    def layer_token(self, config: Dict[str, Any]) -> Optional[CancellationToken]:
+        """Token bounding this layer's AI call: the step's ``timeout_ms`` under
+        the compile's ``cancel_token``. None when neither is set."""
+        timeout_ms = config.get("timeout_ms")
+        parent = config.get("cancel_token")
+        if not timeout_ms and parent is None:
+            return None
+        return CancellationToken(timeout_ms=timeout_ms, parent=parent)
+
+    def call_ai(
+        self,
+        prompt: str,
+        system: str,
+        token: Optional[CancellationToken] = None,
+        stream: bool = False,
+        **options: Any,
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Generate with ``options`` and return (text, usage).
+
+        Calls go through generate(), so the client's retries and hedging
+        apply. Under a token the call is cancellable and its SDK timeout is
+        capped at the time left. generate() runs on a helper thread that the
+        caller stops waiting for on cancellation; clients that take a
+        ``cancel_token`` (AIClient) are handed the token too, so that thread
+        stops retrying, closes its HTTP response and leaves the circuit
+        breaker alone instead of running on. With ``stream`` (the step's
+        ``stream`` config, set from the profile's
+        ``settings.stream_responses``) a client with stream() is streamed
+        instead, and the HTTP stream is closed as soon as the token is
+        cancelled. A cancelled call returns the AI-unavailable sentinel so
+        the caller falls back.
+        """
+        if token is not None:
+            if token.cancelled:
+                return f"{AI_UNAVAILABLE_PREFIX} {token.reason}]", None
+            if token.remaining() is not None:
+                options["timeout"] = token.remaining()
+        if stream and hasattr(self.ai_client, "stream"):
+            if token is not None and _accepts_cancel_token(self.ai_client.stream):
+                options["cancel_token"] = token
+            return self._stream_cancellable(prompt, system, token, options)
+        if token is None:
+            text = self.ai_client.generate(prompt, system=system, **options)
+            return text, getattr(self.ai_client, "last_usage", None)
+        if _accepts_cancel_token(self.ai_client.generate):
+            options["cancel_token"] = token
+        return self._wait_cancellable(prompt, system, token, options)
+
+    def _stream_cancellable(
+        self, prompt: str, system: str, token: Optional[CancellationToken], options: Dict[str, Any],
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        parts: List[str] = []
+        chunks = self.ai_client.stream(prompt, system=system, **options)
+        try:
+            for chunk in chunks:
+                if token is not None and token.cancelled:
+                    return f"{AI_UNAVAILABLE_PREFIX} {token.reason}]", None
+                parts.append(chunk)
+        except Exception as e:
+            return f"{AI_UNAVAILABLE_PREFIX} stream failed: {e}]", None
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+        return "".join(parts), getattr(self.ai_client, "last_usage", None)
+
+    def _wait_cancellable(
+        self, prompt: str, system: str, token: CancellationToken, options: Dict[str, Any],
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        result: Dict[str, Any] = {}
+        finished = threading.Event()
+
+        def run() -> None:
+            try:
+                result["usage"] = None
+                result["text"] = self.ai_client.generate(prompt, system=system, **options)
+                result["usage"] = getattr(self.ai_client, "last_usage", None)
+            except Exception as e:
+                result["text"] = f"{AI_UNAVAILABLE_PREFIX} {e}]"
+            finally:
+                finished.set()
+
+        threading.Thread(target=run, name=f"{self.layer_name.value}-ai-call", daemon=True).start()
+        token.add_callback(finished.set)
+        finished.wait(token.remaining())
+        if "text" not in result:
+            reason = token.reason if token.cancelled else "cancelled"
+            return f"{AI_UNAVAILABLE_PREFIX} {reason}]", None
+        return result["text"], result["usage"]
+
+    def use_ai(self, config: Dict[str, Any]) -> bool:
+        """Whether to call the AI client; ``force_fallback`` in the step config
+        (set by the conductor when a compile deadline runs low) says no."""
+        if config.get("force_fallback"):
+            return False
+        return bool(self.ai_client and self.ai_client.is_available())
+
+    def generation_options(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-call AI options: the calling layer, the step's max_tokens budget,
+        and ``hedge`` when the profile asks for it and the client supports it."""
+        options: Dict[str, Any] = {"layer": self.layer_name.value}
+        max_tokens = config.get("max_tokens")
+        if max_tokens:
+            options["max_tokens"] = int(max_tokens)
+        if config.get("hedge") and getattr(self.ai_client, "supports_hedging", False):
+            options["hedge"] = True
+        return options
+
+    def build_output(
+        self,
+        content: Dict[str, Any],
+        ai_used: bool,
+        config: Dict[str, Any],
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> LayerOutput:
+        """Wrap parsed content in a scored LayerOutput with provenance."""
+        provenance = {
+            "operator": self.__class__.__name__,
+            "ai_available": ai_used,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "config": {k: v for k, v in config.items() if k != "cancel_token"},
+        }
+        if isinstance(usage, dict):
+            provenance["usage"] = usage
 
         return LayerOutput(
             layer=self.layer_name,
             content=content,
-            confidence=confidence,
-            provenance={
-                "operator": self.__class__.__name__,
-                "ai_available": bool(self.ai_client and self.ai_client.is_available()),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "config": config,
-            },
+            confidence=self.estimate_confidence(content),
+            provenance=provenance,
         )
 
+    def validate_content(self, content: Any) -> bool:
+        """Check that content is a dict carrying every expected key."""
+        if not isinstance(content, dict) or not content:
+            return False
+        return all(key in content for key in self.expected_keys)
+
+    def build_system_prompt(
+        self,
+        topic: str,
+        audience: AudienceProfile,
+        config: Dict[str, Any],
+    ) -> str:
+        """Build the shared system prefix sent ahead of every layer prompt.
+
+        It depends only on the topic, audience and the concept/domain data the
+        conductor attaches to every step - never on the layer or prior
+        context - so it is byte-identical across all calls of one compile and
+        the provider can serve it from its prompt cache. Layer-specific
+        instructions stay in build_prompt(), which refers back to "the brief"
+        rather than repeating the topic, audience or control vector.
+
+        A bare brief is a few hundred tokens, below PROMPT_CACHE_MIN_TOKENS,
+        the smallest prefix Anthropic will cache; under that minimum the
+        cache_control marker is ignored and the request is billed as an
+        ordinary one, so nothing is lost. Briefs carrying concept and domain
+        data can cross the minimum, and the prefix is not padded to force it.
+        """
+        cv = audience.control_vector
+        lines = [
+            "You are one stage of a cognitive scaffolding compiler that builds layered "
+            "explanations of a single topic for a single audience. Each request asks for "
+            "one layer; keep every layer consistent with this shared brief.",
+            "",
+            f'Topic: "{topic}"',
+            f"Audience: {audience.name} (expertise: {audience.expertise_level})",
+        ]
+        if audience.description:
+            lines.append(f"Audience description: {audience.description}")
+        lines += [
+            "",
+            "Audience control vector (0.0-1.0):",
+        ]
+        for name, field in type(cv).model_fields.items():
+            lines.append(f"- {name}: {getattr(cv, name):.2f} ({field.description})")
+
+        concept = config.get("concept")
+        if concept:
+            lines += ["", f"Concept: {concept.get('name') or topic}"]
+            if concept.get("description"):
+                lines.append(f"Description: {concept['description']}")
+            for label, key in (
+                ("Key components", "key_components"),
+                ("Common misconceptions", "common_misconceptions"),
+                ("Prerequisites", "prerequisite_concepts"),
+            ):
+                if concept.get(key):
+                    lines.append(f"{label}: {'; '.join(str(v) for v in concept[key])}")
+
+        aud = config.get("audience_data")
+        if aud and aud.get("communication_style"):
+            lines.append(f"Communication style: {aud['communication_style']}")
+
+        domain = config.get("domain")
+        if domain:
+            lines += ["", f"Preferred metaphor domain: {domain.get('name') or domain.get('domain_id')}"]
+            if domain.get("description"):
+                lines.append(f"Domain description: {domain['description']}")
+
+        lines += [
+            "",
+            "Output rules: respond with ONLY a valid JSON object using exactly the keys the "
+            "layer request lists. No markdown fences, no commentary outside the JSON.",
+        ]
+        return "\n".join(lines)
+
     @abstractmethod
     def build_prompt(
         self,
@@ -29,6 +29,7 @@ class ChallengeOperator(BaseOperator):
     """Generates structured challenges calibrated to Bloom's taxonomy levels."""
 
     layer_name = LayerName.CHALLENGE
+    depends_on = [LayerName.DIAGNOSTIC]
     expected_keys = [
         "bloom_level", "challenge_prompt", "scaffolded_hints",
         "difficulty_justification", "expected_struggle_points",
@@ -41,18 +42,11 @@ class ChallengeOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
         bloom = self._select_bloom_level(audience, context)
-        concept = config.get("concept", {})
-        components = concept.get("key_components", []) if concept else []
-
-        components_text = f"\nKey components: {', '.join(c.replace('_', ' ') for c in components)}" if components else ""
 
-        return f"""Design a structured challenge for the topic "{topic}" at Bloom's taxonomy level: {bloom}.
+        return f"""Design a structured challenge for the topic at Bloom's taxonomy level: {bloom}.
 
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Cognitive load tolerance: {cv.cognitive_load:.1f}
-{components_text}
+Respect the brief's cognitive_load tolerance and build on its key components.
 
 Produce a JSON object with:
 - "bloom_level": The Bloom's taxonomy level ("{bloom}")
@@ -39,7 +39,6 @@ class ContextualizationOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
         concept = config.get("concept", {})
         category = (concept.get("category", "") if concept else "").replace("_", " ")
         related = concept.get("related_concepts", []) if concept else []
@@ -48,10 +47,9 @@ class ContextualizationOperator(BaseOperator):
         category_text = f"\nField/category: {category}" if category else ""
         related_text = f"\nRelated concepts: {', '.join(r.replace('_', ' ') for r in related)}" if related else ""
 
-        return f"""Generate big-picture contextualization for the topic "{topic}".
+        return f"""Generate big-picture contextualization for the topic.
 
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Abstraction level: {cv.abstraction:.1f}, Domain specificity: {cv.domain_specificity:.1f}
+Calibrate to the brief's abstraction and domain_specificity.
 Evolution rate: {evolution}
 {category_text}{related_text}
 
@@ -38,19 +38,13 @@ class DiagnosticOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
         concept = config.get("concept", {})
-        prereqs = concept.get("prerequisite_concepts", []) if concept else []
         complexity = concept.get("complexity", "medium") if concept else "medium"
 
-        prereqs_text = f"\nPrerequisite concepts: {', '.join(p.replace('_', ' ') for p in prereqs)}" if prereqs else ""
+        return f"""Perform a diagnostic pre-assessment for the topic against the brief's prerequisites.
 
-        return f"""Perform a diagnostic pre-assessment for the topic "{topic}".
-
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Language level: {cv.language_level:.1f}, Cognitive load: {cv.cognitive_load:.1f}
+Calibrate to the brief's language_level and cognitive_load.
 Topic complexity: {complexity}
-{prereqs_text}
 
 Produce a JSON object with:
 - "knowledge_assessment": Dict mapping each prerequisite to an estimated mastery level ("none", "basic", "solid", "expert")
@@ -17,6 +17,7 @@ class ElaborationOperator(BaseOperator):
     """Selects and deeply elaborates on the most relevant sub-topics."""
 
     layer_name = LayerName.ELABORATION
+    depends_on = [LayerName.DIAGNOSTIC]
     expected_keys = [
         "selected_subtopic", "deep_dive", "connections_to_main",
         "further_reading", "selection_rationale",
@@ -29,20 +30,16 @@ class ElaborationOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
         concept = config.get("concept", {})
         components = concept.get("key_components", []) if concept else []
 
         # Select subtopic based on diagnostic gaps or audience interest
         subtopic = self._select_subtopic(components, audience, context)
-        components_text = f"\nAvailable components: {', '.join(c.replace('_', ' ') for c in components)}" if components else ""
         subtopic_text = f"\nSelected subtopic for deep dive: {subtopic}" if subtopic else ""
 
-        return f"""Provide an in-depth elaboration on a key subtopic of "{topic}".
+        return f"""Provide an in-depth elaboration on a key subtopic of the topic, chosen from the brief's key components.
 
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Domain specificity: {cv.domain_specificity:.1f}, Rigor: {cv.rigor:.1f}
-{components_text}{subtopic_text}
+Calibrate to the brief's domain_specificity and rigor.{subtopic_text}
 
 Produce a JSON object with:
 - "selected_subtopic": The subtopic being elaborated on
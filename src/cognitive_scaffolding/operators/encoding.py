@@ -14,6 +14,7 @@ class EncodingOperator(BaseOperator):
     """Generates memory-consolidation aids: mnemonics, chunking, retrieval cues."""
 
     layer_name = LayerName.ENCODING
+    depends_on = [LayerName.STRUCTURE]
     expected_keys = ["mnemonic", "chunks", "retrieval_cues", "spaced_repetition", "visual_anchor"]
 
     def build_prompt(
@@ -23,17 +24,15 @@ class EncodingOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
         key_terms = []
         if "structure" in context:
             key_terms = list(context["structure"].get("key_terms", {}).keys())
 
         terms_text = f"\nKey terms to encode: {key_terms}" if key_terms else ""
 
-        return f"""Generate memory-consolidation aids for the topic "{topic}".
+        return f"""Generate memory-consolidation aids for the topic.
 
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Cognitive load: {cv.cognitive_load:.1f}, Language level: {cv.language_level:.1f}
+Calibrate to the brief's cognitive_load and language_level.
 {terms_text}
 
 Produce a JSON object with:
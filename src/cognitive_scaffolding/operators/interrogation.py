@@ -14,6 +14,7 @@ class InterrogationOperator(BaseOperator):
     """Generates Socratic questions and deep-processing prompts."""
 
     layer_name = LayerName.INTERROGATION
+    depends_on = [LayerName.METAPHOR, LayerName.STRUCTURE]
     expected_keys = ["socratic_questions", "counterexamples", "edge_cases", "misconception_probes", "synthesis_prompt"]
 
     def build_prompt(
@@ -23,7 +24,6 @@ class InterrogationOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
         prior_layers = []
         if "metaphor" in context:
             limitations = context["metaphor"].get("limitations", [])
@@ -36,10 +36,9 @@ class InterrogationOperator(BaseOperator):
 
         prior_text = "\n".join(prior_layers) if prior_layers else ""
 
-        return f"""Generate deep-processing questions for the topic "{topic}".
+        return f"""Generate deep-processing questions for the topic.
 
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Rigor: {cv.rigor:.1f}, Cognitive load: {cv.cognitive_load:.1f}
+Calibrate to the brief's rigor and cognitive_load.
 {prior_text}
 
 Produce a JSON object with:
@@ -31,6 +31,7 @@ class MetaphorOperator(BaseOperator):
     """Wraps existing MetaphorEngine or generates metaphors via LLM."""
 
     layer_name = LayerName.METAPHOR
+    depends_on = [LayerName.ACTIVATION]
     expected_keys = ["metaphor", "source_domain", "mapping", "limitations", "extension"]
 
     def __init__(self, ai_client=None, engine=None):
@@ -47,7 +48,7 @@ class MetaphorOperator(BaseOperator):
         config = config or {}
 
         # Try the existing engine first
-        if self.engine is not None:
+        if self.engine is not None and not config.get("force_fallback"):
             try:
                 return self._execute_via_engine(topic, audience, context, config)
             except Exception as e:
@@ -102,17 +103,15 @@ class MetaphorOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
         activation_context = ""
         if "activation" in context:
             hook = context["activation"].get("hook", "")
             if hook:
                 activation_context = f"\nBuild on this hook: {hook}"
 
-        return f"""Generate a rich metaphor/analogy for the topic "{topic}".
+        return f"""Generate a rich metaphor/analogy for the topic.
 
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Abstraction level: {cv.abstraction:.1f}, Language level: {cv.language_level:.1f}
+Calibrate to the brief's abstraction and language_level.
 {activation_context}
 
 Produce a JSON object with:
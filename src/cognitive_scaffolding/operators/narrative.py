@@ -30,11 +30,6 @@ class NarrativeOperator(BaseOperator):
         config: Dict[str, Any],
     ) -> str:
         cv = audience.control_vector
-        concept = config.get("concept", {})
-        components = concept.get("key_components", []) if concept else []
-        desc = concept.get("description", topic) if concept else topic
-
-        components_text = f"\nKey components to weave in: {', '.join(c.replace('_', ' ') for c in components)}" if components else ""
 
         # Adjust narrative style based on audience
         if cv.language_level < 0.3:
@@ -44,13 +39,9 @@ class NarrativeOperator(BaseOperator):
         else:
             style_hint = "Use an engaging, accessible story that balances accuracy with readability."
 
-        return f"""Create a narrative-based explanation for the topic "{topic}".
-{desc}
+        return f"""Create a narrative-based explanation for the topic, weaving in the brief's key components.
 
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Language level: {cv.language_level:.1f}, Abstraction: {cv.abstraction:.1f}
 Style guidance: {style_hint}
-{components_text}
 
 Produce a JSON object with:
 - "story": A 2-4 paragraph story that embeds the concept in a temporal sequence
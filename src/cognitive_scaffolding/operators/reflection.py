@@ -14,6 +14,7 @@ class ReflectionOperator(BaseOperator):
     """Generates metacognitive content: calibration, self-assessment, reflection."""
 
     layer_name = LayerName.REFLECTION
+    depends_on = [LayerName.INTERROGATION, LayerName.ENCODING]
     expected_keys = ["calibration_questions", "confidence_check", "misconception_alerts", "connection_prompts", "next_steps"]
 
     def build_prompt(
@@ -23,7 +24,6 @@ class ReflectionOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
         prior = []
         if "interrogation" in context:
             misconceptions = context["interrogation"].get("misconception_probes", [])
@@ -37,10 +37,9 @@ class ReflectionOperator(BaseOperator):
 
         prior_text = "\n".join(prior) if prior else ""
 
-        return f"""Generate metacognitive reflection content for the topic "{topic}".
+        return f"""Generate metacognitive reflection content for the topic.
 
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Rigor: {cv.rigor:.1f}, Cognitive load: {cv.cognitive_load:.1f}
+Calibrate to the brief's rigor and cognitive_load.
 {prior_text}
 
 Produce a JSON object with:
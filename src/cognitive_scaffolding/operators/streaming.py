@@ -0,0 +1,123 @@
+"""Incremental JSON parsing for streamed operator output.
+
+IncrementalJSONParser consumes a top-level JSON object a chunk at a time
+and reports each top-level field as soon as its value is complete, so a
+chatbot can render "hook" while "stakes" is still being generated. It also
+tolerates a leading markdown code fence and flags output that is not a JSON
+object at all, which lets the caller cancel the stream early.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Text allowed before the opening brace: whitespace and an optional ```json fence
+_PREAMBLE = re.compile(r"^\s*(`{1,3}[A-Za-z]*\s*)?$")
+
+
+class IncrementalJSONParser:
+    """Streaming parser for one top-level JSON object.
+
+    feed() returns the (key, value) pairs completed by that chunk. After the
+    closing brace ``done`` is True and ``fields`` holds the whole object.
+    ``failed`` is set once the text can no longer be a JSON object.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self.failed = False
+        self._buf = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._value_done = False
+
+    @property
+    def text(self) -> str:
+        return self._buf
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self._buf += chunk
+        if self.done or self.failed:
+            return []
+        if not self._started:
+            brace = self._buf.find("{")
+            if brace < 0:
+                if not _PREAMBLE.match(self._buf):
+                    self.failed = True
+                return []
+            if not _PREAMBLE.match(self._buf[:brace]):
+                self.failed = True
+                return []
+            self._started = True
+            self._depth = 1
+            self._pos = brace + 1
+        return self._scan()
+
+    def _scan(self) -> List[Tuple[str, Any]]:
+        completed: List[Tuple[str, Any]] = []
+        buf = self._buf
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._key is None and self._value_start is None:
+                            self._key = json.loads(buf[self._string_start:i + 1])
+                        elif self._value_start is not None:
+                            self._emit(buf[self._value_start:i + 1], completed)
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    self._emit(buf[self._value_start:i + 1], completed)
+                elif self._depth == 0:
+                    if self._value_start is not None and not self._value_done:
+                        self._emit(buf[self._value_start:i], completed)
+                    self.done = True
+                    self._pos = i + 1
+                    return completed
+            elif self._depth == 1:
+                if ch == ":" and self._key is not None and self._value_start is None:
+                    self._value_start = i + 1
+                elif ch == ",":
+                    if self._value_start is not None and not self._value_done:
+                        self._emit(buf[self._value_start:i], completed)
+                    self._key = None
+                    self._value_start = None
+                    self._value_done = False
+            if self.failed:
+                return completed
+            i += 1
+        self._pos = i
+        return completed
+
+    def _emit(self, raw: str, completed: List[Tuple[str, Any]]) -> None:
+        if self._value_done:
+            return
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            self.failed = True
+            return
+        self._value_done = True
+        self.fields[self._key] = value
+        completed.append((self._key, value))
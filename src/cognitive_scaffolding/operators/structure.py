@@ -14,6 +14,7 @@ class StructureOperator(BaseOperator):
     """Generates structured, precise content: definitions, taxonomies, diagrams."""
 
     layer_name = LayerName.STRUCTURE
+    depends_on = [LayerName.METAPHOR]
     expected_keys = ["definition", "taxonomy", "key_terms", "relationships", "diagram_description", "formal_notation"]
 
     def build_prompt(
@@ -23,17 +24,15 @@ class StructureOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
         prior = ""
         if "metaphor" in context:
             mapping = context["metaphor"].get("mapping", {})
             if mapping:
                 prior = f"\nBuild on these metaphor mappings: {json.dumps(mapping)}"
 
-        return f"""Generate structured content for the topic "{topic}".
+        return f"""Generate structured content for the topic.
 
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Rigor: {cv.rigor:.1f}, Math density: {cv.math_density:.1f}, Domain specificity: {cv.domain_specificity:.1f}
+Calibrate to the brief's rigor, math_density and domain_specificity.
 {prior}
 
 Produce a JSON object with:
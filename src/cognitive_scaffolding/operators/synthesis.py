@@ -27,11 +27,28 @@ CONTENT_LAYERS = [
     LayerName.ELABORATION,
 ]
 
+# Layer outputs are condensed before synthesis: the prompt carries what to
+# weave together, not every list item and paragraph in full
+SUMMARY_MAX_CHARS = 500
+SUMMARY_MAX_ITEMS = 3
+
+
+def summarize_layer(data: Any) -> Any:
+    """Condense a layer's content: long strings truncated, long lists cut short."""
+    if isinstance(data, dict):
+        return {key: summarize_layer(value) for key, value in data.items() if value not in ("", [], {}, None)}
+    if isinstance(data, list):
+        return [summarize_layer(item) for item in data[:SUMMARY_MAX_ITEMS]]
+    if isinstance(data, str) and len(data) > SUMMARY_MAX_CHARS:
+        return data[:SUMMARY_MAX_CHARS].rstrip() + "..."
+    return data
+
 
 class SynthesisOperator(BaseOperator):
     """Synthesizes all 7 layer outputs into one unified response."""
 
     layer_name = LayerName.SYNTHESIS
+    depends_on = [layer for layer in LayerName if layer != LayerName.SYNTHESIS]
 
     def build_prompt(
         self,
@@ -40,20 +57,19 @@ class SynthesisOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
-
-        # Build a summary of available layer outputs
+        # Build a condensed summary of available layer outputs
         layer_summaries = []
         for layer in CONTENT_LAYERS:
             data = context.get(layer.value)
             if data:
-                layer_summaries.append(f"### {layer.value.title()} Layer\n{json.dumps(data, indent=2)}")
+                summary = json.dumps(summarize_layer(data), ensure_ascii=False, separators=(",", ":"))
+                layer_summaries.append(f"### {layer.value.title()} Layer\n{summary}")
 
         layers_text = "\n\n".join(layer_summaries) if layer_summaries else "(No layer outputs available)"
 
-        return f"""You are synthesizing a cognitive scaffolding artifact about "{topic}" for a {audience.name} audience (expertise: {audience.expertise_level}).
+        return f"""You are synthesizing the cognitive scaffolding artifact for the topic and audience in the brief.
 
-Language level: {cv.language_level:.1f}, Abstraction: {cv.abstraction:.1f}, Cognitive load: {cv.cognitive_load:.1f}
+Calibrate to the brief's language_level, abstraction and cognitive_load.
 
 Below are the outputs from individual cognitive layers. Your job is to weave them into ONE coherent, flowing response — not a list of sections. The layers are ingredients, not chapters.
 
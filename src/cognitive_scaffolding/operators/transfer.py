@@ -14,6 +14,7 @@ class TransferOperator(BaseOperator):
     """Generates application content: examples, problems, real-world scenarios."""
 
     layer_name = LayerName.TRANSFER
+    depends_on = [LayerName.STRUCTURE]
     expected_keys = ["worked_example", "practice_problems", "real_world_applications", "simulation_prompt", "cross_domain_transfer"]
 
     def build_prompt(
@@ -23,17 +24,15 @@ class TransferOperator(BaseOperator):
         context: Dict[str, Any],
         config: Dict[str, Any],
     ) -> str:
-        cv = audience.control_vector
         prior = ""
         if "structure" in context:
             definition = context["structure"].get("definition", "")
             if definition:
                 prior = f"\nCore definition: {definition}"
 
-        return f"""Generate application and transfer content for the topic "{topic}".
+        return f"""Generate application and transfer content for the topic.
 
-Target audience: {audience.name} (expertise: {audience.expertise_level})
-Transfer distance: {cv.transfer_distance:.1f}, Domain specificity: {cv.domain_specificity:.1f}
+Calibrate to the brief's transfer_distance and domain_specificity.
 {prior}
 
 Produce a JSON object with:
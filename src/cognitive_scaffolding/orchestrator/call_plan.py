@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Mapping, Set
 
 from pydantic import BaseModel, Field
 
@@ -16,6 +16,7 @@ class OperatorStep(BaseModel):
     config: Dict[str, Any] = Field(default_factory=dict)
     enabled: bool = True
     required: bool = False
+    weight: float = 1.0
 
 
 class CallPlan(BaseModel):
@@ -32,11 +33,35 @@ class CallPlan(BaseModel):
         """Return steps that are both enabled and required."""
         return [s for s in self.steps if s.enabled and s.required]
 
+    def priority_steps(self) -> List[OperatorStep]:
+        """Enabled steps with required layers first (in plan order), then
+        optional ones by descending weight; plan order breaks ties.
+
+        This ranks layers for keeping their AI call under a compile deadline;
+        steps still execute in plan (dependency) order.
+        """
+        return sorted(self.enabled_steps(), key=lambda s: (0.0, 0.0) if s.required else (1.0, -s.weight))
+
+    def essential_layers(self, depends_on: Mapping[LayerName, Iterable[LayerName]]) -> Set[LayerName]:
+        """Enabled required layers plus every enabled layer they depend on,
+        transitively (``depends_on`` maps a layer to its operator's depends_on)."""
+        enabled = {s.layer for s in self.enabled_steps()}
+        essential: Set[LayerName] = set()
+        stack = [s.layer for s in self.required_steps()]
+        while stack:
+            layer = stack.pop()
+            if layer in essential:
+                continue
+            essential.add(layer)
+            stack.extend(dep for dep in depends_on.get(layer, ()) if dep in enabled)
+        return essential
+
     @classmethod
     def from_layer_configs(cls, layer_configs: dict, profile_name: str = "") -> CallPlan:
         """Build a call plan from layer configurations.
 
-        Uses the standard layer-to-operator mapping.
+        Uses the standard layer-to-operator mapping. A layer's max_tokens
+        budget and timeout_ms are carried in its step config.
         """
         layer_operator_map = {
             LayerName.DIAGNOSTIC: "cognitive_scaffolding.operators.diagnostic.DiagnosticOperator",
@@ -59,11 +84,18 @@ class CallPlan(BaseModel):
             config = layer_configs.get(layer.value)
             if config is None:
                 continue
+            step_config = {}
+            if getattr(config, "max_tokens", None):
+                step_config["max_tokens"] = config.max_tokens
+            if getattr(config, "timeout_ms", None):
+                step_config["timeout_ms"] = config.timeout_ms
             steps.append(OperatorStep(
                 layer=layer,
                 operator_class=layer_operator_map[layer],
+                config=step_config,
                 enabled=config.enabled,
                 required=config.required,
+                weight=config.weight,
             ))
 
         return cls(steps=steps, profile_name=profile_name)
@@ -0,0 +1,96 @@
+"""Cooperative cancellation for compiles and individual layer calls.
+
+A CancellationToken is cancelled explicitly (cancel(), e.g. from a web
+handler when the client disconnects) or implicitly once its timeout
+elapses. Child tokens - one per layer, carrying the layer's timeout_ms -
+are cancelled with their parent, so cancelling a compile's token stops the
+layer in flight as well as every layer after it.
+
+Deadlines are checked lazily (``cancelled``, ``remaining()``, ``wait()``),
+so tokens need no timer threads.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, List, Optional
+
+
+class CompileCancelled(Exception):
+    """Raised by the conductor when a compile's token is cancelled."""
+
+
+class CancellationToken:
+    """Thread-safe cancellation flag with an optional timeout and parent.
+
+    Args:
+        timeout_ms: Cancel automatically this many milliseconds from now
+        parent: Token whose cancellation also cancels this one
+    """
+
+    def __init__(self, timeout_ms: Optional[float] = None, parent: Optional[CancellationToken] = None):
+        self.timeout_ms = timeout_ms
+        self.parent = parent
+        self.reason = ""
+        self._deadline = time.monotonic() + timeout_ms / 1000 if timeout_ms else None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        if parent is not None:
+            parent.add_callback(lambda: self.cancel(parent.reason))
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            self.cancel(f"timed out after {self.timeout_ms:g}ms")
+            return True
+        if self.parent is not None and self.parent.cancelled:
+            self.cancel(self.parent.reason)
+            return True
+        return False
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel the token (first reason wins) and run registered callbacks."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` on cancellation (immediately if already cancelled)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until this token (or an ancestor) times out; None if never."""
+        deadlines = []
+        token: Optional[CancellationToken] = self
+        while token is not None:
+            if token._deadline is not None:
+                deadlines.append(token._deadline)
+            token = token.parent
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled, the token's deadline, or ``timeout``; return ``cancelled``."""
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        self._event.wait(timeout)
+        return self.cancelled
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise CompileCancelled(self.reason)
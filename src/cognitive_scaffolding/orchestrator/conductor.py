@@ -6,26 +6,38 @@ to produce a scored CognitiveArtifact.
 
 from __future__ import annotations
 
+import hashlib
 import importlib
+import json
 import logging
 import time
 import uuid
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from cognitive_scaffolding.core.artifact_store import ArtifactStore, content_key
 from cognitive_scaffolding.core.data_loader import DataLoader
 from cognitive_scaffolding.core.models import (
     ArtifactRecord,
     AudienceControlVector,
     AudienceProfile,
     CognitiveArtifact,
+    LayerName,
+    LayerOutput,
 )
 from cognitive_scaffolding.core.scoring import score_artifact
-from cognitive_scaffolding.orchestrator.call_plan import CallPlan
-from cognitive_scaffolding.orchestrator.provenance import ProvenanceTracker
+from cognitive_scaffolding.orchestrator.call_plan import CallPlan, OperatorStep
+from cognitive_scaffolding.orchestrator.cancellation import CancellationToken, CompileCancelled
+from cognitive_scaffolding.orchestrator.fusion import execute_fused, plan_groups
+from cognitive_scaffolding.orchestrator.provenance import ProvenanceTracker, UsageLedger
+from cognitive_scaffolding.orchestrator.single_flight import SingleFlight
 from cognitive_scaffolding.orchestrator.toggle_manager import ToggleManager
 
 logger = logging.getLogger(__name__)
 
+# Assumed duration of a layer's AI call until the conductor has measured one
+DEFAULT_LAYER_ESTIMATE_MS = 2500.0
+LATENCY_EWMA_ALPHA = 0.3
+
 
 # Default audience control vectors for common audience types
 DEFAULT_VECTORS = {
@@ -51,9 +63,21 @@ class CognitiveConductor:
     Compilation loop:
     1. Load profile → build CallPlan
     2. Apply runtime overrides
-    3. Execute operators in sequence, accumulating context
+    3. Execute operators in sequence (or fused by dependency level), accumulating context;
+       under a deadline, required layers go first and optional ones degrade
     4. Score the result
     5. Return ArtifactRecord with provenance
+
+    With ``coalesce`` (the default), identical concurrent compiles - and
+    identical layer executions across different compiles - share one
+    in-flight run (see orchestrator.single_flight); every caller gets its
+    own copy of the result.
+
+    With an ``artifact_store``, compiles are content-addressed: a request
+    whose inputs (topic, audience, profile, overrides, model) match a stored
+    record returns that record without running any layer, and every
+    complete compile - no failed, degraded or AI-fallback layers - is stored
+    for next time.
     """
 
     def __init__(
@@ -62,11 +86,19 @@ class CognitiveConductor:
         toggle_manager: Optional[ToggleManager] = None,
         profiles_dir: str = "profiles",
         data_dir: str = "data",
+        coalesce: bool = True,
+        artifact_store: Optional[ArtifactStore] = None,
     ):
         self.ai_client = ai_client
+        self.coalesce = coalesce
+        self.artifact_store = artifact_store
+        self.compile_flight = SingleFlight()
+        self.layer_flight = SingleFlight()
         self.toggle_manager = toggle_manager or ToggleManager(profiles_dir)
         self.data_dir = data_dir
         self._operator_cache: Dict[str, Any] = {}
+        self.usage_ledger = UsageLedger()
+        self._layer_estimates_ms: Dict[str, float] = {}
 
     def compile(
         self,
@@ -76,6 +108,9 @@ class CognitiveConductor:
         overrides: Optional[Dict[str, Dict[str, Any]]] = None,
         audience_vector: Optional[AudienceControlVector] = None,
         domain_id: Optional[str] = None,
+        fused: bool = False,
+        deadline_ms: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> ArtifactRecord:
         """Compile a CognitiveArtifact for the given topic and audience.
 
@@ -86,7 +121,66 @@ class CognitiveConductor:
             overrides: Runtime toggle overrides per layer
             audience_vector: Explicit audience control vector (overrides default)
             domain_id: Optional domain identifier for domain-aware metaphors
+            fused: Request each level of mutually independent layers in one
+                AI call (see orchestrator.fusion) instead of one call per layer
+            deadline_ms: Latency budget for the whole compile. Layers still
+                run in dependency order. Required layers and the layers they
+                depend on always get their AI call; the expected time for them
+                is reserved first, then for optional layers by weight. Once
+                the remaining budget cannot cover an optional layer it uses
+                its template fallback, and past the deadline it is skipped.
+                Decisions are recorded in provenance and evaluation.
+            cancel_token: Cancel it (e.g. when the requesting client
+                disconnects) to abort the compile: the layer in flight stops
+                its AI call and CompileCancelled is raised before the next one.
+
+        Raises:
+            CompileCancelled: If ``cancel_token`` was cancelled.
         """
+        args = (topic, audience_id, profile_name, overrides, audience_vector, domain_id, fused, deadline_ms)
+        if self.artifact_store is not None:
+            key = self._content_key(topic, audience_id, profile_name, overrides, audience_vector, domain_id, fused)
+            stored = self.artifact_store.get_by_key(key)
+            if stored is not None:
+                logger.info(f"Serving '{topic}' for '{audience_id}' from the artifact store ({stored.record_id})")
+                return stored
+
+        if not self.coalesce:
+            return self._compile(*args, cancel_token)
+
+        key = _digest([
+            topic, audience_id, profile_name, overrides,
+            audience_vector.model_dump() if audience_vector else None, domain_id, fused, deadline_ms,
+        ])
+        while True:
+            try:
+                record, shared = self.compile_flight.do(
+                    key, self._compile, *args, cancel_token, cancel_token=cancel_token,
+                )
+            except CompileCancelled:
+                if cancel_token is not None and cancel_token.cancelled:
+                    raise
+                # The leader's caller went away; the remaining callers still want
+                # the artifact, so one of them leads a new shared compile
+                logger.info(f"Shared compile of '{topic}' was cancelled by its leader, compiling again")
+                continue
+            return record.model_copy(deep=True) if shared else record
+
+    def _compile(
+        self,
+        topic: str,
+        audience_id: str,
+        profile_name: str,
+        overrides: Optional[Dict[str, Dict[str, Any]]],
+        audience_vector: Optional[AudienceControlVector],
+        domain_id: Optional[str],
+        fused: bool,
+        deadline_ms: Optional[float],
+        cancel_token: Optional[CancellationToken],
+    ) -> ArtifactRecord:
+        """Run the compilation loop (see compile())."""
+        started = time.monotonic()
+        deadline = started + deadline_ms / 1000 if deadline_ms is not None else None
         run_id = str(uuid.uuid4())[:8]
         logger.info(f"[{run_id}] Compiling: topic='{topic}', audience='{audience_id}', profile='{profile_name}'")
 
@@ -106,6 +200,9 @@ class CognitiveConductor:
 
         # Build call plan
         call_plan = CallPlan.from_layer_configs(layer_configs, profile_name)
+        settings = self.toggle_manager.load_settings(profile_name)
+        hedge = bool(settings.get("hedge_requests"))
+        stream = bool(settings.get("stream_responses"))
 
         # Create artifact
         artifact = CognitiveArtifact(topic=topic, audience=audience)
@@ -135,45 +232,105 @@ class CognitiveConductor:
         domain_dict = domain.model_dump() if domain else None
 
         # Execute operators
-        provenance = ProvenanceTracker(run_id=run_id)
+        provenance = ProvenanceTracker(run_id=run_id, profile_name=profile_name)
         context: Dict[str, Any] = {}
 
-        for step in call_plan.enabled_steps():
+        steps = call_plan.enabled_steps()
+        operators = {s.layer: self._get_operator(s.operator_class) for s in steps}
+        if fused:
+            groups = plan_groups(steps, operators)
+        else:
+            groups = [[step] for step in steps]
+        if deadline is not None:
+            essential = call_plan.essential_layers({layer: op.depends_on for layer, op in operators.items()})
+            rank = {step.layer: i for i, step in enumerate(call_plan.priority_steps())}
+
+        for index, group in enumerate(groups):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            degraded: Dict[str, str] = {}
+            if deadline is not None:
+                pending = [s for later in groups[index + 1:] for s in later]
+                degraded = self._plan_degradation(group, pending, essential, rank, deadline)
+                for step in group:
+                    if degraded.get(step.layer.value) == "skipped":
+                        logger.info(f"[{run_id}] {step.layer.value}: skipped, compile deadline reached")
+                        provenance.record(
+                            layer=step.layer.value,
+                            operator=step.operator_class,
+                            duration_ms=0.0,
+                            config=step.config,
+                            degraded="skipped",
+                        )
+                group = [s for s in group if degraded.get(s.layer.value) != "skipped"]
+                if not group:
+                    continue
+
             start = time.time()
             try:
-                operator = self._get_operator(step.operator_class)
-                step_config = dict(step.config)
-                if concept_dict:
-                    step_config["concept"] = concept_dict
-                if audience_dict:
-                    step_config["audience_data"] = audience_dict
-                if domain_dict:
-                    step_config["domain"] = domain_dict
-                output = operator.execute(topic, audience, context, step_config)
+                members = []
+                for step in group:
+                    step_config = dict(step.config)
+                    if degraded.get(step.layer.value) == "fallback":
+                        step_config["force_fallback"] = True
+                    if concept_dict:
+                        step_config["concept"] = concept_dict
+                    if audience_dict:
+                        step_config["audience_data"] = audience_dict
+                    if domain_dict:
+                        step_config["domain"] = domain_dict
+                    if hedge:
+                        step_config["hedge"] = True
+                    if stream:
+                        step_config["stream"] = True
+                    if cancel_token is not None:
+                        step_config["cancel_token"] = cancel_token
+                    members.append((self._get_operator(step.operator_class), step_config))
+                outputs = self._execute_group(members, topic, audience, context, cancel_token)
+            except CompileCancelled:
+                raise
+            except Exception as e:
+                for step in group:
+                    logger.error(f"[{run_id}] {step.layer.value} failed: {e}")
+                    provenance.record(
+                        layer=step.layer.value,
+                        operator=step.operator_class,
+                        duration_ms=(time.time() - start) * 1000 / len(group),
+                        success=False,
+                        error=str(e),
+                    )
+                continue
+
+            # A fused call's wall time is split across its layers so totals stay additive
+            duration_ms = (time.time() - start) * 1000 / len(group)
+            for step, output in zip(group, outputs):
                 artifact.set_layer(step.layer, output)
                 context[step.layer.value] = output.content
+                ai_available = bool(output.provenance.get("ai_available", False))
+                if ai_available:
+                    self._observe_layer(step.layer.value, duration_ms)
                 provenance.record(
                     layer=step.layer.value,
                     operator=step.operator_class,
-                    duration_ms=(time.time() - start) * 1000,
-                    ai_available=bool(self.ai_client and self.ai_client.is_available()),
+                    duration_ms=duration_ms,
+                    ai_available=ai_available,
                     config=step.config,
+                    usage=output.provenance.get("usage"),
+                    error=output.provenance.get("cancelled", ""),
+                    degraded=degraded.get(step.layer.value, ""),
                 )
                 logger.info(f"[{run_id}] {step.layer.value}: confidence={output.confidence:.2f}")
-            except Exception as e:
-                logger.error(f"[{run_id}] {step.layer.value} failed: {e}")
-                provenance.record(
-                    layer=step.layer.value,
-                    operator=step.operator_class,
-                    duration_ms=(time.time() - start) * 1000,
-                    success=False,
-                    error=str(e),
-                )
 
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
         provenance.complete()
+        self.usage_ledger.add(provenance)
+        artifact.metadata["provenance"] = provenance.summary()
+        if deadline_ms is not None:
+            artifact.metadata["deadline_ms"] = deadline_ms
 
         # Score the artifact
-        evaluation = score_artifact(artifact, layer_configs)
+        evaluation = score_artifact(artifact, layer_configs, provenance.degraded_layers())
         artifact.evaluation = evaluation
 
         # Build record
@@ -187,9 +344,133 @@ class CognitiveConductor:
             score_after=evaluation.overall_score,
         )
 
+        # Only complete artifacts may stand in for future compiles: no failed,
+        # timed-out or deadline-degraded layers, and - with an AI client - no
+        # layer that fell back to its template because the AI call failed
+        complete = not any(
+            e.error or e.degraded or (self.ai_client is not None and not e.ai_available)
+            for e in provenance.entries
+        )
+        if self.artifact_store is not None and complete:
+            artifact.metadata["content_key"] = self._content_key(
+                topic, audience_id, profile_name, overrides, audience_vector, domain_id, fused,
+            )
+            try:
+                self.artifact_store.put(record)
+            except Exception as e:
+                logger.warning(f"[{run_id}] Failed to store record: {e}")
+
         logger.info(f"[{run_id}] Done: score={evaluation.overall_score:.3f}, layers={len(context)}")
         return record
 
+    def _content_key(
+        self,
+        topic: str,
+        audience_id: str,
+        profile_name: str,
+        overrides: Optional[Dict[str, Dict[str, Any]]],
+        audience_vector: Optional[AudienceControlVector],
+        domain_id: Optional[str],
+        fused: bool,
+    ) -> str:
+        """Artifact store key for a compile request (see core.artifact_store.content_key)."""
+        return content_key(
+            topic,
+            audience_id,
+            profile_name,
+            audience_vector=audience_vector or DEFAULT_VECTORS.get(audience_id, AudienceControlVector()),
+            overrides=overrides,
+            model=getattr(self.ai_client, "model", None),
+            domain_id=domain_id,
+            fused=fused,
+        )
+
+    def _execute_group(
+        self,
+        members: List[Tuple[Any, Dict[str, Any]]],
+        topic: str,
+        audience: AudienceProfile,
+        context: Dict[str, Any],
+        cancel_token: Optional[CancellationToken],
+    ) -> List[LayerOutput]:
+        """Execute one group, sharing the run with identical in-flight groups.
+
+        Followers get copies without token usage (it was spent once, by the
+        leader) and marked ``coalesced``. If the leader's run was cut short
+        by its own cancellation or timeout, a follower runs the group itself.
+        """
+        if not self.coalesce:
+            return execute_fused(members, topic, audience, context, self.ai_client)
+
+        key = _digest([
+            [(operator.layer_name.value, {k: v for k, v in config.items() if k != "cancel_token"})
+             for operator, config in members],
+            topic, audience.model_dump(), context,
+        ])
+        outputs, shared = self.layer_flight.do(
+            key, execute_fused, members, topic, audience, context, self.ai_client, cancel_token=cancel_token,
+        )
+        if not shared:
+            return outputs
+        if any("cancelled" in output.provenance for output in outputs):
+            return execute_fused(members, topic, audience, context, self.ai_client)
+
+        copies = []
+        for output in outputs:
+            copy = output.model_copy(deep=True)
+            copy.provenance.pop("usage", None)
+            copy.provenance["coalesced"] = True
+            copies.append(copy)
+        return copies
+
+    def estimate_layer_ms(self, layer: str) -> float:
+        """Expected duration of a layer's AI call (EWMA of past AI runs)."""
+        return self._layer_estimates_ms.get(layer, DEFAULT_LAYER_ESTIMATE_MS)
+
+    def _observe_layer(self, layer: str, duration_ms: float) -> None:
+        previous = self._layer_estimates_ms.get(layer)
+        if previous is None:
+            self._layer_estimates_ms[layer] = duration_ms
+        else:
+            self._layer_estimates_ms[layer] = previous + LATENCY_EWMA_ALPHA * (duration_ms - previous)
+
+    def _plan_degradation(
+        self,
+        group: List[OperatorStep],
+        pending: List[OperatorStep],
+        essential: Set[LayerName],
+        rank: Dict[LayerName, int],
+        deadline: float,
+    ) -> Dict[str, str]:
+        """Decide which optional layers of ``group`` to degrade under the deadline.
+
+        Essential layers (required ones and their dependencies) always run.
+        Time for them - in this group and in groups still to come - is
+        reserved first; an optional layer then also leaves room for pending
+        optional layers that outrank it (``rank``, from priority_steps()).
+        One that does not fit falls back to its template, or is skipped once
+        the deadline has passed.
+        """
+        remaining_ms = (deadline - time.monotonic()) * 1000
+        reserved_ms = sum(self.estimate_layer_ms(s.layer.value) for s in pending if s.layer in essential)
+        optional_pending = [s for s in pending if s.layer not in essential]
+        decisions: Dict[str, str] = {}
+        for step in sorted(group, key=lambda s: (s.layer not in essential, rank[s.layer])):
+            estimate = self.estimate_layer_ms(step.layer.value)
+            if step.layer in essential:
+                reserved_ms += estimate
+                continue
+            outranking_ms = sum(
+                self.estimate_layer_ms(s.layer.value) for s in optional_pending if rank[s.layer] < rank[step.layer]
+            )
+            if remaining_ms <= 0:
+                decisions[step.layer.value] = "skipped"
+            elif reserved_ms + outranking_ms + estimate > remaining_ms:
+                decisions[step.layer.value] = "fallback"
+            else:
+                reserved_ms += estimate
+        return decisions
+
     def _get_operator(self, class_path: str):
         """Dynamically import and instantiate an operator."""
         if class_path in self._operator_cache:
@@ -216,3 +497,9 @@ class CognitiveConductor:
             "business_analyst": "intermediate",
         }
         return expertise_map.get(audience_id, "intermediate")
+
+
+def _digest(parts: Any) -> str:
+    """Stable hash of JSON-serialisable request parts (coalescing key)."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -2,6 +2,10 @@
 
 Compares scores with different toggle combinations:
 same topic, same audience, different enabled layers → measure score delta.
+
+With ``scores_only`` set, full ArtifactRecords are spilled to an ArtifactStore
+(or dropped if none is configured) and referenced by record_id, so report size
+stays flat as the number of toggled layers grows.
 """
 
 from __future__ import annotations
@@ -14,6 +18,7 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from cognitive_scaffolding.core.artifact_store import ArtifactStore
 from cognitive_scaffolding.core.models import (
     ArtifactRecord,
     AudienceControlVector,
@@ -23,6 +28,22 @@ from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
 
 logger = logging.getLogger(__name__)
 
+# Column name -> logical type for ExperimentRunner.rows(), one row per toggled layer
+EXPERIMENT_ROW_SCHEMA: Dict[str, str] = {
+    "experiment_id": "str",
+    "topic": "str",
+    "audience_id": "str",
+    "profile_name": "str",
+    "layer": "str",
+    "baseline_score": "float",
+    "enabled_score": "float",
+    "disabled_score": "float",
+    "score_delta": "float",
+    "enabled_record_id": "str",
+    "disabled_record_id": "str",
+    "timestamp": "str",
+}
+
 
 class ExperimentConfig(BaseModel):
     """Defines an experiment: what to compile and which layers to A/B test."""
@@ -35,6 +56,9 @@ class ExperimentConfig(BaseModel):
     )
     audience_vector: Optional[AudienceControlVector] = None
     repetitions: int = Field(1, ge=1, description="Run each variant N times, average scores")
+    scores_only: bool = Field(
+        False, description="Keep only scores + record IDs in the report; spill records to the store"
+    )
 
 
 class VariantResult(BaseModel):
@@ -42,7 +66,8 @@ class VariantResult(BaseModel):
 
     variant_name: str
     toggle_state: Dict[str, bool]
-    record: ArtifactRecord
+    record_id: str
+    record: Optional[ArtifactRecord] = None
     score: float
     layer_scores: Dict[str, float]
     populated_layers: List[str]
@@ -65,7 +90,8 @@ class ExperimentReport(BaseModel):
     experiment_id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
     config: ExperimentConfig
     baseline_score: float
-    baseline_record: ArtifactRecord
+    baseline_record_id: str
+    baseline_record: Optional[ArtifactRecord] = None
     layer_results: List[LayerExperimentResult]
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     total_duration_ms: float = 0.0
@@ -78,8 +104,9 @@ class ExperimentRunner:
     and CognitiveConductor.compile() to produce scored artifacts.
     """
 
-    def __init__(self, conductor: CognitiveConductor):
+    def __init__(self, conductor: CognitiveConductor, artifact_store: Optional[ArtifactStore] = None):
         self.conductor = conductor
+        self.artifact_store = artifact_store
 
     def run(self, config: ExperimentConfig) -> ExperimentReport:
         """Run an experiment: baseline + A/B for each toggled layer."""
@@ -90,6 +117,7 @@ class ExperimentRunner:
         # 1. Run baseline (unmodified profile)
         baseline_record = self._compile_averaged(config, overrides=None)
         baseline_score = baseline_record.artifact.evaluation.overall_score
+        baseline_record_id = self._spill(baseline_record, config)
 
         logger.info(f"[{run_id}] Baseline score: {baseline_score:.4f}")
 
@@ -115,7 +143,8 @@ class ExperimentRunner:
             enabled_result = VariantResult(
                 variant_name=f"{layer}_enabled",
                 toggle_state={layer: True},
-                record=record_a,
+                record_id=self._spill(record_a, config),
+                record=None if config.scores_only else record_a,
                 score=score_a,
                 layer_scores=dict(record_a.artifact.evaluation.layer_scores),
                 populated_layers=list(record_a.artifact.populated_layers().keys()),
@@ -124,7 +153,8 @@ class ExperimentRunner:
             disabled_result = VariantResult(
                 variant_name=f"{layer}_disabled",
                 toggle_state={layer: False},
-                record=record_b,
+                record_id=self._spill(record_b, config),
+                record=None if config.scores_only else record_b,
                 score=score_b,
                 layer_scores=dict(record_b.artifact.evaluation.layer_scores),
                 populated_layers=list(record_b.artifact.populated_layers().keys()),
@@ -150,11 +180,24 @@ class ExperimentRunner:
         return ExperimentReport(
             config=config,
             baseline_score=baseline_score,
-            baseline_record=baseline_record,
+            baseline_record_id=baseline_record_id,
+            baseline_record=None if config.scores_only else baseline_record,
             layer_results=layer_results,
             total_duration_ms=round(duration_ms, 1),
         )
 
+    def load_record(self, record_id: str) -> Optional[ArtifactRecord]:
+        """Fetch a spilled record back from the artifact store."""
+        if self.artifact_store is None:
+            return None
+        return self.artifact_store.get(record_id)
+
+    def _spill(self, record: ArtifactRecord, config: ExperimentConfig) -> str:
+        """Persist the record if running scores-only with a store; return its ID."""
+        if config.scores_only and self.artifact_store is not None:
+            return self.artifact_store.put(record)
+        return record.record_id
+
     def _compile_averaged(
         self,
         config: ExperimentConfig,
@@ -204,3 +247,24 @@ class ExperimentRunner:
             "worst_layer": worst_layer,
             "total_duration_ms": report.total_duration_ms,
         }
+
+    @staticmethod
+    def rows(report: ExperimentReport) -> List[Dict[str, Any]]:
+        """Flatten a report into one row per toggled layer (see EXPERIMENT_ROW_SCHEMA)."""
+        return [
+            {
+                "experiment_id": report.experiment_id,
+                "topic": report.config.topic,
+                "audience_id": report.config.audience_id,
+                "profile_name": report.config.profile_name,
+                "layer": lr.layer,
+                "baseline_score": report.baseline_score,
+                "enabled_score": lr.enabled_score,
+                "disabled_score": lr.disabled_score,
+                "score_delta": lr.score_delta,
+                "enabled_record_id": lr.enabled_result.record_id,
+                "disabled_record_id": lr.disabled_result.record_id,
+                "timestamp": report.timestamp.isoformat(),
+            }
+            for lr in report.layer_results
+        ]
@@ -0,0 +1,144 @@
+"""Fused execution - one LLM request for a group of mutually independent layers.
+
+plan_groups() levels the enabled steps of a CallPlan by operator
+``depends_on``: every step in a level only reads context produced by earlier
+levels, so the whole level can be requested at once as a single JSON object
+keyed by layer name. execute_fused() splits that response back into
+per-layer LayerOutputs, validating each against its operator's
+expected_keys; layers that come back missing or malformed are re-run on
+their own.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Mapping, Tuple
+
+from cognitive_scaffolding.core.models import AudienceProfile, LayerName, LayerOutput
+from cognitive_scaffolding.operators.base import AI_UNAVAILABLE_PREFIX, BaseOperator
+from cognitive_scaffolding.orchestrator.call_plan import OperatorStep
+
+logger = logging.getLogger(__name__)
+
+# Budget for layers without their own max_tokens; a fused call gets the sum
+FUSED_MAX_TOKENS_PER_LAYER = 1500
+
+_FUSED_PROMPT = """Generate several cognitive layers for the same topic in one response.
+Each section below is the full request for one layer.
+
+{sections}
+
+Return ONE JSON object whose top-level keys are exactly: {keys}.
+The value under each key is the JSON object that layer's request describes.
+Return ONLY valid JSON, no markdown."""
+
+
+def is_fusable(operator: BaseOperator) -> bool:
+    """Operators with their own execute() (e.g. engine-backed metaphor) run alone."""
+    return type(operator).execute is BaseOperator.execute
+
+
+def plan_groups(
+    steps: List[OperatorStep],
+    operators: Mapping[LayerName, BaseOperator],
+) -> List[List[OperatorStep]]:
+    """Group steps into dependency levels, preserving plan order within a level.
+
+    Steps must be in dependency order (CallPlan order is). Dependencies on
+    layers absent from ``steps`` (disabled layers) are ignored. Operators
+    that cannot be fused get a group of their own.
+    """
+    levels: Dict[LayerName, int] = {}
+    groups: List[List[OperatorStep]] = []
+    solo: List[Tuple[int, OperatorStep]] = []
+    for step in steps:
+        operator = operators[step.layer]
+        level = max((levels[dep] + 1 for dep in operator.depends_on if dep in levels), default=0)
+        levels[step.layer] = level
+        while len(groups) <= level:
+            groups.append([])
+        if is_fusable(operator):
+            groups[level].append(step)
+        else:
+            solo.append((level, step))
+
+    # Solo steps run right after the fused group of their level
+    ordered: List[List[OperatorStep]] = []
+    for level, group in enumerate(groups):
+        if group:
+            ordered.append(group)
+        ordered.extend([step] for lvl, step in solo if lvl == level)
+    return ordered
+
+
+def build_fused_prompt(
+    members: List[Tuple[BaseOperator, Dict[str, Any]]],
+    topic: str,
+    audience: AudienceProfile,
+    context: Dict[str, Any],
+) -> str:
+    sections = []
+    for operator, config in members:
+        layer = operator.layer_name.value
+        sections.append(f'## Layer "{layer}"\n{operator.build_prompt(topic, audience, context, config)}')
+    keys = ", ".join(f'"{operator.layer_name.value}"' for operator, _ in members)
+    return _FUSED_PROMPT.format(sections="\n\n".join(sections), keys=keys)
+
+
+def execute_fused(
+    members: List[Tuple[BaseOperator, Dict[str, Any]]],
+    topic: str,
+    audience: AudienceProfile,
+    context: Dict[str, Any],
+    ai_client,
+) -> List[LayerOutput]:
+    """Execute a group of independent (operator, config) pairs as one AI request.
+
+    Returns one LayerOutput per member, in order. Token usage of the shared
+    request is attributed to the first accepted layer only, so per-layer
+    totals still add up; every fused output lists its group under
+    provenance["fused_group"].
+    """
+    # Members forced to their template fallback (compile deadline) stay out of the request
+    fused = [(operator, config) for operator, config in members if operator.use_ai(config)]
+    if len(fused) < 2 or not (ai_client and ai_client.is_available()):
+        return [operator.execute(topic, audience, context, config) for operator, config in members]
+
+    first, first_config = fused[0]
+    prompt = build_fused_prompt(fused, topic, audience, context)
+    system = first.build_system_prompt(topic, audience, first_config)
+    options = [operator.generation_options(config) for operator, config in fused]
+    max_tokens = sum(o.get("max_tokens", FUSED_MAX_TOKENS_PER_LAYER) for o in options)
+    extra = {"hedge": True} if any(o.get("hedge") for o in options) else {}
+    group = [operator.layer_name.value for operator, _ in fused]
+    # The fused call may take as long as its members together, if every member has a limit
+    timeouts = [config.get("timeout_ms") for _, config in fused]
+    token = first.layer_token({
+        "timeout_ms": sum(timeouts) if all(timeouts) else None,
+        "cancel_token": first_config.get("cancel_token"),
+    })
+    stream = any(config.get("stream") for _, config in fused)
+    raw, usage = first.call_ai(
+        prompt, system, token, stream=stream, max_tokens=max_tokens, layer="+".join(group), **extra,
+    )
+
+    parsed: Dict[str, Any] = {}
+    if raw.startswith(AI_UNAVAILABLE_PREFIX):
+        logger.warning(f"Fused request failed, running layers individually ({raw})")
+    else:
+        parsed = first.parse_output(raw)
+
+    outputs = []
+    for operator, config in members:
+        layer = operator.layer_name.value
+        content = parsed.get(layer)
+        if layer in group and operator.validate_content(content):
+            output = operator.build_output(content, True, config, usage)
+            output.provenance["fused_group"] = group
+            usage = None
+        else:
+            if parsed and layer in group:
+                logger.warning(f"{layer}: fused output missing or incomplete, re-running alone")
+            output = operator.execute(topic, audience, context, config)
+        outputs.append(output)
+    return outputs
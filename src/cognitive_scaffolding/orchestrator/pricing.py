@@ -0,0 +1,67 @@
+"""Model pricing table for token cost estimates.
+
+Prices are USD per million tokens, matched on the longest model-name prefix
+so dated snapshots (e.g. "claude-sonnet-4-5-20250929") resolve to their
+family. Cache writes/reads are billed separately from uncached input, and
+requests sent through a batch API (usage flagged ``batched``) at
+BATCH_DISCOUNT of the listed prices.
+Update the table when provider prices change; unknown models cost None.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, NamedTuple, Optional
+
+
+class ModelPrice(NamedTuple):
+    input: float
+    output: float
+    cache_write: float
+    cache_read: float
+
+
+MODEL_PRICING: Dict[str, ModelPrice] = {
+    # Anthropic: cache writes 1.25x input, cache reads 0.1x input
+    "claude-opus-4-5": ModelPrice(5.00, 25.00, 6.25, 0.50),
+    "claude-opus-4": ModelPrice(15.00, 75.00, 18.75, 1.50),
+    "claude-sonnet-4": ModelPrice(3.00, 15.00, 3.75, 0.30),
+    "claude-3-7-sonnet": ModelPrice(3.00, 15.00, 3.75, 0.30),
+    "claude-3-5-sonnet": ModelPrice(3.00, 15.00, 3.75, 0.30),
+    "claude-haiku-4-5": ModelPrice(1.00, 5.00, 1.25, 0.10),
+    "claude-3-5-haiku": ModelPrice(0.80, 4.00, 1.00, 0.08),
+    # OpenAI: no cache write charge, cached input at a discount
+    "gpt-4o-mini": ModelPrice(0.15, 0.60, 0.0, 0.075),
+    "gpt-4o": ModelPrice(2.50, 10.00, 0.0, 1.25),
+    "gpt-4.1-mini": ModelPrice(0.40, 1.60, 0.0, 0.10),
+    "gpt-4.1": ModelPrice(2.00, 8.00, 0.0, 0.50),
+    "gpt-4-turbo": ModelPrice(10.00, 30.00, 0.0, 10.00),
+    "gpt-4": ModelPrice(30.00, 60.00, 0.0, 30.00),
+}
+
+
+# Anthropic Message Batches and the OpenAI Batch API bill half price
+BATCH_DISCOUNT = 0.5
+
+
+def price_for(model: str) -> Optional[ModelPrice]:
+    """Longest-prefix match of ``model`` against MODEL_PRICING."""
+    if not model:
+        return None
+    matches = [name for name in MODEL_PRICING if model.startswith(name)]
+    return MODEL_PRICING[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(usage: Mapping[str, Any]) -> Optional[float]:
+    """USD cost of one call's usage dict (as reported by AIClient.last_usage)."""
+    price = price_for(usage.get("model") or "")
+    if price is None:
+        return None
+    cost = (
+        usage.get("input_tokens", 0) * price.input
+        + usage.get("output_tokens", 0) * price.output
+        + usage.get("cache_creation_input_tokens", 0) * price.cache_write
+        + usage.get("cache_read_input_tokens", 0) * price.cache_read
+    ) / 1_000_000
+    if usage.get("batched"):
+        cost *= BATCH_DISCOUNT
+    return round(cost, 8)
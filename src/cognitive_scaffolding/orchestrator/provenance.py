@@ -1,12 +1,19 @@
-"""Provenance tracking - records which operator produced what, with timestamps."""
+"""Provenance tracking - records which operator produced what, with timestamps,
+model, token usage and estimated cost."""
 
 from __future__ import annotations
 
+import threading
+from collections import defaultdict, deque
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
+from cognitive_scaffolding.orchestrator.pricing import estimate_cost
+
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
 
 class ProvenanceEntry(BaseModel):
     """A single provenance record."""
@@ -18,12 +25,44 @@ class ProvenanceEntry(BaseModel):
     config: Dict[str, Any] = Field(default_factory=dict)
     success: bool = True
     error: str = ""
+    model: str = ""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    retries: int = 0
+    cost_usd: Optional[float] = None
+    degraded: str = ""  # "fallback" or "skipped" when a compile deadline cut the layer short
+
+
+def _empty_totals() -> Dict[str, Any]:
+    totals: Dict[str, Any] = {"calls": 0, "duration_ms": 0.0, "retries": 0, "cost_usd": 0.0}
+    totals.update({name: 0 for name in USAGE_FIELDS})
+    return totals
+
+
+def _accumulate(totals: Dict[str, Any], entry: ProvenanceEntry) -> None:
+    totals["calls"] += 1
+    totals["duration_ms"] += entry.duration_ms
+    totals["retries"] += entry.retries
+    totals["cost_usd"] = round(totals["cost_usd"] + (entry.cost_usd or 0.0), 8)
+    for name in USAGE_FIELDS:
+        totals[name] += getattr(entry, name)
+
+
+def _aggregate(entries: Iterable[ProvenanceEntry]) -> Dict[str, Any]:
+    """Sum calls, duration, tokens and cost over entries."""
+    totals = _empty_totals()
+    for entry in entries:
+        _accumulate(totals, entry)
+    return totals
 
 
 class ProvenanceTracker(BaseModel):
     """Tracks provenance for all operators in a compilation run."""
     entries: List[ProvenanceEntry] = Field(default_factory=list)
     run_id: str = ""
+    profile_name: str = ""
     started_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     completed_at: datetime | None = None
 
@@ -36,7 +75,11 @@ class ProvenanceTracker(BaseModel):
         config: Dict[str, Any] | None = None,
         success: bool = True,
         error: str = "",
+        usage: Optional[Dict[str, Any]] = None,
+        degraded: str = "",
     ) -> None:
+        """Record one operator run; ``usage`` is an AIClient.last_usage dict."""
+        usage = usage or {}
         self.entries.append(ProvenanceEntry(
             layer=layer,
             operator=operator,
@@ -45,6 +88,11 @@ class ProvenanceTracker(BaseModel):
             config=config or {},
             success=success,
             error=error,
+            model=usage.get("model") or "",
+            retries=usage.get("retries", 0),
+            cost_usd=estimate_cost(usage) if usage else None,
+            degraded=degraded,
+            **{name: usage.get(name, 0) for name in USAGE_FIELDS},
         ))
 
     def complete(self) -> None:
@@ -56,12 +104,86 @@ class ProvenanceTracker(BaseModel):
     def failed_layers(self) -> List[str]:
         return [e.layer for e in self.entries if not e.success]
 
+    def degraded_layers(self) -> Dict[str, str]:
+        """Layers the deadline forced to fallback or skipped, with the decision."""
+        return {e.layer: e.degraded for e in self.entries if e.degraded}
+
+    def totals(self) -> Dict[str, Any]:
+        """Calls, duration, token counts and cost summed over the run."""
+        return _aggregate(self.entries)
+
+    def by_layer(self) -> Dict[str, Dict[str, Any]]:
+        """Per-layer totals, to see which layers dominate spend and latency."""
+        grouped: Dict[str, List[ProvenanceEntry]] = defaultdict(list)
+        for entry in self.entries:
+            grouped[entry.layer].append(entry)
+        return {layer: _aggregate(entries) for layer, entries in grouped.items()}
+
     def summary(self) -> Dict[str, Any]:
+        totals = self.totals()
         return {
             "run_id": self.run_id,
+            "profile": self.profile_name,
             "total_steps": len(self.entries),
             "total_duration_ms": self.total_duration_ms(),
             "failed": self.failed_layers(),
+            "degraded": self.degraded_layers(),
+            "models": sorted({e.model for e in self.entries if e.model}),
+            "tokens": {name: totals[name] for name in USAGE_FIELDS},
+            "retries": totals["retries"],
+            "cost_usd": totals["cost_usd"],
             "started_at": self.started_at.isoformat(),
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
         }
+
+
+class UsageLedger:
+    """Running usage totals across compile runs: per run, per profile, per layer.
+
+    Profile and layer totals are accumulated as runs are added, so the
+    ledger stays small however many runs a long-lived conductor compiles;
+    only the most recent ``max_runs`` per-run totals are kept.
+    """
+
+    def __init__(self, max_runs: int = 1000):
+        self._runs: Deque[Tuple[str, Dict[str, Any]]] = deque(maxlen=max_runs)
+        self._profiles: Dict[str, Dict[str, Any]] = defaultdict(_empty_totals)
+        self._layers: Dict[Tuple[str, str], Dict[str, Any]] = defaultdict(_empty_totals)
+        self._lock = threading.Lock()
+
+    def add(self, tracker: ProvenanceTracker) -> None:
+        with self._lock:
+            self._runs.append((tracker.run_id, tracker.totals()))
+            for entry in tracker.entries:
+                _accumulate(self._profiles[tracker.profile_name], entry)
+                _accumulate(self._layers[(tracker.profile_name, entry.layer)], entry)
+
+    def by_run(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {run_id: dict(totals) for run_id, totals in self._runs}
+
+    def by_profile(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {profile: dict(totals) for profile, totals in self._profiles.items()}
+
+    def by_layer(self, profile_name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Per-layer totals across runs, optionally restricted to one profile."""
+        merged: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for (profile, layer), totals in self._layers.items():
+                if profile_name is not None and profile != profile_name:
+                    continue
+                target = merged.setdefault(layer, _empty_totals())
+                for key, value in totals.items():
+                    target[key] += value
+        for totals in merged.values():
+            totals["cost_usd"] = round(totals["cost_usd"], 8)
+        return merged
+
+    def totals(self) -> Dict[str, Any]:
+        merged = _empty_totals()
+        for totals in self.by_profile().values():
+            for key, value in totals.items():
+                merged[key] += value
+        merged["cost_usd"] = round(merged["cost_usd"], 8)
+        return merged
@@ -1,13 +1,15 @@
 """Targeted regeneration of weak layers.
 
 After initial compilation, if any layers score below a threshold,
-re-run those specific operators with enriched context.
+re-run those specific operators with enriched context. Each run adds a
+revision holding only the delta back to the previous content (see
+ArtifactRecord.reconstruct), so repeated runs do not store full copies.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Dict
+from typing import Dict, Optional
 
 from cognitive_scaffolding.core.models import ArtifactRecord, LayerName
 from cognitive_scaffolding.core.scoring import LayerConfig, score_artifact
@@ -22,6 +24,7 @@ def regenerate_weak_layers(
     layer_configs: Dict[str, LayerConfig],
     conductor,  # CognitiveConductor - avoid circular import
     threshold: float = DEFAULT_THRESHOLD,
+    keep_revisions: Optional[int] = None,
 ) -> ArtifactRecord:
     """Re-run operators for layers scoring below threshold.
 
@@ -30,6 +33,9 @@ def regenerate_weak_layers(
         layer_configs: Layer configurations from the profile
         conductor: The CognitiveConductor instance to use for re-execution
         threshold: Minimum acceptable confidence score
+        keep_revisions: If set, compact the revision history afterwards so
+            only this many recent revisions (plus the oldest) stay
+            reconstructable
 
     Returns:
         Updated ArtifactRecord with improved layers
@@ -51,6 +57,7 @@ def regenerate_weak_layers(
 
     logger.info(f"Regenerating weak layers: {weak_layers}")
     score_before = evaluation.overall_score
+    before = artifact.model_dump(mode="json")
     context = artifact.context_dict()
 
     for layer_name_str in weak_layers:
@@ -85,6 +92,9 @@ def regenerate_weak_layers(
         reason=f"Regenerated layers below threshold ({threshold})",
         score_before=score_before,
         score_after=new_eval.overall_score,
+        before=before,
     )
+    if keep_revisions is not None:
+        record.compact(keep_revisions)
 
     return record
@@ -0,0 +1,99 @@
+"""Single-flight request coalescing.
+
+Concurrent calls with the same key share one execution: the first caller
+(the leader) runs the function, later callers block until it finishes and
+receive the same result - or the same exception. Once the call completes
+the key is forgotten, so this coalesces bursts of identical in-flight work
+without caching results. A follower passing a cancel_token stops waiting
+(CompileCancelled) when its own token is cancelled or times out.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from cognitive_scaffolding.orchestrator.cancellation import CancellationToken, CompileCancelled
+
+# How often a follower with a cancel_token re-checks it while waiting
+FOLLOWER_POLL_SECONDS = 0.05
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent executions by key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.stats = {"executions": 0, "coalesced": 0}
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args: Any,
+        cancel_token: Optional[CancellationToken] = None,
+        **kwargs: Any,
+    ) -> Tuple[Any, bool]:
+        """Run ``fn(*args, **kwargs)`` once per in-flight ``key``.
+
+        Returns (result, shared); ``shared`` is True for callers that waited on
+        another caller's execution. The leader's exception is re-raised in
+        every caller. ``cancel_token`` bounds a follower's wait; the leader
+        must honour its own token inside ``fn``.
+
+        Raises:
+            CompileCancelled: If this caller is a follower and ``cancel_token``
+                is cancelled before the leader finishes.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                self.stats["coalesced"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.stats["executions"] += 1
+                leader = True
+
+        if leader:
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        elif cancel_token is None:
+            call.done.wait()
+        else:
+            while not call.done.wait(self._poll_interval(cancel_token)):
+                if cancel_token.cancelled:
+                    with self._lock:
+                        call.followers -= 1
+                    raise CompileCancelled(cancel_token.reason)
+
+        if call.error is not None:
+            raise call.error
+        return call.result, not leader
+
+    @staticmethod
+    def _poll_interval(token: CancellationToken) -> float:
+        remaining = token.remaining()
+        if remaining is None:
+            return FOLLOWER_POLL_SECONDS
+        return max(0.0, min(FOLLOWER_POLL_SECONDS, remaining))
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
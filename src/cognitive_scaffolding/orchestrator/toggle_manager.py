@@ -1,6 +1,8 @@
 """Feature toggle system with 3 levels: profile defaults, runtime overrides, experiments.
 
-Level 1: Profile YAML defaults (per-layer enabled/required/weight)
+Level 1: Profile YAML defaults (per-layer enabled/required/weight/max_tokens/timeout_ms,
+         with settings.max_tokens_per_layer and settings.timeout_ms_per_layer
+         as profile-wide defaults)
 Level 2: Runtime overrides (API caller can override any toggle)
 Level 3: A/B experiments (compare scores with different toggle combinations)
 """
@@ -25,25 +27,41 @@ class ToggleManager:
     def __init__(self, profiles_dir: str = "profiles"):
         self.profiles_dir = Path(profiles_dir)
         self._profiles_cache: Dict[str, Dict[str, LayerConfig]] = {}
+        self._settings_cache: Dict[str, Dict[str, Any]] = {}
 
-    def load_profile(self, profile_name: str) -> Dict[str, LayerConfig]:
-        """Load layer configs from a profile YAML file."""
-        if profile_name in self._profiles_cache:
-            return self._profiles_cache[profile_name]
-
+    def _read_profile(self, profile_name: str) -> Dict[str, Any] | None:
         profile_path = self.profiles_dir / f"{profile_name}.yaml"
         if not profile_path.exists():
             logger.warning(f"Profile not found: {profile_path}")
-            return self._default_configs()
-
+            return None
         try:
             with open(profile_path, "r") as f:
-                data = yaml.safe_load(f) or {}
+                return yaml.safe_load(f) or {}
         except Exception as e:
             logger.error(f"Failed to load profile {profile_name}: {e}")
+            return None
+
+    def load_settings(self, profile_name: str) -> Dict[str, Any]:
+        """Load the profile's ``settings`` block (empty if missing)."""
+        if profile_name not in self._settings_cache:
+            data = self._read_profile(profile_name)
+            self._settings_cache[profile_name] = dict((data or {}).get("settings") or {})
+        return self._settings_cache[profile_name]
+
+    def load_profile(self, profile_name: str) -> Dict[str, LayerConfig]:
+        """Load layer configs from a profile YAML file."""
+        if profile_name in self._profiles_cache:
+            return self._profiles_cache[profile_name]
+
+        data = self._read_profile(profile_name)
+        if data is None:
             return self._default_configs()
 
         layers_data = data.get("layers", {})
+        settings = data.get("settings") or {}
+        self._settings_cache[profile_name] = dict(settings)
+        default_max_tokens = settings.get("max_tokens_per_layer")
+        default_timeout_ms = settings.get("timeout_ms_per_layer")
         configs: Dict[str, LayerConfig] = {}
         for layer in LayerName:
             layer_data = layers_data.get(layer.value, {})
@@ -51,6 +69,8 @@ class ToggleManager:
                 enabled=layer_data.get("enabled", True),
                 required=layer_data.get("required", False),
                 weight=layer_data.get("weight", 1.0),
+                max_tokens=layer_data.get("max_tokens", default_max_tokens),
+                timeout_ms=layer_data.get("timeout_ms", default_timeout_ms),
             )
 
         self._profiles_cache[profile_name] = configs
@@ -63,7 +83,8 @@ class ToggleManager:
     ) -> Dict[str, LayerConfig]:
         """Apply runtime overrides on top of profile defaults.
 
-        overrides format: {"activation": {"enabled": false, "weight": 2.0}, ...}
+        overrides format: {"activation": {"enabled": false, "weight": 2.0, "max_tokens": 600,
+                                          "timeout_ms": 4000}, ...}
         """
         merged = {}
         for layer_name, config in base_configs.items():
@@ -72,6 +93,8 @@ class ToggleManager:
                 enabled=override.get("enabled", config.enabled),
                 required=override.get("required", config.required),
                 weight=override.get("weight", config.weight),
+                max_tokens=override.get("max_tokens", config.max_tokens),
+                timeout_ms=override.get("timeout_ms", config.timeout_ms),
             )
         return merged
 
@@ -81,12 +104,19 @@ class ToggleManager:
         toggle_layer: str,
     ) -> tuple[Dict[str, LayerConfig], Dict[str, LayerConfig]]:
         """Create two variants for A/B testing: one with layer enabled, one disabled."""
-        variant_a = {k: LayerConfig(v.enabled, v.required, v.weight) for k, v in base_configs.items()}
-        variant_b = {k: LayerConfig(v.enabled, v.required, v.weight) for k, v in base_configs.items()}
+        variant_a = {
+            k: LayerConfig(v.enabled, v.required, v.weight, v.max_tokens, v.timeout_ms)
+            for k, v in base_configs.items()
+        }
+        variant_b = {
+            k: LayerConfig(v.enabled, v.required, v.weight, v.max_tokens, v.timeout_ms)
+            for k, v in base_configs.items()
+        }
 
         if toggle_layer in variant_a:
-            variant_a[toggle_layer] = LayerConfig(True, variant_a[toggle_layer].required, variant_a[toggle_layer].weight)
-            variant_b[toggle_layer] = LayerConfig(False, False, variant_b[toggle_layer].weight)
+            a, b = variant_a[toggle_layer], variant_b[toggle_layer]
+            variant_a[toggle_layer] = LayerConfig(True, a.required, a.weight, a.max_tokens, a.timeout_ms)
+            variant_b[toggle_layer] = LayerConfig(False, False, b.weight, b.max_tokens, b.timeout_ms)
 
         return variant_a, variant_b
 
@@ -12,7 +12,8 @@ from cognitive_scaffolding.core.models import (
     LayerOutput,
 )
 from cognitive_scaffolding.adapters.chatbot_adapter import ChatbotAdapter
-from cognitive_scaffolding.adapters.rag_adapter import RAGAdapter
+from cognitive_scaffolding.adapters.chunking import TextChunker
+from cognitive_scaffolding.adapters.rag_adapter import RAGAdapter, read_jsonl, write_jsonl
 from cognitive_scaffolding.adapters.etl_adapter import ETLAdapter
 
 
@@ -282,6 +283,75 @@ class TestRAGAdapter:
         for chunk in chunks:
             assert len(chunk["content"]) >= 10
 
+    def test_iter_chunks_matches_format(self, full_record):
+        adapter = RAGAdapter()
+        streamed = [RAGAdapter.to_document(c) for c in adapter.iter_chunks([full_record])]
+        assert streamed == adapter.format(full_record)
+
+    def test_iter_chunks_shares_readonly_metadata(self, full_record):
+        chunks = list(RAGAdapter().iter_chunks([full_record]))
+        assert len({id(c["metadata"]) for c in chunks}) == 1
+        with pytest.raises(TypeError):
+            chunks[0]["metadata"]["topic"] = "changed"
+
+    def test_iter_chunks_spans_records(self, full_record, record_no_eval):
+        other = full_record.model_copy(deep=True)
+        other.artifact.artifact_id = "other"
+        chunks = RAGAdapter().iter_chunks(iter([full_record, other]))
+        artifact_ids = {c["metadata"]["artifact_id"] for c in chunks}
+        assert artifact_ids == {full_record.artifact.artifact_id, "other"}
+
+    @pytest.mark.parametrize("filename", ["chunks.jsonl", "chunks.jsonl.gz"])
+    def test_write_jsonl_roundtrip(self, full_record, tmp_path, filename):
+        adapter = RAGAdapter()
+        path = tmp_path / filename
+        count = write_jsonl(adapter.iter_chunks([full_record]), path, buffer_size=64)
+
+        docs = list(read_jsonl(path))
+        assert count == len(docs)
+        assert docs == adapter.format(full_record)
+
+    def test_chunker_splits_long_fields(self, full_record):
+        full_record.artifact.synthesis.content["synthesized_response"] = " ".join(["word"] * 500)
+        adapter = RAGAdapter(chunker=TextChunker(max_tokens=100, overlap=10))
+        chunks = [c for c in adapter.format(full_record) if c["metadata"]["field"] == "synthesized_response"]
+        assert len(chunks) == 6
+        assert all(TextChunker.count_tokens(c["content"]) <= 100 for c in chunks)
+        assert chunks[0]["chunk_id"].endswith("_synthesized_response_0")
+
+    def test_dedupe_across_artifacts(self, full_record):
+        other = full_record.model_copy(deep=True)
+        other.artifact.artifact_id = "other"
+        other.artifact.audience.audience_id = "general"
+        plain = list(RAGAdapter().iter_chunks([full_record, other]))
+        deduped = list(RAGAdapter(dedupe=True).iter_chunks([full_record, other]))
+
+        assert len(plain) == 2 * len(deduped)
+        assert {c["metadata"]["artifact_id"] for c in deduped} == {full_record.artifact.artifact_id}
+
+    def test_dedupe_seen_carries_across_calls(self, full_record):
+        adapter = RAGAdapter(dedupe=True)
+        seen = set()
+        first = list(adapter.iter_chunks([full_record], seen=seen))
+        assert first
+        assert list(adapter.iter_chunks([full_record], seen=seen)) == []
+
+    def test_write_jsonl_gzip_detected(self, full_record, tmp_path):
+        path = tmp_path / "chunks.jsonl.gz"
+        write_jsonl(RAGAdapter().iter_chunks([full_record]), path)
+        assert path.read_bytes()[:2] == b"\x1f\x8b"
+
+    def test_read_jsonl_matches_write_compress_flag(self, full_record, tmp_path):
+        adapter = RAGAdapter()
+        path = tmp_path / "chunks.jsonl"
+        write_jsonl(adapter.iter_chunks([full_record]), path, compress=True)
+        assert list(read_jsonl(path)) == adapter.format(full_record)
+        assert list(read_jsonl(path, compress=True)) == adapter.format(full_record)
+
+        plain = tmp_path / "plain.jsonl.gz"
+        write_jsonl(adapter.iter_chunks([full_record]), plain, compress=False)
+        assert list(read_jsonl(plain, compress=False)) == adapter.format(full_record)
+
 
 # ── ETLAdapter ──────────────────────────────────────────────
 
@@ -333,3 +403,15 @@ class TestETLAdapter:
         assert result["score"] is None
         assert result["penalty_applied"] is False
         assert result["missing_required"] == []
+
+    def test_schema_matches_format_columns(self, full_record, record_no_eval):
+        schema = ETLAdapter.schema()
+        assert list(schema) == list(ETLAdapter().format(full_record))
+        assert list(schema) == list(ETLAdapter().format(record_no_eval))
+        assert schema["cv_rigor"] == "float"
+        assert schema["layer_metaphor_populated"] == "bool"
+
+    def test_format_many_is_lazy(self, full_record):
+        rows = ETLAdapter().format_many(iter([full_record, full_record]))
+        assert not isinstance(rows, list)
+        assert [r["record_id"] for r in rows] == [full_record.record_id] * 2
@@ -0,0 +1,395 @@
+"""Unit tests for AIClient transport configuration (no network to providers)."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from cognitive_scaffolding.orchestrator.cancellation import CancellationToken
+from utils import ai_client as ai_client_module
+from utils.ai_client import FALLBACK_PREFIX, AIClient
+from utils.rate_limit import CircuitBreaker, RateLimiter
+from utils.http_pool import (
+    PoolConfig,
+    close_shared_clients,
+    get_shared_http_client,
+    pool_stats,
+    sdk_httpx_module,
+)
+
+
+class _FakeSDK:
+    """Stands in for anthropic.Anthropic / openai.OpenAI, recording constructor kwargs."""
+
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        _FakeSDK.instances.append(self)
+
+
+@pytest.fixture(autouse=True)
+def fake_providers(monkeypatch):
+    _FakeSDK.instances = []
+    monkeypatch.setattr(ai_client_module, "anthropic", SimpleNamespace(Anthropic=_FakeSDK), raising=False)
+    monkeypatch.setattr(ai_client_module, "openai", SimpleNamespace(OpenAI=_FakeSDK), raising=False)
+    monkeypatch.setattr(ai_client_module, "ANTHROPIC_AVAILABLE", True)
+    monkeypatch.setattr(ai_client_module, "OPENAI_AVAILABLE", True)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    yield
+    close_shared_clients()
+
+
+class TestPoolConfig:
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("AI_POOL_MAX_CONNECTIONS", "64")
+        monkeypatch.setenv("AI_POOL_READ_TIMEOUT", "5.5")
+        monkeypatch.setenv("AI_POOL_MAX_RETRIES", "bogus")
+        config = PoolConfig.from_env()
+        assert config.max_connections == 64
+        assert config.read_timeout == 5.5
+        assert config.max_retries == PoolConfig().max_retries
+
+
+class TestSharedTransport:
+    def test_providers_share_one_http_client(self):
+        config = PoolConfig(max_connections=7)
+        a = AIClient(provider="anthropic", pool_config=config)
+        b = AIClient(provider="openai", pool_config=config)
+
+        assert a.is_available() and b.is_available()
+        first, second = _FakeSDK.instances
+        assert first.kwargs["http_client"] is second.kwargs["http_client"]
+        # SDK retries are disabled; AIClient.generate() owns the retry loop
+        assert first.kwargs["max_retries"] == 0
+        assert first.kwargs["timeout"].read == config.read_timeout
+
+    def test_explicit_http_client_is_used(self):
+        custom = httpx.Client()
+        AIClient(provider="anthropic", http_client=custom)
+        assert _FakeSDK.instances[0].kwargs["http_client"] is custom
+        custom.close()
+
+    @pytest.mark.parametrize("package, constructor", [("anthropic", "Anthropic"), ("openai", "OpenAI")])
+    def test_real_sdk_accepts_shared_client(self, package, constructor):
+        sdk = pytest.importorskip(package)
+        client = AIClient(provider=package)
+        client.http_client = None  # the fixture's fake SDK already got a plain httpx client
+        kwargs = client._sdk_kwargs(sdk)
+        real = getattr(sdk, constructor)(api_key="test-key", **kwargs)
+        assert real is not None
+        assert type(kwargs["http_client"]).__module__.split(".")[0] == sdk_httpx_module(sdk).__name__
+        assert pool_stats(kwargs["http_client"])["total_requests"] == 0
+
+    def test_base_url_from_argument_or_env(self, monkeypatch):
+        AIClient(provider="anthropic")
+        assert "base_url" not in _FakeSDK.instances[0].kwargs
+
+        monkeypatch.setenv("AI_BASE_URL", "http://127.0.0.1:8089")
+        client = AIClient(provider="openai")
+        assert _FakeSDK.instances[1].kwargs["base_url"] == "http://127.0.0.1:8089"
+        assert client.get_status()["base_url"] == "http://127.0.0.1:8089"
+
+        AIClient(provider="anthropic", base_url="http://localhost:9000")
+        assert _FakeSDK.instances[2].kwargs["base_url"] == "http://localhost:9000"
+
+    def test_per_call_timeout_forwarded(self):
+        client = AIClient(provider="anthropic")
+        calls = []
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(content=[SimpleNamespace(text="ok")])
+
+        client.client.messages = SimpleNamespace(create=create)
+        assert client.generate("hi", timeout=3.0) == "ok"
+        assert client.generate("hi") == "ok"
+        assert calls[0]["timeout"] == 3.0
+        assert "timeout" not in calls[1]
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _client_with_responses(monkeypatch, responses, **kwargs):
+    """AIClient whose anthropic create() yields/raises items from ``responses`` in order."""
+    monkeypatch.setattr(ai_client_module.time, "sleep", lambda s: None)
+    client = AIClient(provider="anthropic", pool_config=PoolConfig(max_retries=3), **kwargs)
+    queue = list(responses)
+
+    def create(**_):
+        item = queue.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return SimpleNamespace(content=[SimpleNamespace(text=item)])
+
+    client.client.messages = SimpleNamespace(create=create)
+    return client, queue
+
+
+class TestRetriesAndBreaker:
+    def test_retries_transient_errors(self, monkeypatch):
+        client, queue = _client_with_responses(monkeypatch, [_StatusError(529), _StatusError(503), "done"])
+        assert client.generate("hi") == "done"
+        assert queue == []
+        assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+
+    def test_non_retryable_error_fails_fast(self, monkeypatch):
+        client, queue = _client_with_responses(monkeypatch, [_StatusError(400), "never"])
+        assert client.generate("hi").startswith(FALLBACK_PREFIX)
+        assert queue == ["never"]
+        assert client.circuit_breaker.snapshot()["consecutive_failures"] == 0
+        assert client.last_error.status_code == 400
+        assert client.generate("hi") == "never"
+        assert client.last_error is None
+
+    def test_breaker_opens_and_disables_client(self, monkeypatch):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        client, _ = _client_with_responses(
+            monkeypatch, [_StatusError(500)] * 4, circuit_breaker=breaker,
+        )
+        assert client.generate("hi").startswith(FALLBACK_PREFIX)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not client.is_available()
+
+    def test_429_throttles_rate_limiter(self, monkeypatch):
+        limiter = RateLimiter(rpm=6000)
+        client, _ = _client_with_responses(monkeypatch, [_StatusError(429), "ok"], rate_limiter=limiter)
+        assert client.generate("hi") == "ok"
+        assert limiter.scale == pytest.approx(0.55)
+
+
+class APITimeoutError(Exception):
+    """Named like the SDKs' timeout error, which is what is_timeout() matches on."""
+
+
+class _TokenStream:
+    """messages.stream() stand-in that runs ``on_chunk`` after each text chunk."""
+
+    def __init__(self, chunks, on_chunk=lambda: None):
+        self.chunks = chunks
+        self.on_chunk = on_chunk
+        self.closed = False
+
+    @property
+    def text_stream(self):
+        for chunk in self.chunks:
+            yield chunk
+            self.on_chunk()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+    def get_final_message(self):
+        return SimpleNamespace(usage=SimpleNamespace(input_tokens=5, output_tokens=3))
+
+
+class TestCancelToken:
+    def test_generate_streams_under_a_token(self):
+        client = AIClient(provider="anthropic")
+        stream = _TokenStream(['{"a"', ": 1}"])
+        client.client.messages = SimpleNamespace(stream=lambda **kwargs: stream)
+        assert client.generate("hi", cancel_token=CancellationToken()) == '{"a": 1}'
+        assert stream.closed
+        assert client.last_usage["output_tokens"] == 3
+
+    def test_cancellation_closes_the_response_without_retrying(self):
+        client = AIClient(provider="anthropic", pool_config=PoolConfig(max_retries=3))
+        token = CancellationToken()
+        streams = []
+
+        def stream(**kwargs):
+            streams.append(_TokenStream(["{", '"a": 1', "}"], on_chunk=token.cancel))
+            return streams[-1]
+
+        client.client.messages = SimpleNamespace(stream=stream)
+        assert client.generate("hi", cancel_token=token).startswith(FALLBACK_PREFIX)
+        assert len(streams) == 1 and streams[0].closed
+        assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+
+    def test_token_timeouts_are_not_provider_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        client = AIClient(provider="anthropic", pool_config=PoolConfig(max_retries=3), circuit_breaker=breaker)
+        calls = []
+
+        def stream(**kwargs):
+            calls.append(kwargs["timeout"])
+            raise APITimeoutError("Request timed out.")
+
+        client.client.messages = SimpleNamespace(stream=stream)
+        for _ in range(3):
+            assert client.generate("hi", cancel_token=CancellationToken(timeout_ms=5_000)).startswith(FALLBACK_PREFIX)
+        assert len(calls) == 3
+        assert calls[0] <= 5.0
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.snapshot()["consecutive_failures"] == 0
+
+    def test_own_timeouts_still_count(self, monkeypatch):
+        monkeypatch.setattr(ai_client_module.time, "sleep", lambda s: None)
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        client = AIClient(provider="anthropic", pool_config=PoolConfig(max_retries=1), circuit_breaker=breaker)
+
+        def stream(**kwargs):
+            raise APITimeoutError("Request timed out.")
+
+        client.client.messages = SimpleNamespace(stream=stream)
+        client.generate("hi", timeout=1.0, cancel_token=CancellationToken(timeout_ms=60_000))
+        assert breaker.state == CircuitBreaker.OPEN
+
+
+class TestPromptCaching:
+    def test_anthropic_system_prefix_is_cacheable(self):
+        client = AIClient(provider="anthropic")
+        calls = []
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            usage = SimpleNamespace(
+                input_tokens=12, output_tokens=40,
+                cache_creation_input_tokens=0, cache_read_input_tokens=1500,
+            )
+            return SimpleNamespace(content=[SimpleNamespace(text="ok")], usage=usage)
+
+        client.client.messages = SimpleNamespace(create=create)
+        assert client.generate("layer prompt", system="shared brief") == "ok"
+        (block,) = calls[0]["system"]
+        assert block["text"] == "shared brief"
+        assert block["cache_control"] == {"type": "ephemeral"}
+        assert calls[0]["messages"] == [{"role": "user", "content": "layer prompt"}]
+        assert client.last_usage["cache_read_input_tokens"] == 1500
+        assert client.last_usage["input_tokens"] == 12
+
+    def test_openai_system_message_and_cached_tokens(self):
+        client = AIClient(provider="openai")
+        calls = []
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            usage = SimpleNamespace(
+                prompt_tokens=1100, completion_tokens=30,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+            )
+            message = SimpleNamespace(content="ok")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+        client.client.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+        assert client.generate("layer prompt", system="shared brief") == "ok"
+        assert calls[0]["messages"][0] == {"role": "system", "content": "shared brief"}
+        assert client.last_usage == {
+            "model": client.model,
+            "retries": 0,
+            "input_tokens": 76,
+            "output_tokens": 30,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 1024,
+        }
+
+    def test_no_system_and_failed_call_clear_usage(self, monkeypatch):
+        client, _ = _client_with_responses(monkeypatch, ["ok", _StatusError(400)])
+        assert client.generate("hi") == "ok"
+        assert client.last_usage is None
+        client.generate("again")
+        assert client.last_usage is None
+
+
+class TestStreaming:
+    def test_anthropic_stream_yields_text_and_usage(self):
+        client = AIClient(provider="anthropic")
+        captured = {}
+
+        class _Stream:
+            text_stream = iter(["{\"a\"", ": 1}"])
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                captured["closed"] = True
+
+            def get_final_message(self):
+                return SimpleNamespace(usage=SimpleNamespace(input_tokens=5, output_tokens=3))
+
+        def stream(**kwargs):
+            captured.update(kwargs)
+            return _Stream()
+
+        client.client.messages = SimpleNamespace(stream=stream)
+        assert "".join(client.stream("hi", system="brief")) == '{"a": 1}'
+        assert captured["closed"]
+        assert captured["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert client.last_usage["output_tokens"] == 3
+
+    def test_openai_stream_reads_deltas_and_usage(self):
+        client = AIClient(provider="openai")
+        captured = {}
+
+        def chunk(content=None, usage=None):
+            choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content else []
+            return SimpleNamespace(choices=choices, usage=usage)
+
+        def create(**kwargs):
+            captured.update(kwargs)
+            return iter([chunk("he"), chunk("llo"), chunk(usage=SimpleNamespace(prompt_tokens=9, completion_tokens=2))])
+
+        client.client.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+        assert list(client.stream("hi")) == ["he", "llo"]
+        assert captured["stream"] is True
+        assert client.last_usage["input_tokens"] == 9
+
+    def test_error_before_first_chunk_yields_sentinel(self):
+        client = AIClient(provider="anthropic")
+
+        def stream(**kwargs):
+            raise _StatusError(400)
+
+        client.client.messages = SimpleNamespace(stream=stream)
+        (only,) = list(client.stream("hi"))
+        assert only.startswith(FALLBACK_PREFIX)
+
+
+class _OKHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPoolStats:
+    def test_metered_transport_reuses_connections(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _OKHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            client = get_shared_http_client(PoolConfig(max_connections=2))
+            url = f"http://127.0.0.1:{server.server_address[1]}/"
+            for _ in range(5):
+                assert client.get(url).text == "ok"
+            stats = pool_stats(client)
+            assert stats["total_requests"] == 5
+            assert stats["in_flight"] == 0
+            assert stats["open_connections"] == 1
+            assert stats["idle_connections"] == 1
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_client_status_includes_pool(self):
+        client = AIClient(provider="anthropic")
+        assert client.get_status()["pool"]["total_requests"] == 0
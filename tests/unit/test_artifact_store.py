@@ -0,0 +1,199 @@
+"""Unit tests for artifact stores."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from cognitive_scaffolding.core.artifact_store import FileArtifactStore, SQLiteArtifactStore, content_key
+from cognitive_scaffolding.core.models import (
+    ArtifactRecord,
+    AudienceControlVector,
+    AudienceProfile,
+    CognitiveArtifact,
+    EvaluationResult,
+    LayerName,
+    LayerOutput,
+)
+from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
+
+
+PROFILES_DIR = str(Path(__file__).parent.parent.parent / "profiles")
+
+
+def _make_record(topic: str = "neural networks", audience_id: str = "general", score: float = 0.5) -> ArtifactRecord:
+    artifact = CognitiveArtifact(
+        topic=topic,
+        audience=AudienceProfile(audience_id=audience_id, name="General"),
+    )
+    artifact.set_layer(LayerName.STRUCTURE, LayerOutput(
+        layer=LayerName.STRUCTURE,
+        content={"definition": f"{topic} defined"},
+        confidence=0.7,
+    ))
+    artifact.evaluation = EvaluationResult(overall_score=score)
+    return ArtifactRecord(artifact=artifact, profile_name="chatbot_tutor")
+
+
+class _CountingClient:
+    model = "fake-model"
+    last_usage = None
+
+    def __init__(self, response='{"text": "ai output"}'):
+        self.calls = 0
+        self.response = response
+
+    def is_available(self):
+        return True
+
+    def generate(self, prompt, **kwargs):
+        self.calls += 1
+        return self.response
+
+
+class TestFileArtifactStore:
+    def test_put_get_roundtrip(self, tmp_path):
+        store = FileArtifactStore(tmp_path)
+        record = _make_record()
+        record_id = store.put(record)
+
+        assert record_id == record.record_id
+        assert record_id in store
+        loaded = store.get(record_id)
+        assert loaded == record
+
+    def test_missing_record(self, tmp_path):
+        store = FileArtifactStore(tmp_path)
+        assert store.get("nope") is None
+        assert "nope" not in store
+        assert len(store) == 0
+
+    def test_record_ids(self, tmp_path):
+        store = FileArtifactStore(tmp_path)
+        ids = {store.put(_make_record(t)) for t in ("a", "b", "c")}
+        assert set(store.record_ids()) == ids
+        assert len(store) == 3
+
+    def test_reads_legacy_json_files(self, tmp_path):
+        record = _make_record()
+        (tmp_path / f"{record.record_id}.json").write_text(record.model_dump_json(), encoding="utf-8")
+        store = FileArtifactStore(tmp_path)
+        assert store.get(record.record_id) == record
+
+        store.put(record)
+        assert [p.suffix for p in tmp_path.iterdir()] == [".bin"]
+        assert list(store.record_ids()) == [record.record_id]
+
+
+class TestContentKey:
+    def test_key_covers_request_inputs(self):
+        base = content_key("neural networks", "general", "chatbot_tutor", AudienceControlVector(), model="m1")
+        assert base == content_key("neural networks", "general", "chatbot_tutor", AudienceControlVector(), model="m1")
+        assert base != content_key("neural networks", "general", "chatbot_tutor", AudienceControlVector(), model="m2")
+        assert base != content_key(
+            "neural networks", "general", "chatbot_tutor", AudienceControlVector(rigor=0.9), model="m1",
+        )
+        assert base != content_key(
+            "neural networks", "general", "chatbot_tutor", AudienceControlVector(), model="m1",
+            overrides={"metaphor": {"enabled": False}},
+        )
+
+
+class TestSQLiteArtifactStore:
+    def test_put_get_roundtrip(self, tmp_path):
+        store = SQLiteArtifactStore(tmp_path / "records.db")
+        record = _make_record()
+        record_id = store.put(record, key="k1")
+
+        assert record_id in store
+        assert store.get(record_id) == record
+        assert store.get_by_key("k1") == record
+        assert store.get_by_key("k2") is None
+        assert store.get("nope") is None
+        assert len(store) == 1
+
+    def test_same_key_replaces_older_record(self, tmp_path):
+        store = SQLiteArtifactStore(tmp_path / "records.db")
+        first, second = _make_record(), _make_record()
+        store.put(first, key="k")
+        store.put(second, key="k")
+        assert list(store.record_ids()) == [second.record_id]
+
+    def test_find_filters(self, tmp_path):
+        store = SQLiteArtifactStore(tmp_path / "records.db")
+        store.put(_make_record("a", score=0.2))
+        store.put(_make_record("a", audience_id="phd", score=0.9))
+        revised = _make_record("b", score=0.6)
+        revised.add_revision(["structure"])
+        store.put(revised)
+
+        assert [r.artifact.topic for r in store.find(min_score=0.5)] == ["a", "b"]
+        assert [r.artifact.audience.audience_id for r in store.find(topic="a")] == ["phd", "general"]
+        assert len(store.find(topic="a", max_score=0.5)) == 1
+        assert store.find(revision=1)[0].record_id == revised.record_id
+        assert len(store.find(min_revision=0, limit=2)) == 2
+
+    def test_reads_legacy_json_rows(self, tmp_path):
+        store = SQLiteArtifactStore(tmp_path / "records.db")
+        record = _make_record()
+        store.put(record)
+        with store.connect() as conn:
+            conn.execute("UPDATE records SET body = ?", (record.model_dump_json(),))
+        assert store.get(record.record_id) == record
+
+    def test_persists_across_instances(self, tmp_path):
+        record = _make_record()
+        with SQLiteArtifactStore(tmp_path / "records.db") as store:
+            store.put(record, key="k")
+        assert SQLiteArtifactStore(tmp_path / "records.db").get_by_key("k") == record
+
+    def test_concurrent_puts(self, tmp_path):
+        store = SQLiteArtifactStore(tmp_path / "records.db")
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: store.put(_make_record(str(i)), key=str(i)), range(32)))
+        assert len(store) == 32
+
+
+class TestConductorStore:
+    def test_repeat_compile_is_served_from_store(self, tmp_path):
+        store = SQLiteArtifactStore(tmp_path / "records.db")
+        client = _CountingClient()
+        first = CognitiveConductor(ai_client=client, profiles_dir=PROFILES_DIR, artifact_store=store)
+        record = first.compile("neural networks", "general")
+        calls = client.calls
+        assert calls > 0 and len(store) == 1
+
+        # A fresh conductor (e.g. the next day's process) reuses the stored record
+        second = CognitiveConductor(ai_client=client, profiles_dir=PROFILES_DIR, artifact_store=store)
+        again = second.compile("neural networks", "general")
+        assert client.calls == calls
+        assert again.record_id == record.record_id
+        assert again.artifact.metadata["content_key"] == record.artifact.metadata["content_key"]
+
+    def test_different_inputs_compile_again(self, tmp_path):
+        store = SQLiteArtifactStore(tmp_path / "records.db")
+        conductor = CognitiveConductor(ai_client=_CountingClient(), profiles_dir=PROFILES_DIR, artifact_store=store)
+        conductor.compile("neural networks", "general")
+        conductor.compile("neural networks", "general", overrides={"metaphor": {"enabled": False}})
+        conductor.compile("neural networks", "phd")
+        assert len(store) == 3
+
+    def test_degraded_compiles_are_not_stored(self, tmp_path):
+        store = SQLiteArtifactStore(tmp_path / "records.db")
+        conductor = CognitiveConductor(ai_client=_CountingClient(), profiles_dir=PROFILES_DIR, artifact_store=store)
+        record = conductor.compile("neural networks", "general", deadline_ms=1000)
+        assert record.artifact.evaluation.degraded_layers
+        assert len(store) == 0
+
+    def test_ai_fallback_compiles_are_not_stored(self, tmp_path):
+        store = SQLiteArtifactStore(tmp_path / "records.db")
+        failing = _CountingClient(response="[AI unavailable: 429 rate limited]")
+        CognitiveConductor(ai_client=failing, profiles_dir=PROFILES_DIR, artifact_store=store).compile(
+            "neural networks", "general",
+        )
+        assert failing.calls > 0 and len(store) == 0
+
+        # Once the provider recovers the compile runs with AI and is stored
+        healthy = _CountingClient()
+        conductor = CognitiveConductor(ai_client=healthy, profiles_dir=PROFILES_DIR, artifact_store=store)
+        record = conductor.compile("neural networks", "general")
+        assert healthy.calls > 0 and len(store) == 1
+        assert all(o.provenance["ai_available"] for o in record.artifact.populated_layers().values())
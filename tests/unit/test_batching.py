@@ -0,0 +1,166 @@
+"""Unit tests for cross-request micro-batching."""
+
+import threading
+from types import SimpleNamespace
+
+from utils.ai_client import FALLBACK_PREFIX
+from utils.batching import AnthropicBatchBackend, BatchBackend, BatchingAIClient, BatchRequest, LocalBatchBackend
+
+
+class _EchoClient:
+    """Minimal AIClient stand-in."""
+
+    provider = "anthropic"
+    model = "test-model"
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def last_usage(self):
+        return getattr(self._local, "usage", None)
+
+    def is_available(self):
+        return True
+
+    def generate(self, prompt, max_tokens=2000, temperature=0.7, timeout=None, system=None):
+        with self._lock:
+            self.calls.append((prompt, system))
+        self._local.usage = {"model": self.model, "output_tokens": len(prompt)}
+        return f"echo:{prompt}"
+
+    def get_status(self):
+        return {"provider": self.provider}
+
+
+class _RecordingBackend(BatchBackend):
+    def __init__(self):
+        self.batches = []
+
+    def submit(self, requests):
+        self.batches.append([r.prompt for r in requests])
+        for r in requests:
+            r.usage = {"model": "test-model", "output_tokens": len(r.prompt)}
+        return {r.custom_id: f"out:{r.prompt}" for r in requests}
+
+
+def _run_concurrently(client, prompts, usages=None):
+    results = {}
+
+    def call(p):
+        results[p] = client.generate(p)
+        if usages is not None:
+            usages[p] = client.last_usage
+
+    threads = [threading.Thread(target=call, args=(p,)) for p in prompts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+class TestBatchingAIClient:
+    def test_concurrent_calls_coalesced(self):
+        backend = _RecordingBackend()
+        with BatchingAIClient(_EchoClient(), backend=backend, window=0.2) as client:
+            prompts = [f"p{i}" for i in range(10)]
+            results = _run_concurrently(client, prompts)
+        assert results == {p: f"out:{p}" for p in prompts}
+        assert len(backend.batches) == 1
+        assert sorted(backend.batches[0]) == sorted(prompts)
+
+    def test_usage_reaches_each_caller(self):
+        with BatchingAIClient(_EchoClient(), backend=_RecordingBackend(), window=0.2) as client:
+            usages = {}
+            _run_concurrently(client, ["a", "bb", "ccc"], usages)
+        assert {p: usage["output_tokens"] for p, usage in usages.items()} == {"a": 1, "bb": 2, "ccc": 3}
+
+    def test_timed_out_request_is_withdrawn(self):
+        backend = _RecordingBackend()
+        with BatchingAIClient(_EchoClient(), backend=backend, window=0.5) as client:
+            assert client.generate("late", timeout=0.05).startswith(FALLBACK_PREFIX)
+            assert client.last_usage is None
+        assert backend.batches == []
+
+    def test_exposes_wrapped_model(self):
+        with BatchingAIClient(_EchoClient(), backend=_RecordingBackend()) as client:
+            assert (client.provider, client.model) == ("anthropic", "test-model")
+
+    def test_max_batch_size_splits(self):
+        backend = _RecordingBackend()
+        with BatchingAIClient(_EchoClient(), backend=backend, window=0.2, max_batch_size=4) as client:
+            _run_concurrently(client, [f"p{i}" for i in range(10)])
+        assert sum(len(b) for b in backend.batches) == 10
+        assert max(len(b) for b in backend.batches) <= 4
+
+    def test_backend_failure_returns_fallback(self):
+        class Broken(BatchBackend):
+            def submit(self, requests):
+                raise RuntimeError("boom")
+
+        with BatchingAIClient(_EchoClient(), backend=Broken(), window=0.01) as client:
+            assert client.generate("x").startswith(FALLBACK_PREFIX)
+
+    def test_local_backend_uses_wrapped_client(self):
+        inner = _EchoClient()
+        with BatchingAIClient(inner, window=0.01) as client:
+            assert client.generate("hello", system="brief") == "echo:hello"
+            assert client.get_status()["batching"]["backend"] == "LocalBatchBackend"
+        assert inner.calls == [("hello", "brief")]
+
+    def test_closed_client_refuses(self):
+        client = BatchingAIClient(_EchoClient(), window=0.01)
+        client.close()
+        assert not client.is_available()
+        assert client.generate("x").startswith(FALLBACK_PREFIX)
+
+
+class TestLocalBatchBackend:
+    def test_results_keyed_by_custom_id(self):
+        backend = LocalBatchBackend(_EchoClient(), max_workers=2)
+        requests = [BatchRequest("a", "one"), BatchRequest("b", "three")]
+        results = backend.submit(requests)
+        assert results == {"a": "echo:one", "b": "echo:three"}
+        assert [r.usage["output_tokens"] for r in requests] == [3, 5]
+
+
+class TestAnthropicBatchBackend:
+    def test_submit_polls_and_maps_results(self, monkeypatch):
+        monkeypatch.setattr("utils.batching.time.sleep", lambda s: None)
+        created = {}
+        states = iter(["in_progress", "ended"])
+
+        def create(requests):
+            created["requests"] = requests
+            return SimpleNamespace(id="b1", processing_status="in_progress")
+
+        def retrieve(batch_id):
+            return SimpleNamespace(id=batch_id, processing_status=next(states))
+
+        def results(batch_id):
+            usage = SimpleNamespace(input_tokens=7, output_tokens=2, cache_read_input_tokens=40)
+            message = SimpleNamespace(content=[SimpleNamespace(text="hi")], usage=usage)
+            ok = SimpleNamespace(type="succeeded", message=message)
+            return [
+                SimpleNamespace(custom_id="a", result=ok),
+                SimpleNamespace(custom_id="b", result=SimpleNamespace(type="errored")),
+            ]
+
+        client = _EchoClient()
+        client.client = SimpleNamespace(messages=SimpleNamespace(
+            batches=SimpleNamespace(create=create, retrieve=retrieve, results=results),
+        ))
+        backend = AnthropicBatchBackend(client, poll_interval=0)
+        requests = [BatchRequest("a", "one", system="brief"), BatchRequest("b", "two")]
+        out = backend.submit(requests)
+        assert out["a"] == "hi"
+        assert out["b"].startswith(FALLBACK_PREFIX)
+        assert requests[0].usage["cache_read_input_tokens"] == 40
+        assert requests[0].usage["batched"]
+        assert requests[1].usage is None
+        params = created["requests"][0]["params"]
+        assert params["model"] == "test-model"
+        assert params["system"][0]["cache_control"] == {"type": "ephemeral"}
@@ -0,0 +1,187 @@
+"""Unit tests for per-layer timeouts and compile cancellation."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from cognitive_scaffolding.core.models import AudienceProfile, LayerName
+from cognitive_scaffolding.operators.activation import ActivationOperator
+from cognitive_scaffolding.orchestrator.cancellation import CancellationToken, CompileCancelled
+from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
+from cognitive_scaffolding.orchestrator.toggle_manager import ToggleManager
+
+
+PROFILES_DIR = str(Path(__file__).parent.parent.parent / "profiles")
+ACTIVATION_JSON = '{"hook": "h", "prior_knowledge": "p", "why_it_matters": "w"}'
+
+
+class _HungClient:
+    """generate() blocks until released; no stream()."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.timeouts = []
+        self.last_usage = None
+
+    def is_available(self):
+        return True
+
+    def generate(self, prompt, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        self.release.wait(5)
+        return ACTIVATION_JSON
+
+
+class _SlowStreamClient:
+    """stream() yields a chunk every ``gap`` seconds and records when it is closed."""
+
+    def __init__(self, gap=0.05, chunks=40, on_chunk=None):
+        self.gap = gap
+        self.chunks = chunks
+        self.on_chunk = on_chunk
+        self.closed = False
+        self.last_usage = None
+
+    def is_available(self):
+        return True
+
+    def generate(self, prompt, **kwargs):
+        return ACTIVATION_JSON
+
+    def stream(self, prompt, **kwargs):
+        try:
+            for i in range(self.chunks):
+                time.sleep(self.gap)
+                if self.on_chunk:
+                    self.on_chunk(i)
+                yield " "
+            yield ACTIVATION_JSON
+        finally:
+            self.closed = True
+
+
+@pytest.fixture
+def audience():
+    return AudienceProfile(audience_id="general", name="General")
+
+
+class TestCancellationToken:
+    def test_timeout_cancels_lazily(self):
+        token = CancellationToken(timeout_ms=20)
+        assert not token.cancelled
+        assert token.wait() is True
+        assert token.reason == "timed out after 20ms"
+        assert token.remaining() == 0.0
+
+    def test_parent_cancels_children_and_runs_callbacks(self):
+        parent = CancellationToken()
+        child = CancellationToken(timeout_ms=10_000, parent=parent)
+        fired = []
+        child.add_callback(lambda: fired.append(True))
+        parent.cancel("client disconnected")
+        assert child.cancelled and child.reason == "client disconnected"
+        assert fired == [True]
+        with pytest.raises(CompileCancelled, match="client disconnected"):
+            child.raise_if_cancelled()
+
+    def test_remaining_respects_parent_deadline(self):
+        parent = CancellationToken(timeout_ms=50)
+        child = CancellationToken(timeout_ms=10_000, parent=parent)
+        assert child.remaining() <= 0.05
+        assert CancellationToken().remaining() is None
+
+
+class TestLayerTimeout:
+    def test_hung_generate_falls_back(self, audience):
+        client = _HungClient()
+        operator = ActivationOperator(ai_client=client)
+        start = time.monotonic()
+        output = operator.execute("neural networks", audience, {}, {"timeout_ms": 100})
+        client.release.set()
+
+        assert time.monotonic() - start < 1.0
+        assert output.provenance["ai_available"] is False
+        assert output.provenance["cancelled"] == "timed out after 100ms"
+        assert 0 < client.timeouts[0] <= 0.1
+
+    def test_stream_is_closed_on_timeout(self, audience):
+        client = _SlowStreamClient()
+        config = {"timeout_ms": 120, "stream": True}
+        output = ActivationOperator(ai_client=client).execute("neural networks", audience, {}, config)
+        assert client.closed
+        assert output.provenance["cancelled"].startswith("timed out")
+        assert output.provenance["ai_available"] is False
+
+    def test_generate_used_unless_streaming_requested(self, audience):
+        client = _SlowStreamClient(gap=0.5)
+        output = ActivationOperator(ai_client=client).execute("neural networks", audience, {}, {"timeout_ms": 5000})
+        assert output.provenance["ai_available"] is True
+        assert not client.closed  # stream() was never started
+
+    def test_fast_call_is_unaffected(self, audience):
+        client = _SlowStreamClient(gap=0, chunks=1)
+        output = ActivationOperator(ai_client=client).execute("neural networks", audience, {}, {"timeout_ms": 5000})
+        assert output.provenance["ai_available"] is True
+        assert "cancelled" not in output.provenance
+
+
+class TestCompileCancellation:
+    def test_cancelled_token_aborts_compile(self):
+        token = CancellationToken()
+        token.cancel("client disconnected")
+        conductor = CognitiveConductor(ai_client=_SlowStreamClient(gap=0, chunks=1), profiles_dir=PROFILES_DIR)
+        with pytest.raises(CompileCancelled, match="client disconnected"):
+            conductor.compile("neural networks", "general", cancel_token=token)
+
+    def test_disconnect_mid_compile_stops_in_flight_layer(self, tmp_path):
+        profile = yaml.safe_load((Path(PROFILES_DIR) / "chatbot_tutor.yaml").read_text())
+        profile["settings"]["stream_responses"] = True
+        (tmp_path / "streamed.yaml").write_text(yaml.dump(profile))
+        token = CancellationToken()
+        # The client "disconnects" three chunks into the first layer's response
+        client = _SlowStreamClient(gap=0.01, chunks=50, on_chunk=lambda i: i == 2 and token.cancel("client disconnected"))
+        conductor = CognitiveConductor(ai_client=client, profiles_dir=str(tmp_path))
+
+        with pytest.raises(CompileCancelled, match="client disconnected"):
+            conductor.compile("neural networks", "general", profile_name="streamed", cancel_token=token)
+        assert client.closed
+        assert conductor.usage_ledger.totals()["calls"] == 0
+
+    def test_token_stays_out_of_provenance(self):
+        token = CancellationToken()
+        conductor = CognitiveConductor(ai_client=_SlowStreamClient(gap=0, chunks=1), profiles_dir=PROFILES_DIR)
+        record = conductor.compile("neural networks", "general", cancel_token=token)
+        activation = record.artifact.get_layer(LayerName.ACTIVATION)
+        assert "cancel_token" not in activation.provenance["config"]
+        record.model_dump_json()
+
+
+class TestProfileTimeouts:
+    def test_settings_default_and_layer_override(self, tmp_path):
+        profile = {
+            "layers": {"activation": {"timeout_ms": 500}, "structure": {}},
+            "settings": {"timeout_ms_per_layer": 8000},
+        }
+        (tmp_path / "timed.yaml").write_text(yaml.dump(profile))
+        mgr = ToggleManager(str(tmp_path))
+        configs = mgr.load_profile("timed")
+        assert configs["activation"].timeout_ms == 500
+        assert configs["structure"].timeout_ms == 8000
+        merged = mgr.apply_overrides(configs, {"structure": {"timeout_ms": 1000}})
+        assert merged["structure"].timeout_ms == 1000
+
+    def test_timeout_reaches_operator(self, tmp_path):
+        profile = {"layers": {layer.value: {"enabled": layer == LayerName.ACTIVATION} for layer in LayerName}}
+        profile["layers"]["activation"]["timeout_ms"] = 100
+        (tmp_path / "timed.yaml").write_text(yaml.dump(profile))
+        client = _HungClient()
+        conductor = CognitiveConductor(ai_client=client, profiles_dir=str(tmp_path))
+        record = conductor.compile("neural networks", "general", profile_name="timed")
+        client.release.set()
+
+        activation = record.artifact.get_layer(LayerName.ACTIVATION)
+        assert activation.provenance["cancelled"] == "timed out after 100ms"
+        assert record.artifact.metadata["provenance"]["failed"] == []
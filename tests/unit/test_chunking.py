@@ -0,0 +1,42 @@
+"""Unit tests for token-budget chunking."""
+
+import pytest
+
+from cognitive_scaffolding.adapters.chunking import TextChunker, content_hash
+
+
+def _words(n: int) -> str:
+    return " ".join(f"w{i}" for i in range(n))
+
+
+class TestTextChunker:
+    def test_short_text_single_chunk(self):
+        assert TextChunker(max_tokens=10).split("  a short sentence here  ") == ["a short sentence here"]
+
+    def test_respects_token_budget(self):
+        chunks = TextChunker(max_tokens=10, overlap=0).split(_words(25))
+        assert [TextChunker.count_tokens(c) for c in chunks] == [10, 10, 5]
+
+    def test_overlap_repeats_tail_tokens(self):
+        chunks = TextChunker(max_tokens=10, overlap=3).split(_words(20))
+        assert chunks[0].split()[-3:] == chunks[1].split()[:3]
+        # Every token is covered and the last chunk ends at the last token
+        assert chunks[-1].split()[-1] == "w19"
+        assert all(TextChunker.count_tokens(c) <= 10 for c in chunks)
+
+    def test_preserves_inner_newlines(self):
+        text = "line one here\nline two here"
+        assert TextChunker(max_tokens=50).split(text) == [text]
+
+    def test_min_chars_drops_tiny_chunks(self):
+        assert TextChunker(max_tokens=5, min_chars=10).split("tiny") == []
+
+    def test_invalid_overlap(self):
+        with pytest.raises(ValueError):
+            TextChunker(max_tokens=5, overlap=5)
+
+
+class TestContentHash:
+    def test_whitespace_insensitive(self):
+        assert content_hash("a  b\nc") == content_hash("a b c")
+        assert content_hash("a b c") != content_hash("a b d")
@@ -0,0 +1,197 @@
+"""Unit tests for multi-endpoint load balancing and failover."""
+
+import threading
+
+import pytest
+
+from utils.ai_client import FALLBACK_PREFIX
+from utils.client_pool import AIClientPool
+from utils.rate_limit import RateLimiter
+
+
+class _Client:
+    """AIClient stand-in with scripted availability and failures."""
+
+    def __init__(self, name, fail=False, available=True, error=None):
+        self.provider = "fake"
+        self.model = name
+        self.fail = fail
+        self.error = error
+        self.last_error = None
+        self.available = available
+        self.calls = 0
+        self.last_usage = None
+        self.rate_limiter = None
+        self.circuit_breaker = None
+
+    def is_available(self):
+        return self.available
+
+    def generate(self, prompt, **kwargs):
+        self.calls += 1
+        if self.fail:
+            self.last_usage = None
+            self.last_error = self.error
+            return f"{FALLBACK_PREFIX} {self.model} down]"
+        self.last_usage = {"model": self.model, "input_tokens": 1}
+        return f"{self.model}:{prompt}"
+
+    def stream(self, prompt, **kwargs):
+        self.calls += 1
+        if self.fail:
+            self.last_error = self.error
+            yield f"{FALLBACK_PREFIX} {self.model} down]"
+            return
+        yield from ("a", "b")
+
+
+class _BlockingClient(_Client):
+    """_Client whose calls wait for ``release`` before answering."""
+
+    def __init__(self, name, release):
+        super().__init__(name)
+        self.release = release
+
+    def generate(self, prompt, **kwargs):
+        self.release.wait(5)
+        return super().generate(prompt, **kwargs)
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class TestRouting:
+    def test_unmeasured_endpoints_explored_then_fastest_preferred(self):
+        a, b = _Client("a"), _Client("b")
+        pool = AIClientPool([a, b])
+        pool.generate("x")
+        pool.generate("x")
+        assert a.calls == 1 and b.calls == 1
+        pool.endpoints[0].latency_ms = 500.0
+        pool.endpoints[1].latency_ms = 50.0
+        for _ in range(5):
+            pool.generate("x")
+        assert b.calls == 6
+
+    def test_error_rate_and_throttling_lower_priority(self):
+        a, b = _Client("a"), _Client("b")
+        pool = AIClientPool([a, b])
+        for endpoint in pool.endpoints:
+            endpoint.latency_ms = 100.0
+        pool.endpoints[0].error_rate = 0.5
+        assert pool.ranked()[0].name.startswith("fake:b")
+        pool.endpoints[0].error_rate = 0.0
+        b.rate_limiter = RateLimiter(rpm=60)
+        b.rate_limiter.scale = 0.25
+        assert pool.ranked()[0].name.startswith("fake:a")
+
+    def test_cold_start_burst_spreads_across_endpoints(self):
+        release = threading.Event()
+        clients = [_BlockingClient(name, release) for name in "abc"]
+        pool = AIClientPool(clients)
+        threads = [threading.Thread(target=pool.generate, args=("x",)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        while sum(e.in_flight for e in pool.endpoints) < 6:
+            release.wait(0.01)
+        assert [e.in_flight for e in pool.endpoints] == [2, 2, 2]
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    def test_model_and_provider(self):
+        assert AIClientPool([_Client("a"), _Client("a")]).model == "a"
+        pool = AIClientPool([_Client("b"), _Client("a")])
+        assert pool.model == "a,b"
+        assert pool.provider == "fake"
+
+    def test_weights_shift_traffic(self):
+        pool = AIClientPool([_Client("a"), _Client("b")], weights=[1.0, 4.0])
+        for endpoint in pool.endpoints:
+            endpoint.latency_ms = 100.0
+        assert pool.ranked()[0].client.model == "b"
+
+
+class TestFailover:
+    def test_failed_endpoint_fails_over(self):
+        bad, good = _Client("bad", fail=True), _Client("good")
+        pool = AIClientPool([bad, good], names=["bad", "good"])
+        assert pool.generate("hi") == "good:hi"
+        assert pool.last_usage["endpoint"] == "good"
+        assert [e["outcome"] for e in pool.routing_log] == ["failed", "ok"]
+        status = {e["name"]: e for e in pool.get_status()["endpoints"]}
+        assert status["bad"]["errors"] == 1
+        assert status["bad"]["error_rate"] > 0
+        assert status["good"]["in_flight"] == 0
+
+    def test_unavailable_endpoints_skipped(self):
+        down, up = _Client("down", available=False), _Client("up")
+        pool = AIClientPool([down, up])
+        assert pool.generate("hi") == "up:hi"
+        assert down.calls == 0
+
+    def test_all_down(self):
+        pool = AIClientPool([_Client("a", available=False)])
+        assert not pool.is_available()
+        assert pool.generate("hi").startswith(FALLBACK_PREFIX)
+
+    def test_all_failing_returns_last_sentinel(self):
+        pool = AIClientPool([_Client("a", fail=True), _Client("b", fail=True)])
+        assert pool.generate("hi").startswith(FALLBACK_PREFIX)
+        assert all(e["in_flight"] == 0 for e in pool.get_status()["endpoints"])
+
+    def test_stream_fails_over_before_first_chunk(self):
+        bad, good = _Client("bad", fail=True), _Client("good")
+        pool = AIClientPool([bad, good])
+        assert "".join(pool.stream("hi")) == "ab"
+        assert bad.calls == 1
+        assert all(e["in_flight"] == 0 for e in pool.get_status()["endpoints"])
+
+    def test_non_retryable_error_does_not_fail_over(self):
+        bad = _Client("bad", fail=True, error=_StatusError(400))
+        good = _Client("good")
+        assert AIClientPool([bad, good]).generate("hi").startswith(FALLBACK_PREFIX)
+        assert "".join(AIClientPool([bad, good]).stream("hi")).startswith(FALLBACK_PREFIX)
+        assert good.calls == 0
+
+    def test_retryable_error_fails_over(self):
+        bad = _Client("bad", fail=True, error=_StatusError(529))
+        good = _Client("good")
+        pool = AIClientPool([bad, good])
+        assert pool.generate("hi") == "good:hi"
+
+    def test_cancelled_stream_not_counted_as_failure(self):
+        pool = AIClientPool([_Client("a")])
+        chunks = pool.stream("hi")
+        next(chunks)
+        chunks.close()
+        (endpoint,) = pool.get_status()["endpoints"]
+        assert endpoint["errors"] == 0 and endpoint["in_flight"] == 0
+        assert pool.routing_log[-1]["outcome"] == "cancelled"
+
+
+class TestFromEnv:
+    def test_parses_endpoints(self, monkeypatch):
+        import utils.client_pool as client_pool_module
+
+        created = []
+
+        def fake_client(**kwargs):
+            created.append(kwargs)
+            return _Client(kwargs.get("model") or "default")
+
+        monkeypatch.setattr(client_pool_module, "AIClient", fake_client)
+        monkeypatch.setenv("AI_ENDPOINTS", "anthropic:claude-sonnet-4-5:KEY_TWO, openai")
+        monkeypatch.setenv("KEY_TWO", "secret")
+        pool = AIClientPool.from_env()
+        assert len(pool.endpoints) == 2
+        assert created[0] == {"provider": "anthropic", "model": "claude-sonnet-4-5", "api_key": "secret"}
+        assert created[1] == {"provider": "openai", "model": None, "api_key": None}
+
+
+def test_empty_pool_rejected():
+    with pytest.raises(ValueError):
+        AIClientPool([])
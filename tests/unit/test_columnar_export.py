@@ -0,0 +1,85 @@
+"""Unit tests for the columnar exporter."""
+
+import csv
+import json
+
+import pytest
+
+from cognitive_scaffolding.adapters.columnar_export import ColumnarExporter, read_numpy_parts
+from cognitive_scaffolding.adapters.etl_adapter import ETLAdapter
+from cognitive_scaffolding.core.models import (
+    ArtifactRecord,
+    AudienceProfile,
+    CognitiveArtifact,
+    EvaluationResult,
+    LayerName,
+    LayerOutput,
+)
+
+
+def _make_record(i: int, evaluated: bool = True) -> ArtifactRecord:
+    artifact = CognitiveArtifact(
+        topic=f"topic {i}",
+        audience=AudienceProfile(audience_id="general", name="General"),
+    )
+    artifact.set_layer(LayerName.STRUCTURE, LayerOutput(
+        layer=LayerName.STRUCTURE, content={"definition": "x"}, confidence=0.5,
+    ))
+    if evaluated:
+        artifact.evaluation = EvaluationResult(overall_score=0.5, missing_required=["metaphor"])
+    return ArtifactRecord(artifact=artifact, profile_name="etl_explain")
+
+
+def _rows(n: int):
+    adapter = ETLAdapter()
+    return adapter.format_many(_make_record(i, evaluated=i % 2 == 0) for i in range(n))
+
+
+class TestCSVExport:
+    def test_streams_all_rows_in_batches(self, tmp_path):
+        path = tmp_path / "out.csv"
+        exporter = ColumnarExporter(ETLAdapter.schema(), format="csv", batch_size=3)
+        assert exporter.write(_rows(7), path) == 7
+
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 7
+        assert list(rows[0]) == list(ETLAdapter.schema())
+        assert rows[0]["topic"] == "topic 0"
+        assert json.loads(rows[0]["missing_required"]) == ["metaphor"]
+        # Unevaluated record: score is null
+        assert rows[1]["score"] == ""
+
+    def test_unknown_format_rejected(self):
+        with pytest.raises(ValueError):
+            ColumnarExporter(ETLAdapter.schema(), format="xlsx")
+
+
+class TestParquetExport:
+    def test_typed_roundtrip(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "out.parquet"
+        exporter = ColumnarExporter(ETLAdapter.schema(), format="parquet", batch_size=4)
+        assert exporter.write(_rows(10), path) == 10
+
+        parquet_file = pq.ParquetFile(str(path))
+        assert parquet_file.metadata.num_row_groups == 3
+        table = parquet_file.read()
+        assert table.num_rows == 10
+        assert str(table.schema.field("cv_rigor").type) == "double"
+        assert str(table.schema.field("layer_structure_populated").type) == "bool"
+        assert table.column("score").to_pylist()[1] is None
+        assert table.column("layers_populated").to_pylist()[0] == ["structure"]
+
+
+class TestNumpyExport:
+    def test_structured_parts(self, tmp_path):
+        pytest.importorskip("numpy")
+        exporter = ColumnarExporter(ETLAdapter.schema(), format="numpy", batch_size=4)
+        assert exporter.write(_rows(6), tmp_path / "parts") == 6
+
+        parts = list(read_numpy_parts(tmp_path / "parts"))
+        assert [len(p) for p in parts] == [4, 2]
+        assert parts[0]["topic"][1] == "topic 1"
+        assert parts[0]["layer_structure_populated"].all()
+
@@ -0,0 +1,109 @@
+"""Unit tests for dictionary compression of stored artifacts."""
+
+import gzip
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+from cognitive_scaffolding.core import compression
+from cognitive_scaffolding.core.artifact_store import SQLiteArtifactStore
+from cognitive_scaffolding.core.compression import Compressor, train_dictionary
+from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
+
+
+ROOT = Path(__file__).parent.parent.parent
+PROFILES_DIR = str(ROOT / "profiles")
+DATA_DIR = str(ROOT / "data")
+
+
+@pytest.fixture(scope="module")
+def records():
+    conductor = CognitiveConductor(ai_client=None, profiles_dir=PROFILES_DIR, data_dir=DATA_DIR)
+    concepts = sorted(name[:-5] for name in os.listdir(ROOT / "data" / "concepts"))
+    audiences = ["child", "general", "data_scientist", "phd"]
+    rng = random.Random(0)
+    return [
+        conductor.compile(concept.replace("_", " "), rng.choice(audiences))
+        for concept in rng.sample(concepts, 40)
+    ]
+
+
+@pytest.fixture(scope="module")
+def samples(records):
+    return [r.model_dump_json().encode("utf-8") for r in records]
+
+
+class TestCompressor:
+    @pytest.mark.parametrize("codec", ["zlib", "zstd"])
+    def test_roundtrip_with_dictionary(self, samples, codec):
+        if codec == "zstd":
+            pytest.importorskip("zstandard")
+        compressor = Compressor(train_dictionary(samples[:30], codec))
+        for sample in samples[30:]:
+            assert compressor.decompress(compressor.compress(sample)) == sample
+
+    def test_zlib_dictionary_beats_per_record_gzip(self, samples):
+        train, test = samples[:30], samples[30:]
+        compressor = Compressor(train_dictionary(train, "zlib"))
+        gzipped = sum(len(gzip.compress(s, 9)) for s in test)
+        assert sum(len(compressor.compress(s)) for s in test) < gzipped / 1.3
+
+    def test_zstd_dictionary_is_several_fold_smaller_than_gzip(self, samples):
+        pytest.importorskip("zstandard")
+        train, test = samples[:30], samples[30:]
+        compressor = Compressor(train_dictionary(train, "zstd"))
+        gzipped = sum(len(gzip.compress(s, 9)) for s in test)
+        assert sum(len(compressor.compress(s)) for s in test) < gzipped / 2.5
+
+    def test_unknown_dictionary_is_rejected(self, samples):
+        frame = Compressor(train_dictionary(samples, "zlib")).compress(samples[0])
+        with pytest.raises(ValueError, match="unknown compression dictionary"):
+            Compressor(codec="zlib").decompress(frame)
+
+    def test_older_dictionaries_stay_readable(self, samples):
+        old = train_dictionary(samples[:10], "zlib")
+        frame = Compressor(old).compress(samples[0])
+        current = Compressor(train_dictionary(samples[10:], "zlib"), known=[old])
+        assert current.decompress(frame) == samples[0]
+
+    def test_zstd_needs_zstandard(self, monkeypatch):
+        monkeypatch.setattr(compression, "ZSTD_AVAILABLE", False)
+        assert compression.default_codec() == "zlib"
+        with pytest.raises(ImportError):
+            Compressor(codec="zstd")
+
+
+class TestCompressedStore:
+    def test_train_and_recompress(self, tmp_path, records):
+        store = SQLiteArtifactStore(tmp_path / "records.db")
+        for record in records:
+            store.put(record)
+        plain = store.stored_bytes()
+
+        store.train_compression("zlib")
+        assert store.recompress() == len(records)
+        assert store.stored_bytes() < plain / 5
+        assert store.get(records[0].record_id) == records[0]
+
+    def test_dictionaries_persist_and_mixed_rows_load(self, tmp_path, records):
+        path = tmp_path / "records.db"
+        store = SQLiteArtifactStore(path)
+        store.put(records[0])  # plain JSON, written before compression
+        for record in records[1:20]:
+            store.put(record)
+        store.train_compression("zlib")
+        store.put(records[20])
+        store.close()
+
+        reopened = SQLiteArtifactStore(path, compression="zlib")
+        reopened.put(records[21])
+        assert reopened.get(records[0].record_id) == records[0]
+        assert reopened.get(records[20].record_id) == records[20]
+        assert reopened.get(records[21].record_id) == records[21]
+        assert len(reopened.find(topic=records[21].artifact.topic)) == 1
+
+    def test_training_empty_store_fails(self, tmp_path):
+        with pytest.raises(ValueError):
+            SQLiteArtifactStore(tmp_path / "records.db").train_compression()
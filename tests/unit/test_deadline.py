@@ -0,0 +1,123 @@
+"""Unit tests for deadline-driven scheduling and graceful degradation."""
+
+import time
+from pathlib import Path
+
+from cognitive_scaffolding.core.models import LayerName
+from cognitive_scaffolding.orchestrator.call_plan import CallPlan
+from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
+from cognitive_scaffolding.orchestrator.toggle_manager import ToggleManager
+
+
+PROFILES_DIR = str(Path(__file__).parent.parent.parent / "profiles")
+REQUIRED = ["activation", "structure", "encoding"]
+# Required layers plus what they depend on (structure reads metaphor), in plan order
+ESSENTIAL = ["activation", "metaphor", "structure", "encoding"]
+
+
+class _SlowClient:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.layers = []
+        self.last_usage = None
+
+    def is_available(self):
+        return True
+
+    def generate(self, prompt, layer=None, **kwargs):
+        self.layers.append(layer)
+        time.sleep(self.delay)
+        # Prompts embed earlier layers' output, so execution order shows up in the content
+        return f'{{"text": "ai output for a {len(prompt)}-character prompt"}}'
+
+
+def _conductor(client, estimate_ms=None):
+    conductor = CognitiveConductor(ai_client=client, profiles_dir=PROFILES_DIR)
+    if estimate_ms is not None:
+        for layer in LayerName:
+            conductor._observe_layer(layer.value, estimate_ms)
+    return conductor
+
+
+class TestPrioritySteps:
+    def test_required_first_then_by_weight(self):
+        plan = CallPlan.from_layer_configs(ToggleManager(PROFILES_DIR).load_profile("chatbot_tutor"))
+        order = [s.layer.value for s in plan.priority_steps()]
+        assert order[:3] == REQUIRED
+        assert order[3] == "metaphor"  # highest optional weight (1.5)
+        assert set(order) == {s.layer.value for s in plan.enabled_steps()}
+
+    def test_essential_layers_pull_in_dependencies(self):
+        plan = CallPlan.from_layer_configs(ToggleManager(PROFILES_DIR).load_profile("chatbot_tutor"))
+        depends_on = {
+            LayerName.STRUCTURE: [LayerName.METAPHOR],
+            LayerName.METAPHOR: [LayerName.ACTIVATION],
+            LayerName.ENCODING: [LayerName.STRUCTURE, LayerName.NARRATIVE],  # narrative is disabled
+        }
+        assert {layer.value for layer in plan.essential_layers(depends_on)} == set(ESSENTIAL)
+
+
+class TestDeadlineCompile:
+    def test_generous_deadline_runs_everything(self):
+        client = _SlowClient()
+        record = _conductor(client, estimate_ms=1).compile("neural networks", "general", deadline_ms=60_000)
+        summary = record.artifact.metadata["provenance"]
+        assert summary["degraded"] == {}
+        assert record.artifact.evaluation.degraded_layers == {}
+
+    def test_generous_deadline_matches_no_deadline(self):
+        plain_client, deadline_client = _SlowClient(), _SlowClient()
+        plain = _conductor(plain_client).compile("neural networks", "general")
+        timed = _conductor(deadline_client).compile("neural networks", "general", deadline_ms=10**9)
+
+        assert deadline_client.layers == plain_client.layers
+        plain_layers = plain.artifact.populated_layers()
+        timed_layers = timed.artifact.populated_layers()
+        assert timed_layers.keys() == plain_layers.keys()
+        assert all(timed_layers[name].content == plain_layers[name].content for name in plain_layers)
+
+    def test_tight_deadline_degrades_optional_layers_to_fallback(self):
+        client = _SlowClient()
+        record = _conductor(client).compile("neural networks", "general", deadline_ms=1000)
+
+        # Default estimates reserve the whole budget for required layers and their dependencies
+        assert client.layers == ESSENTIAL
+        degraded = record.artifact.evaluation.degraded_layers
+        assert set(degraded.values()) == {"fallback"}
+        assert "diagnostic" in degraded and not set(ESSENTIAL) & set(degraded)
+        diagnostic = record.artifact.get_layer(LayerName.DIAGNOSTIC)
+        assert diagnostic is not None and diagnostic.provenance["ai_available"] is False
+        assert record.artifact.metadata["deadline_ms"] == 1000
+
+    def test_budget_goes_to_higher_weight_optional_layers(self):
+        client = _SlowClient()
+        record = _conductor(client, estimate_ms=10_000).compile("neural networks", "general", deadline_ms=45_000)
+        # diagnostic runs first but is outranked by the heavier optional layers after it
+        assert record.artifact.metadata["provenance"]["degraded"] == {"diagnostic": "fallback"}
+        assert client.layers[0] == "activation"
+
+    def test_expired_deadline_skips_optional_layers(self):
+        client = _SlowClient(delay=0.02)
+        record = _conductor(client, estimate_ms=1).compile("neural networks", "general", deadline_ms=30)
+
+        summary = record.artifact.metadata["provenance"]
+        assert "skipped" in summary["degraded"].values()
+        skipped = [layer for layer, mode in summary["degraded"].items() if mode == "skipped"]
+        for layer in skipped:
+            assert record.artifact.get_layer(LayerName(layer)) is None
+        # Required layers are never degraded
+        assert all(record.artifact.get_layer(LayerName(layer)) for layer in REQUIRED)
+        assert not record.artifact.evaluation.missing_required
+
+    def test_fused_degraded_members_leave_the_request(self):
+        client = _SlowClient()
+        record = _conductor(client).compile("neural networks", "general", fused=True, deadline_ms=1000)
+        assert all(layer in ESSENTIAL for name in client.layers for layer in name.split("+"))
+        assert record.artifact.evaluation.degraded_layers
+
+    def test_no_deadline_keeps_plan_order(self):
+        client = _SlowClient()
+        record = _conductor(client).compile("neural networks", "general")
+        assert client.layers[0] == "diagnostic"
+        assert record.artifact.metadata["provenance"]["degraded"] == {}
+        assert "deadline_ms" not in record.artifact.metadata
@@ -3,8 +3,10 @@
 import pytest
 from pathlib import Path
 
+from cognitive_scaffolding.core.artifact_store import FileArtifactStore
 from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
 from cognitive_scaffolding.orchestrator.experiment_runner import (
+    EXPERIMENT_ROW_SCHEMA,
     ExperimentConfig,
     ExperimentRunner,
     LayerExperimentResult,
@@ -151,3 +153,77 @@ class TestSummaryOutput:
         # best/worst should be one of the tested layers
         assert summary["best_layer"] in {"metaphor", "encoding"}
         assert summary["worst_layer"] in {"metaphor", "encoding"}
+
+
+class TestScoresOnlyMode:
+    def test_records_spilled_to_store(self, conductor, tmp_path):
+        """scores_only drops records from the report and persists them by ID."""
+        store = FileArtifactStore(tmp_path / "records")
+        runner = ExperimentRunner(conductor, artifact_store=store)
+        config = ExperimentConfig(
+            topic="neural networks",
+            audience_id="general",
+            profile_name="chatbot_tutor",
+            toggle_layers=["metaphor", "encoding"],
+            scores_only=True,
+        )
+        report = runner.run(config)
+
+        assert report.baseline_record is None
+        assert report.baseline_record_id in store
+        for result in report.layer_results:
+            assert result.enabled_result.record is None
+            assert result.disabled_result.record is None
+            assert result.enabled_result.record_id in store
+        # baseline + 2 variants per layer
+        assert len(store) == 5
+
+        loaded = runner.load_record(report.baseline_record_id)
+        assert loaded is not None
+        assert loaded.artifact.evaluation.overall_score == pytest.approx(report.baseline_score)
+
+    def test_scores_only_without_store(self, runner):
+        """Without a store, records are dropped but scores and IDs remain."""
+        config = ExperimentConfig(
+            topic="neural networks",
+            audience_id="general",
+            toggle_layers=["metaphor"],
+            scores_only=True,
+        )
+        report = runner.run(config)
+
+        assert report.baseline_record is None
+        assert report.layer_results[0].enabled_result.record is None
+        assert report.layer_results[0].enabled_result.record_id
+        assert "metaphor" in report.layer_results[0].enabled_result.populated_layers
+        assert runner.load_record(report.baseline_record_id) is None
+
+    def test_default_mode_keeps_records(self, runner):
+        config = ExperimentConfig(
+            topic="neural networks",
+            audience_id="general",
+            toggle_layers=["metaphor"],
+        )
+        report = runner.run(config)
+
+        assert report.baseline_record is not None
+        assert report.baseline_record_id == report.baseline_record.record_id
+        result = report.layer_results[0].enabled_result
+        assert result.record_id == result.record.record_id
+
+
+class TestRowsOutput:
+    def test_rows_match_schema(self, runner):
+        config = ExperimentConfig(
+            topic="neural networks",
+            audience_id="general",
+            toggle_layers=["metaphor", "encoding"],
+            scores_only=True,
+        )
+        report = runner.run(config)
+        rows = ExperimentRunner.rows(report)
+
+        assert [r["layer"] for r in rows] == ["metaphor", "encoding"]
+        for row in rows:
+            assert list(row) == list(EXPERIMENT_ROW_SCHEMA)
+            assert row["baseline_score"] == report.baseline_score
@@ -0,0 +1,105 @@
+"""Unit tests for fused multi-layer execution."""
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from cognitive_scaffolding.core.models import LayerName
+from cognitive_scaffolding.orchestrator.call_plan import CallPlan
+from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
+from cognitive_scaffolding.orchestrator.fusion import plan_groups
+from cognitive_scaffolding.orchestrator.toggle_manager import ToggleManager
+
+
+PROFILES_DIR = str(Path(__file__).parent.parent.parent / "profiles")
+_LAYER_HEADER = re.compile(r'^## Layer "(\w+)"', re.MULTILINE)
+
+
+class _FusingAIClient:
+    """Answers fused prompts with one valid object per requested layer."""
+
+    def __init__(self, conductor, drop=()):
+        self.conductor = conductor
+        self.drop = set(drop)
+        self.prompts = []
+
+    def is_available(self):
+        return True
+
+    def _expected_keys(self, layer):
+        plan = CallPlan.from_layer_configs(self.conductor.toggle_manager.load_profile("chatbot_tutor"))
+        step = next(s for s in plan.steps if s.layer.value == layer)
+        return self.conductor._get_operator(step.operator_class).expected_keys
+
+    def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        layers = _LAYER_HEADER.findall(prompt)
+        if not layers:
+            return json.dumps({"text": "single layer output"})
+        return json.dumps({
+            layer: {key: f"{layer} {key}" for key in self._expected_keys(layer)}
+            for layer in layers if layer not in self.drop
+        })
+
+
+@pytest.fixture
+def conductor():
+    return CognitiveConductor(ai_client=None, profiles_dir=PROFILES_DIR)
+
+
+def _groups(conductor, profile="chatbot_tutor"):
+    plan = CallPlan.from_layer_configs(ToggleManager(PROFILES_DIR).load_profile(profile), profile)
+    steps = plan.enabled_steps()
+    operators = {s.layer: conductor._get_operator(s.operator_class) for s in steps}
+    return [[s.layer.value for s in group] for group in plan_groups(steps, operators)]
+
+
+class TestPlanGroups:
+    def test_chatbot_tutor_levels(self, conductor):
+        assert _groups(conductor) == [
+            ["diagnostic", "activation"],
+            ["metaphor"],
+            ["structure"],
+            ["interrogation", "encoding", "transfer"],
+            ["reflection"],
+            ["synthesis"],
+        ]
+
+    def test_every_enabled_layer_planned_once(self, conductor):
+        flat = [layer for group in _groups(conductor, "rag_explainer") for layer in group]
+        assert len(flat) == len(set(flat))
+
+
+class TestFusedCompile:
+    def test_fewer_calls_same_layers(self, conductor):
+        client = _FusingAIClient(conductor)
+        conductor.ai_client = client
+        fused = conductor.compile("neural networks", "general", fused=True)
+        fused_calls = len(client.prompts)
+
+        client.prompts = []
+        sequential = conductor.compile("neural networks", "general")
+        assert fused_calls == 6
+        assert len(client.prompts) == 9
+        assert set(fused.artifact.populated_layers()) == set(sequential.artifact.populated_layers())
+
+        encoding = fused.artifact.get_layer(LayerName.ENCODING)
+        assert encoding.provenance["fused_group"] == ["interrogation", "encoding", "transfer"]
+        assert encoding.content["chunks"] == "encoding chunks"
+
+    def test_incomplete_layer_rerun_alone(self, conductor):
+        client = _FusingAIClient(conductor, drop={"transfer"})
+        conductor.ai_client = client
+        record = conductor.compile("neural networks", "general", fused=True)
+        transfer = record.artifact.get_layer(LayerName.TRANSFER)
+        assert "fused_group" not in transfer.provenance
+        assert transfer.content == {"text": "single layer output"}
+        assert len(client.prompts) == 7
+
+    def test_without_ai_matches_sequential(self, conductor):
+        fused = conductor.compile("neural networks", "general", fused=True)
+        sequential = conductor.compile("neural networks", "general")
+        for layer, output in sequential.artifact.populated_layers().items():
+            assert fused.artifact.populated_layers()[layer].content == output.content
@@ -0,0 +1,141 @@
+"""Unit tests for hedged AI requests."""
+
+import threading
+import time
+
+import pytest
+
+from utils.ai_client import FALLBACK_PREFIX
+from utils.hedging import HedgedAIClient
+
+
+class _Client:
+    """AIClient stand-in whose n-th call sleeps ``delays[n]`` seconds."""
+
+    def __init__(self, delays=(), default_delay=0.0, fail_calls=()):
+        self.provider = "fake"
+        self.model = "fake-model"
+        self.delays = list(delays)
+        self.default_delay = default_delay
+        self.fail_calls = set(fail_calls)
+        self.calls = 0
+        self.kwargs = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def last_usage(self):
+        return getattr(self._local, "usage", None)
+
+    def is_available(self):
+        return True
+
+    def generate(self, prompt, **kwargs):
+        with self._lock:
+            n = self.calls
+            self.calls += 1
+            self.kwargs.append(kwargs)
+        time.sleep(self.delays[n] if n < len(self.delays) else self.default_delay)
+        if n in self.fail_calls:
+            self._local.usage = None
+            return f"{FALLBACK_PREFIX} call {n} failed]"
+        self._local.usage = {"model": self.model, "input_tokens": 10, "output_tokens": 5}
+        return f"response {n}"
+
+    def stream(self, prompt, **kwargs):
+        yield "chunk"
+
+    def get_status(self):
+        return {"provider": self.provider}
+
+
+def _warm(client, layer="activation", samples=5):
+    for _ in range(samples):
+        client.generate("warm", layer=layer)
+
+
+class TestHedgedAIClient:
+    def test_no_hedge_without_samples_or_flag(self):
+        inner = _Client()
+        client = HedgedAIClient(inner, min_samples=3, hedge_budget=1.0)
+        assert client.hedge_delay_ms("activation") is None
+        _warm(client, samples=3)
+        assert client.hedge_delay_ms("activation") is not None
+        # hedge not requested -> single call
+        client.generate("x", layer="activation")
+        assert inner.calls == 4
+        assert "hedge" not in inner.kwargs[-1]
+
+    def test_slow_primary_is_hedged_and_backup_wins(self):
+        inner = _Client(delays=[0.0] * 5 + [0.5, 0.0], default_delay=0.0)
+        client = HedgedAIClient(inner, min_samples=5, hedge_budget=1.0, min_delay_ms=20)
+        _warm(client)
+
+        start = time.monotonic()
+        text = client.generate("slow", hedge=True, layer="activation")
+        elapsed = time.monotonic() - start
+
+        assert text == "response 6"
+        assert elapsed < 0.4
+        assert client.last_usage["hedged"] is True
+        stats = client.get_status()["hedging"]
+        assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+        time.sleep(0.6)  # loser finishes and is counted as waste
+        assert client.get_status()["hedging"]["wasted_output_tokens"] == 5
+
+    def test_failed_backup_waits_for_primary(self):
+        inner = _Client(delays=[0.0] * 5 + [0.15, 0.0], fail_calls={6})
+        client = HedgedAIClient(inner, min_samples=5, hedge_budget=1.0, min_delay_ms=20)
+        _warm(client)
+        assert client.generate("x", hedge=True, layer="activation") == "response 5"
+        assert client.get_status()["hedging"]["hedge_wins"] == 0
+
+    def test_budget_bounds_hedges(self):
+        inner = _Client(delays=[0.0] * 10, default_delay=0.06)
+        client = HedgedAIClient(
+            inner, min_samples=5, quantile=0.5, hedge_budget=0.25, max_credit=1.0, min_delay_ms=20,
+        )
+        _warm(client, samples=10)
+        for _ in range(4):
+            client.generate("x", hedge=True, layer="activation")
+        stats = client.get_status()["hedging"]
+        # Warm-up credit is capped at one hedge; the next three calls only earn 0.75
+        assert stats["hedged"] == 1
+        assert stats["budget_exhausted"] == 3
+        assert inner.calls == 10 + 4 + 1
+
+    def test_layers_tracked_separately(self):
+        client = HedgedAIClient(_Client(), min_samples=2)
+        _warm(client, layer="activation", samples=2)
+        assert client.hedge_delay_ms("activation") is not None
+        assert client.hedge_delay_ms("synthesis") is None
+
+    def test_stream_passes_through(self):
+        client = HedgedAIClient(_Client())
+        assert list(client.stream("x", hedge=True, layer="activation")) == ["chunk"]
+
+
+class TestProfileOptIn:
+    def test_chatbot_tutor_steps_request_hedging(self):
+        from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
+
+        hedge_flags = []
+
+        class _Spy(HedgedAIClient):
+            def generate(self, prompt, hedge=None, **kwargs):
+                hedge_flags.append(hedge)
+                return super().generate(prompt, hedge=hedge, **kwargs)
+
+        with _Spy(_Client()) as client:
+            CognitiveConductor(ai_client=client).compile("neural networks", "general", profile_name="chatbot_tutor")
+        assert hedge_flags and all(hedge_flags)
+
+    @pytest.mark.parametrize("supports, expected", [(True, True), (False, None)])
+    def test_generation_options_need_hedging_client(self, supports, expected):
+        from cognitive_scaffolding.operators.activation import ActivationOperator
+
+        class _Plain:
+            supports_hedging = supports
+
+        options = ActivationOperator(ai_client=_Plain()).generation_options({"hedge": True})
+        assert options.get("hedge") is expected
@@ -0,0 +1,212 @@
+"""Tests for the local mock LLM server (Anthropic / OpenAI wire formats)."""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+import yaml
+
+httpx = pytest.importorskip("httpx")
+
+from cognitive_scaffolding.core.models import AudienceProfile
+from cognitive_scaffolding.operators.activation import ActivationOperator
+from cognitive_scaffolding.orchestrator.cancellation import CancellationToken
+from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
+from utils.ai_client import AIClient
+from utils.mock_llm_server import MockLLMServer, schema_responder
+
+PROFILES_DIR = Path(__file__).parent.parent.parent / "profiles"
+
+
+@pytest.fixture
+def server():
+    with MockLLMServer(seed=0) as s:
+        yield s
+
+
+def _sse_events(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        data = [line[len("data: "):] for line in block.splitlines() if line.startswith("data: ")]
+        if data:
+            events.append(data[0])
+    return events
+
+
+ANTHROPIC_BODY = {
+    "model": "claude-sonnet-4-5",
+    "max_tokens": 100,
+    "system": [{"type": "text", "text": "Shared prefix " * 20, "cache_control": {"type": "ephemeral"}}],
+    "messages": [{"role": "user", "content": 'Return JSON with keys:\n- "hook": a hook\n- "summary": text'}],
+}
+
+
+class TestSchemaResponder:
+    def test_fills_listed_keys(self):
+        data = json.loads(schema_responder('- "hook": x\n- "why": y', None, "m"))
+        assert set(data) == {"hook", "why"}
+
+    def test_values_follow_described_types(self):
+        prompt = '- "terms": Important terms (dict)\n- "steps": List of steps\n- "skip": Boolean - skip?\n'
+        assert json.loads(schema_responder(prompt, None, "m")) == {
+            "terms": {"terms": "Mock terms."}, "steps": ["Mock steps."], "skip": False,
+        }
+
+    def test_fused_prompt_nests_per_layer(self):
+        prompt = '## Layer "activation"\n- "hook": x\n\n## Layer "metaphor"\n- "mapping": y\n'
+        data = json.loads(schema_responder(prompt, None, "m"))
+        assert set(data) == {"activation", "metaphor"}
+        assert set(data["metaphor"]) == {"mapping"}
+
+
+class TestAnthropicFormat:
+    def test_message_and_prompt_cache_usage(self, server):
+        with httpx.Client(base_url=server.base_url) as http:
+            first = http.post("/v1/messages", json=ANTHROPIC_BODY).json()
+            second = http.post("/v1/messages", json=ANTHROPIC_BODY).json()
+
+        assert first["type"] == "message" and first["content"][0]["type"] == "text"
+        assert set(json.loads(first["content"][0]["text"])) == {"hook", "summary"}
+        assert first["usage"]["cache_creation_input_tokens"] > 0
+        assert second["usage"]["cache_read_input_tokens"] == first["usage"]["cache_creation_input_tokens"]
+        # Keep-alive: both requests used one connection
+        assert server.get_stats()["connections"] == 1
+
+    def test_streaming_events(self, server):
+        with httpx.Client(base_url=server.base_url) as http:
+            response = http.post("/v1/messages", json={**ANTHROPIC_BODY, "stream": True})
+        events = [json.loads(e) for e in _sse_events(response.text)]
+        types = [e["type"] for e in events]
+        assert types[:2] == ["message_start", "content_block_start"]
+        assert types[-3:] == ["content_block_stop", "message_delta", "message_stop"]
+        text = "".join(e["delta"]["text"] for e in events if e["type"] == "content_block_delta")
+        assert set(json.loads(text)) == {"hook", "summary"}
+
+
+class TestOpenAIFormat:
+    BODY = {
+        "model": "gpt-4o",
+        "messages": [{"role": "system", "content": "prefix"}, {"role": "user", "content": "Say hi"}],
+    }
+
+    def test_chat_completion(self, server):
+        data = httpx.post(f"{server.base_url}/v1/chat/completions", json=self.BODY).json()
+        assert data["object"] == "chat.completion"
+        assert data["choices"][0]["message"]["content"]
+        assert data["usage"]["total_tokens"] == data["usage"]["prompt_tokens"] + data["usage"]["completion_tokens"]
+
+    def test_streaming_with_usage_chunk(self, server):
+        body = {**self.BODY, "stream": True, "stream_options": {"include_usage": True}}
+        response = httpx.post(f"{server.base_url}/v1/chat/completions", json=body)
+        events = _sse_events(response.text)
+        assert events[-1] == "[DONE]"
+        chunks = [json.loads(e) for e in events[:-1]]
+        assert chunks[-1]["usage"]["completion_tokens"] > 0
+        text = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks if c["choices"])
+        assert "Mock response" in text
+
+
+class TestLoadControls:
+    def test_injected_429_has_retry_after(self):
+        with MockLLMServer(rate_429=1.0) as server:
+            response = httpx.post(f"{server.base_url}/v1/messages", json=ANTHROPIC_BODY)
+            assert response.status_code == 429
+            assert response.json()["error"]["type"] == "rate_limit_error"
+            assert float(response.headers["retry-after"]) > 0
+            assert server.get_stats()["rejected_429"] == 1
+
+    def test_rpm_cap(self):
+        with MockLLMServer(rpm=2) as server:
+            codes = [httpx.post(f"{server.base_url}/v1/messages", json=ANTHROPIC_BODY).status_code for _ in range(3)]
+        assert codes == [200, 200, 429]
+
+    def test_concurrency_cap_and_peak(self):
+        with MockLLMServer(latency_ms=150, max_concurrency=2) as server:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                codes = list(pool.map(
+                    lambda _: httpx.post(f"{server.base_url}/v1/messages", json=ANTHROPIC_BODY).status_code,
+                    range(4),
+                ))
+            stats = server.get_stats()
+        assert codes.count(429) >= 1
+        assert stats["peak_in_flight"] <= 2
+
+    def test_stats_endpoint_and_unknown_path(self, server):
+        with httpx.Client(base_url=server.base_url) as http:
+            assert http.post("/v1/embeddings", json={}).status_code == 404
+            assert http.get("/stats").json()["requests"] == 0
+
+
+class TestEndToEnd:
+    """The real provider SDKs, through AIClient, against the mock server."""
+
+    @pytest.mark.parametrize("provider,sdk,path", [("anthropic", "anthropic", ""), ("openai", "openai", "/v1")])
+    def test_ai_client_generate(self, server, provider, sdk, path):
+        pytest.importorskip(sdk)
+        client = AIClient(provider=provider, model="mock-model", api_key="test-key", base_url=server.base_url + path)
+        text = client.generate('Return JSON:\n- "hook": a hook', system="Shared prefix " * 20)
+
+        assert json.loads(text) == {"hook": "Mock hook."}
+        assert client.last_usage["output_tokens"] > 0
+        assert server.get_stats()[provider] == 1
+
+    def test_streamed_compile(self, server, tmp_path):
+        pytest.importorskip("anthropic")
+        profile = yaml.safe_load((PROFILES_DIR / "chatbot_tutor.yaml").read_text())
+        profile["settings"]["stream_responses"] = True
+        (tmp_path / "streamed.yaml").write_text(yaml.dump(profile))
+        client = AIClient(provider="anthropic", model="mock-model", api_key="test-key", base_url=server.base_url)
+        conductor = CognitiveConductor(ai_client=client, profiles_dir=str(tmp_path))
+
+        record = conductor.compile("neural networks", "general", profile_name="streamed")
+
+        layers = record.artifact.populated_layers()
+        enabled = [name for name, layer in profile["layers"].items() if layer["enabled"]]
+        assert sorted(layers) == sorted(enabled)
+        assert all(output.provenance["ai_available"] for output in layers.values())
+        assert server.get_stats()["streamed"] == len(enabled)
+        assert conductor.usage_ledger.totals()["output_tokens"] > 0
+
+    def test_timed_out_layer_is_not_retried_or_counted(self):
+        pytest.importorskip("anthropic")
+        audience = AudienceProfile(audience_id="general", name="General")
+        with MockLLMServer(seed=0, latency_ms=800) as slow:
+            client = AIClient(provider="anthropic", model="mock-model", api_key="test-key", base_url=slow.base_url)
+            operator = ActivationOperator(ai_client=client)
+            for _ in range(2):
+                start = time.monotonic()
+                output = operator.execute("neural networks", audience, {}, {"timeout_ms": 300})
+                assert not output.provenance["ai_available"]
+                assert time.monotonic() - start < 0.7
+            time.sleep(1.2)  # long enough for an abandoned call to have retried
+
+            assert slow.get_stats()["anthropic"] == 2
+            assert client.circuit_breaker.state == "closed"
+            assert client.circuit_breaker.snapshot()["consecutive_failures"] == 0
+
+    def test_cancelled_layer_closes_its_stream(self):
+        pytest.importorskip("anthropic")
+        audience = AudienceProfile(audience_id="general", name="General")
+        long_answer = json.dumps({"hook": "word " * 200})  # a few seconds at 100 tokens/s
+        with MockLLMServer(seed=0, tokens_per_second=100, responder=lambda *_: long_answer) as slow:
+            client = AIClient(provider="anthropic", model="mock-model", api_key="test-key", base_url=slow.base_url)
+            parent = CancellationToken()
+            outputs = []
+            worker = threading.Thread(target=lambda: outputs.append(ActivationOperator(ai_client=client).execute(
+                "neural networks", audience, {}, {"cancel_token": parent},
+            )))
+            worker.start()
+            time.sleep(0.2)
+            parent.cancel("client disconnected")
+            worker.join(5)
+            deadline = time.monotonic() + 1
+            while slow.get_stats()["in_flight"] and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            assert not outputs[0].provenance["ai_available"]
+            assert slow.get_stats()["in_flight"] == 0
+            assert slow.get_stats()["anthropic"] == 1
+            assert client.circuit_breaker.state == "closed"
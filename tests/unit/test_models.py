@@ -1,16 +1,39 @@
 """Unit tests for core models."""
 
+import copy
+from datetime import datetime, timezone
+
 import pytest
+from cognitive_scaffolding.core import deltas, serialization
 from cognitive_scaffolding.core.models import (
     ArtifactRecord,
     AudienceControlVector,
     AudienceProfile,
     CognitiveArtifact,
+    EvaluationResult,
     LayerName,
     LayerOutput,
 )
 
 
+def _compiled_record() -> ArtifactRecord:
+    concept = {"concept_id": "nn", "related": ["backprop", "gradient descent"]}
+    audience = AudienceProfile(audience_id="child", name="Child", control_vector=AudienceControlVector(rigor=0.1))
+    artifact = CognitiveArtifact(topic="neural networks", audience=audience)
+    for layer in (LayerName.ACTIVATION, LayerName.STRUCTURE):
+        artifact.set_layer(layer, LayerOutput(
+            layer=layer,
+            content={"text": f"{layer.value} text", "items": [1, 2.5, None, True]},
+            confidence=0.8,
+            provenance={"operator": "X", "config": {"max_tokens": 500, "concept": concept}},
+        ))
+    artifact.evaluation = EvaluationResult(overall_score=0.7, layer_scores={"activation": 0.8})
+    artifact.metadata["provenance"] = {"run_id": "abc", "failed": []}
+    record = ArtifactRecord(artifact=artifact, profile_name="chatbot_tutor")
+    record.add_revision(["activation", "structure"], reason="Initial compilation", score_after=0.7)
+    return record
+
+
 class TestAudienceControlVector:
     def test_defaults(self):
         v = AudienceControlVector()
@@ -93,3 +116,82 @@ class TestArtifactRecord:
         assert record.current_revision == 1
         assert len(record.revision_history) == 1
         assert record.revision_history[0].score_after == 0.7
+
+
+class TestDeltas:
+    def test_diff_apply_roundtrip(self):
+        old = {"a": 1, "b": {"x": 1, "y": [1, 2]}, "c": "gone"}
+        new = {"a": 1, "b": {"x": 2, "y": [1, 2]}, "d": "added"}
+        delta = deltas.diff(new, old)
+        assert delta == {"set": {"c": "gone"}, "unset": ["d"], "patch": {"b": {"set": {"x": 1}}}}
+        assert deltas.apply(copy.deepcopy(new), delta) == old
+        assert deltas.diff(old, old) == {}
+
+    def test_compose_matches_sequential_apply(self):
+        v1 = {"a": 1, "b": {"x": 1}, "c": 3}
+        v2 = {"a": 2, "b": {"x": 2, "z": 0}}
+        v3 = {"a": 2, "b": {"x": 3}, "c": 4, "e": 5}
+        first, second = deltas.diff(v3, v2), deltas.diff(v2, v1)
+        assert deltas.apply(copy.deepcopy(v3), deltas.compose(first, second)) == v1
+
+
+class TestBinaryEncoding:
+    @pytest.mark.parametrize("fmt", ["msgpack", "marshal"])
+    def test_record_roundtrip(self, fmt):
+        if fmt == "msgpack":
+            pytest.importorskip("msgpack")
+        record = _compiled_record()
+        loaded = ArtifactRecord.from_bytes(record.to_bytes(fmt))
+        assert loaded == record
+        assert loaded.model_dump_json() == record.model_dump_json()
+        assert isinstance(loaded.artifact.activation, LayerOutput)
+        assert loaded.artifact.activation.layer is LayerName.ACTIVATION
+
+    def test_artifact_roundtrip(self):
+        artifact = _compiled_record().artifact
+        assert CognitiveArtifact.from_bytes(artifact.to_bytes()) == artifact
+
+    def test_roundtrip_covers_every_field(self):
+        record = _compiled_record()
+        artifact = record.artifact
+        for layer in LayerName:
+            if artifact.get_layer(layer) is None:
+                artifact.set_layer(layer, LayerOutput(layer=layer, content={"text": layer.value}))
+        artifact.audience.description = "Curious ten-year-olds"
+        artifact.evaluation.penalty_reason = "missing layers"
+        before = artifact.model_dump(mode="json")
+        artifact.activation.content["text"] = "revised"
+        record.add_revision(["activation"], score_before=0.7, score_after=0.8, before=before)
+        loaded = ArtifactRecord.from_bytes(record.to_bytes())
+        assert loaded.model_dump() == record.model_dump()
+        for original, decoded in ((record, loaded), (artifact, loaded.artifact),
+                                  (record.revision_history[-1], loaded.revision_history[-1])):
+            for name in type(original).model_fields:
+                # A field the encoding drops or leaves in its JSON form fails here
+                assert getattr(original, name) is not None, name
+                assert type(getattr(decoded, name)) is type(getattr(original, name)), name
+
+    def test_repeated_config_is_encoded_once(self):
+        record = _compiled_record()
+        blob = record.to_bytes()
+        assert blob.count(b"gradient descent") == 1
+        loaded = ArtifactRecord.from_bytes(blob)
+        activation, structure = loaded.artifact.activation, loaded.artifact.structure
+        assert activation.provenance["config"]["concept"] is structure.provenance["config"]["concept"]
+        assert list(activation.provenance["config"]) == ["max_tokens", "concept"]
+
+    def test_non_native_values_fall_back_to_json_form(self):
+        record = _compiled_record()
+        record.artifact.metadata["compiled_at"] = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        loaded = ArtifactRecord.from_bytes(record.to_bytes("marshal"))
+        assert loaded.artifact.metadata["compiled_at"] == "2026-01-02T00:00:00Z"
+
+    def test_marshal_blobs_load_without_msgpack(self, monkeypatch):
+        blob = _compiled_record().to_bytes("marshal")
+        monkeypatch.setattr(serialization, "MSGPACK_AVAILABLE", False)
+        assert serialization.default_format() == "marshal"
+        assert ArtifactRecord.from_bytes(blob).profile_name == "chatbot_tutor"
+
+    def test_unrecognised_blob_is_rejected(self):
+        with pytest.raises(ValueError):
+            ArtifactRecord.from_bytes(b'{"record_id": "x"}')
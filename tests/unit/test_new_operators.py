@@ -91,7 +91,8 @@ class TestDiagnosticOperator:
     def test_builds_prompt(self, child_audience):
         op = DiagnosticOperator()
         prompt = op.build_prompt(TOPIC, child_audience, {}, {"concept": CONCEPT})
-        assert "neural networks" in prompt
+        assert "neural networks" not in prompt
+        assert "neural networks" in op.build_system_prompt(TOPIC, child_audience, {"concept": CONCEPT})
         assert "diagnostic" in prompt.lower() or "pre-assessment" in prompt.lower()
 
     def test_beginner_has_gaps(self, child_audience, config_with_concept):
@@ -141,7 +142,8 @@ class TestContextualizationOperator:
     def test_builds_prompt(self, child_audience):
         op = ContextualizationOperator()
         prompt = op.build_prompt(TOPIC, child_audience, {}, {"concept": CONCEPT})
-        assert "neural networks" in prompt
+        assert "neural networks" not in prompt
+        assert "neural networks" in op.build_system_prompt(TOPIC, child_audience, {"concept": CONCEPT})
         assert "big-picture" in prompt.lower() or "contextualization" in prompt.lower()
 
     def test_with_concept_uses_category(self, child_audience, config_with_concept):
@@ -186,7 +188,8 @@ class TestNarrativeOperator:
     def test_builds_prompt(self, child_audience):
         op = NarrativeOperator()
         prompt = op.build_prompt(TOPIC, child_audience, {}, {"concept": CONCEPT})
-        assert "neural networks" in prompt
+        assert "neural networks" not in prompt
+        assert "neural networks" in op.build_system_prompt(TOPIC, child_audience, {"concept": CONCEPT})
         assert "narrative" in prompt.lower() or "story" in prompt.lower()
 
     def test_child_audience_gets_friendly_story(self, child_audience, config_with_concept):
@@ -237,7 +240,8 @@ class TestChallengeOperator:
     def test_builds_prompt(self, child_audience):
         op = ChallengeOperator()
         prompt = op.build_prompt(TOPIC, child_audience, {}, {"concept": CONCEPT})
-        assert "neural networks" in prompt
+        assert "neural networks" not in prompt
+        assert "neural networks" in op.build_system_prompt(TOPIC, child_audience, {"concept": CONCEPT})
         assert "Bloom" in prompt or "bloom" in prompt
 
     def test_beginner_gets_low_bloom(self, child_audience, config_with_concept):
@@ -307,7 +311,8 @@ class TestElaborationOperator:
     def test_builds_prompt(self, child_audience):
         op = ElaborationOperator()
         prompt = op.build_prompt(TOPIC, child_audience, {}, {"concept": CONCEPT})
-        assert "neural networks" in prompt
+        assert "neural networks" not in prompt
+        assert "neural networks" in op.build_system_prompt(TOPIC, child_audience, {"concept": CONCEPT})
         assert "elaboration" in prompt.lower() or "deep" in prompt.lower()
 
     def test_with_concept_selects_first_component(self, child_audience, config_with_concept):
@@ -0,0 +1,94 @@
+"""Unit tests for provenance token/cost accounting."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
+from cognitive_scaffolding.orchestrator.pricing import estimate_cost, price_for
+from cognitive_scaffolding.orchestrator.provenance import ProvenanceTracker, UsageLedger
+
+
+PROFILES_DIR = str(Path(__file__).parent.parent.parent / "profiles")
+
+USAGE = {
+    "model": "claude-sonnet-4-5-20250929",
+    "retries": 1,
+    "input_tokens": 1000,
+    "output_tokens": 500,
+    "cache_creation_input_tokens": 0,
+    "cache_read_input_tokens": 2000,
+}
+
+
+class TestPricing:
+    def test_longest_prefix_wins(self):
+        assert price_for("gpt-4o-mini-2024-07-18").input == 0.15
+        assert price_for("gpt-4o-2024-08-06").input == 2.50
+        assert price_for("claude-opus-4-5-20251101").input == 5.00
+        assert price_for("claude-opus-4-1-20250805").input == 15.00
+        assert price_for("unknown-model") is None
+
+    def test_estimate_cost(self):
+        # 1000*3 + 500*15 + 2000*0.30 per million
+        assert estimate_cost(USAGE) == pytest.approx(0.0111)
+        assert estimate_cost({**USAGE, "model": "mystery"}) is None
+        assert estimate_cost({**USAGE, "batched": True}) == pytest.approx(0.00555)
+
+
+class TestProvenanceTracker:
+    def test_record_usage_fields(self):
+        tracker = ProvenanceTracker(run_id="r1", profile_name="chatbot_tutor")
+        tracker.record("activation", "A", 100.0, ai_available=True, usage=USAGE)
+        tracker.record("metaphor", "M", 50.0)
+        entry = tracker.entries[0]
+        assert entry.model == USAGE["model"]
+        assert entry.cache_read_input_tokens == 2000
+        assert entry.retries == 1
+        assert entry.cost_usd == pytest.approx(0.0111)
+        assert tracker.entries[1].cost_usd is None
+
+        summary = tracker.summary()
+        assert summary["tokens"]["output_tokens"] == 500
+        assert summary["cost_usd"] == pytest.approx(0.0111)
+        assert summary["models"] == [USAGE["model"]]
+        assert tracker.by_layer()["metaphor"]["calls"] == 1
+
+    def test_ledger_views(self):
+        ledger = UsageLedger(max_runs=2)
+        for i, profile in enumerate(["chatbot_tutor", "chatbot_tutor", "rag_explainer"]):
+            tracker = ProvenanceTracker(run_id=f"r{i}", profile_name=profile)
+            tracker.record("activation", "A", 10.0, usage=USAGE)
+            tracker.record("structure", "S", 20.0, usage={**USAGE, "output_tokens": 100})
+            ledger.add(tracker)
+
+        assert list(ledger.by_run()) == ["r1", "r2"]
+        assert ledger.by_profile()["chatbot_tutor"]["calls"] == 4
+        assert ledger.by_layer("chatbot_tutor")["activation"]["output_tokens"] == 1000
+        assert ledger.by_layer()["structure"]["output_tokens"] == 300
+        assert ledger.totals()["calls"] == 6
+
+
+class _MeteredAIClient:
+    def __init__(self):
+        self.last_usage = None
+
+    def is_available(self):
+        return True
+
+    def generate(self, prompt, **kwargs):
+        self.last_usage = dict(USAGE)
+        return json.dumps({"text": "ok"})
+
+
+class TestConductorAccounting:
+    def test_usage_recorded_per_layer(self):
+        conductor = CognitiveConductor(ai_client=_MeteredAIClient(), profiles_dir=PROFILES_DIR)
+        record = conductor.compile("neural networks", "general")
+        summary = record.artifact.metadata["provenance"]
+        layers = len(record.artifact.populated_layers())
+        assert summary["tokens"]["input_tokens"] == 1000 * layers
+        assert summary["cost_usd"] == pytest.approx(0.0111 * layers)
+        assert conductor.usage_ledger.by_profile()["chatbot_tutor"]["calls"] == layers
+        assert set(conductor.usage_ledger.by_layer()) == set(record.artifact.populated_layers())
@@ -0,0 +1,146 @@
+"""Unit tests for rate limiting, backoff, and circuit breaking."""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.rate_limit import (
+    CircuitBreaker,
+    RateLimiter,
+    TokenBucket,
+    backoff_delay,
+    is_retryable,
+    retry_after_of,
+)
+
+
+class _Err(Exception):
+    def __init__(self, status_code=None, headers=None):
+        super().__init__("err")
+        if status_code is not None:
+            self.status_code = status_code
+        if headers is not None:
+            self.response = type("R", (), {"headers": headers})()
+
+
+class APITimeoutError(Exception):
+    pass
+
+
+class TestRetryClassification:
+    def test_status_codes(self):
+        assert is_retryable(_Err(429))
+        assert is_retryable(_Err(503))
+        assert not is_retryable(_Err(400))
+        assert not is_retryable(_Err(401))
+
+    def test_exception_names(self):
+        assert is_retryable(APITimeoutError())
+        assert not is_retryable(ValueError())
+
+    def test_retry_after(self):
+        assert retry_after_of(_Err(429, {"retry-after": "2"})) == 2.0
+        assert retry_after_of(_Err(429)) is None
+
+
+class TestBackoff:
+    def test_full_jitter_bounds(self):
+        rng = random.Random(1)
+        for attempt in range(8):
+            delay = backoff_delay(attempt, base=0.5, cap=4.0, rng=rng)
+            assert 0.0 <= delay <= min(4.0, 0.5 * 2 ** attempt)
+
+
+class TestTokenBucket:
+    def test_capacity_then_wait(self):
+        bucket = TokenBucket(capacity=2, rate=1.0)
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() > 0.0
+
+    def test_acquire_timeout(self):
+        bucket = TokenBucket(capacity=1, rate=0.01)
+        assert bucket.acquire(1)
+        assert not bucket.acquire(1, timeout=0.01)
+
+
+class TestRateLimiter:
+    def test_aimd(self):
+        limiter = RateLimiter(rpm=600, tpm=60000)
+        limiter.on_throttled()
+        limiter.on_throttled()
+        assert limiter.scale == 0.25
+        assert limiter._requests.rate == 600 / 60 * 0.25
+        for _ in range(30):
+            limiter.on_success()
+        assert limiter.scale == 1.0
+
+    def test_min_scale(self):
+        limiter = RateLimiter(rpm=60, min_scale=0.2)
+        for _ in range(10):
+            limiter.on_throttled()
+        assert limiter.scale == 0.2
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.delenv("AI_RPM", raising=False)
+        monkeypatch.delenv("AI_TPM", raising=False)
+        assert RateLimiter.from_env() is None
+        monkeypatch.setenv("AI_RPM", "50")
+        assert RateLimiter.from_env().rpm == 50.0
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+    def test_half_open_then_close(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_admits_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert not breaker.is_open()
+        assert breaker.allow_request()
+        assert breaker.is_open()
+        assert not breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        breaker.record_success()
+        assert breaker.allow_request()
+        assert breaker.allow_request()
+
+    def test_concurrent_half_open_callers(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            admitted = list(pool.map(lambda _: breaker.allow_request(), range(32)))
+        assert admitted.count(True) == 1
+
+    def test_lost_probe_is_replaced(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.02)
+        breaker.record_failure()
+        time.sleep(0.03)
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        time.sleep(0.03)
+        assert breaker.allow_request()
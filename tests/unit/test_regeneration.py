@@ -2,6 +2,8 @@
 
 from pathlib import Path
 
+import pytest
+
 from cognitive_scaffolding.core.models import (
     ArtifactRecord,
     LayerName,
@@ -97,3 +99,70 @@ class TestRegenerateWeakLayers:
         result = regenerate_weak_layers(record, configs, conductor, threshold=1.0)
         last_rev = result.revision_history[-1]
         assert "activation" not in last_rev.changed_layers
+
+
+class TestRevisionDeltas:
+    def _weak_record(self, conductor):
+        record = _compile_record(conductor)
+        configs = _all_enabled_configs()
+        record.artifact.activation.confidence = 0.1
+        record.artifact.evaluation = score_artifact(record.artifact, configs)
+        return record, configs
+
+    def test_delta_holds_only_changed_layers(self):
+        conductor = _make_conductor()
+        record, configs = self._weak_record(conductor)
+        regenerate_weak_layers(record, configs, conductor, threshold=0.5)
+
+        delta = record.revision_history[-1].delta
+        changed = set(record.revision_history[-1].changed_layers)
+        layer_names = {layer.value for layer in LayerName}
+        assert set(delta["patch"]) & layer_names <= changed
+        assert record.revision_history[0].delta is None
+
+    def test_reconstruct_previous_revisions(self):
+        conductor = _make_conductor()
+        record, configs = self._weak_record(conductor)
+        snapshots = {record.current_revision: record.artifact.model_dump(mode="json")}
+        for _ in range(3):
+            record.artifact.activation.confidence = 0.1
+            record.artifact.evaluation = score_artifact(record.artifact, configs)
+            snapshots[record.current_revision] = record.artifact.model_dump(mode="json")
+            regenerate_weak_layers(record, configs, conductor, threshold=0.5)
+
+        assert record.current_revision == 4
+        for revision_id, snapshot in snapshots.items():
+            assert record.reconstruct(revision_id).model_dump(mode="json") == snapshot
+        with pytest.raises(ValueError):
+            record.reconstruct(0)
+
+    def test_compaction_keeps_recent_and_original(self):
+        conductor = _make_conductor()
+        record, configs = self._weak_record(conductor)
+        original = record.artifact.model_dump(mode="json")
+        third = None
+        for _ in range(4):
+            record.artifact.activation.confidence = 0.1
+            record.artifact.evaluation = score_artifact(record.artifact, configs)
+            if record.current_revision == 3:
+                third = record.artifact.model_dump(mode="json")
+            regenerate_weak_layers(record, configs, conductor, threshold=0.5, keep_revisions=2)
+
+        # Revision 1 is the initial compile; 2-5 are regenerations
+        assert record.current_revision == 5
+        assert [r.delta is not None for r in record.revision_history] == [False, False, True, True, True]
+        assert record.revision_history[1].delta_base is None
+        assert record.revision_history[2].delta_base == 1
+        assert record.reconstruct(1).model_dump(mode="json") == original
+        assert record.reconstruct(3).model_dump(mode="json") == third
+        with pytest.raises(ValueError):
+            record.reconstruct(2)
+
+    def test_history_survives_json_roundtrip(self):
+        conductor = _make_conductor()
+        record, configs = self._weak_record(conductor)
+        before = record.artifact.model_dump(mode="json")
+        regenerate_weak_layers(record, configs, conductor, threshold=0.5)
+
+        loaded = ArtifactRecord.model_validate_json(record.model_dump_json())
+        assert loaded.reconstruct(1).model_dump(mode="json") == before
@@ -0,0 +1,134 @@
+"""Unit tests for record/replay AI clients."""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
+from utils.ai_client import FALLBACK_PREFIX
+from utils.replay_client import (
+    LognormalLatency,
+    RecordingAIClient,
+    ReplayAIClient,
+    load_cassette,
+    prompt_key,
+)
+
+
+PROFILES_DIR = str(Path(__file__).parent.parent.parent / "profiles")
+
+
+class _LiveClient:
+    """Deterministic stand-in for a live AIClient."""
+
+    def __init__(self):
+        self.last_usage = None
+
+    def is_available(self):
+        return True
+
+    def generate(self, prompt, system=None, layer=None, **kwargs):
+        self.last_usage = {"model": "live", "input_tokens": len(prompt) // 4, "output_tokens": 10}
+        return json.dumps({"layer": layer, "answer": f"response for {len(prompt)} chars"})
+
+    def get_status(self):
+        return {"provider": "live"}
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    path = tmp_path / "cassettes" / "run.jsonl"
+    recorder = RecordingAIClient(_LiveClient(), path)
+    recorder.generate("prompt one", system="brief", layer="activation")
+    recorder.generate("prompt two", system="brief", layer="structure")
+    return path
+
+
+class TestRecording:
+    def test_cassette_entries(self, cassette):
+        entries = load_cassette(cassette)
+        entry = entries[prompt_key("prompt one", "brief")]
+        assert entry["layer"] == "activation"
+        assert entry["usage"]["model"] == "live"
+        assert len(entries) == 2
+
+    def test_failures_not_recorded(self, tmp_path):
+        class Down(_LiveClient):
+            def generate(self, prompt, **kwargs):
+                return f"{FALLBACK_PREFIX} down]"
+
+        path = tmp_path / "c.jsonl"
+        RecordingAIClient(Down(), path).generate("p")
+        assert load_cassette(path) == {}
+
+
+class TestReplay:
+    def test_hit_and_miss(self, cassette):
+        client = ReplayAIClient(cassette)
+        assert json.loads(client.generate("prompt one", system="brief"))["layer"] == "activation"
+        assert client.last_usage["output_tokens"] == 10
+        assert client.generate("prompt one").startswith(FALLBACK_PREFIX)  # different system prefix
+        assert client.last_usage is None
+        assert client.get_status()["hits"] == 1
+        assert client.get_status()["misses"] == 1
+
+    def test_miss_can_raise(self, cassette):
+        with pytest.raises(KeyError):
+            ReplayAIClient(cassette, on_miss="raise").generate("unknown")
+
+    def test_per_layer_latency(self, cassette):
+        client = ReplayAIClient(cassette, latency={
+            "structure": LognormalLatency(median_ms=60, sigma=0.0),
+            "default": LognormalLatency(median_ms=1, sigma=0.0),
+        })
+        start = time.monotonic()
+        client.generate("prompt two", system="brief", layer="structure")
+        assert time.monotonic() - start >= 0.055
+        start = time.monotonic()
+        client.generate("prompt one", system="brief", layer="activation")
+        assert time.monotonic() - start < 0.05
+
+    def test_time_scale_and_timeout(self, cassette):
+        slow = LognormalLatency(median_ms=10_000, sigma=0.0)
+        client = ReplayAIClient(cassette, latency=slow, time_scale=0.001)
+        assert not client.generate("prompt one", system="brief").startswith(FALLBACK_PREFIX)
+        client = ReplayAIClient(cassette, latency=slow)
+        assert "timed out" in client.generate("prompt one", system="brief", timeout=0.01)
+
+    def test_error_injection_is_seeded(self, cassette):
+        def outcomes(seed):
+            client = ReplayAIClient(cassette, error_rate={"activation": 0.5}, seed=seed)
+            return [
+                client.generate("prompt one", system="brief", layer="activation").startswith(FALLBACK_PREFIX)
+                for _ in range(40)
+            ]
+
+        first = outcomes(7)
+        assert first == outcomes(7)
+        assert 5 < sum(first) < 35
+        client = ReplayAIClient(cassette, error_rate={"activation": 1.0})
+        assert not client.generate("prompt two", system="brief", layer="structure").startswith(FALLBACK_PREFIX)
+
+    def test_stream_chunks(self, cassette):
+        client = ReplayAIClient(cassette, stream_chunk_chars=8)
+        chunks = list(client.stream("prompt one", system="brief"))
+        assert len(chunks) > 1
+        assert "".join(chunks) == client.generate("prompt one", system="brief")
+
+
+class TestConductorReplay:
+    def test_recorded_compile_replays_identically(self, tmp_path):
+        path = tmp_path / "compile.jsonl"
+        recorded = CognitiveConductor(ai_client=RecordingAIClient(_LiveClient(), path), profiles_dir=PROFILES_DIR)
+        original = recorded.compile("neural networks", "general")
+
+        replay = ReplayAIClient(path, latency=LognormalLatency(median_ms=2, sigma=0.3), seed=1)
+        replayed = CognitiveConductor(ai_client=replay, profiles_dir=PROFILES_DIR).compile("neural networks", "general")
+
+        status = replay.get_status()
+        assert status["misses"] == 0
+        assert status["hits"] == len(original.artifact.populated_layers())
+        for layer, output in original.artifact.populated_layers().items():
+            assert replayed.artifact.populated_layers()[layer].content == output.content
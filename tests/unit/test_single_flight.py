@@ -0,0 +1,168 @@
+"""Unit tests for single-flight request coalescing."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from cognitive_scaffolding.orchestrator.cancellation import CancellationToken, CompileCancelled
+from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
+from cognitive_scaffolding.orchestrator.single_flight import SingleFlight
+
+
+PROFILES_DIR = str(Path(__file__).parent.parent.parent / "profiles")
+
+
+class _SlowClient:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def last_usage(self):
+        return {"model": "fake", "input_tokens": 10, "output_tokens": 5}
+
+    def is_available(self):
+        return True
+
+    def generate(self, prompt, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return '{"text": "ai output"}'
+
+
+def _run_concurrently(fn, n):
+    barrier = threading.Barrier(n)
+
+    def call(i):
+        barrier.wait()
+        return fn(i)
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        return list(pool.map(call, range(n)))
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        runs = []
+
+        def work():
+            runs.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        results = _run_concurrently(lambda i: flight.do("k", work), 5)
+        assert len(runs) == 1
+        assert [value for value, _ in results] == ["value"] * 5
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert flight.stats == {"executions": 1, "coalesced": 4}
+        assert flight.in_flight() == 0
+
+    def test_exception_reaches_every_caller(self):
+        flight = SingleFlight()
+
+        def boom():
+            time.sleep(0.05)
+            raise ValueError("boom")
+
+        def call(i):
+            with pytest.raises(ValueError, match="boom"):
+                flight.do("k", boom)
+
+        _run_concurrently(call, 3)
+        assert flight.in_flight() == 0
+
+    def test_follower_honours_its_own_token(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        leader = threading.Thread(target=flight.do, args=("k", release.wait, 5))
+        leader.start()
+        while not flight.in_flight():
+            time.sleep(0.001)
+
+        start = time.monotonic()
+        with pytest.raises(CompileCancelled, match="timed out"):
+            flight.do("k", lambda: "unused", cancel_token=CancellationToken(timeout_ms=50))
+        assert time.monotonic() - start < 1.0
+
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel, args=("client disconnected",)).start()
+        with pytest.raises(CompileCancelled, match="client disconnected"):
+            flight.do("k", lambda: "unused", cancel_token=token)
+
+        release.set()
+        leader.join()
+        assert flight.in_flight() == 0
+
+    def test_sequential_calls_are_not_cached(self):
+        flight = SingleFlight()
+        assert flight.do("k", lambda: 1) == (1, False)
+        assert flight.do("k", lambda: 2) == (2, False)
+
+
+class TestCoalescedCompile:
+    def test_identical_compiles_run_once(self):
+        solo_client = _SlowClient(delay=0)
+        CognitiveConductor(ai_client=solo_client, profiles_dir=PROFILES_DIR).compile("neural networks", "general")
+
+        client = _SlowClient()
+        conductor = CognitiveConductor(ai_client=client, profiles_dir=PROFILES_DIR)
+        records = _run_concurrently(lambda i: conductor.compile("neural networks", "general"), 4)
+
+        assert client.calls == solo_client.calls
+        assert len({id(r) for r in records}) == 4
+        assert conductor.compile_flight.stats == {"executions": 1, "coalesced": 3}
+        assert len(conductor.usage_ledger.by_run()) == 1
+
+    def test_cancelled_leader_hands_over_to_one_follower(self):
+        client = _SlowClient(delay=0.05)
+        conductor = CognitiveConductor(ai_client=client, profiles_dir=PROFILES_DIR)
+        token = CancellationToken()
+        leader_errors = []
+
+        def lead():
+            try:
+                conductor.compile("neural networks", "general", cancel_token=token)
+            except CompileCancelled as e:
+                leader_errors.append(e)
+
+        leader = threading.Thread(target=lead)
+        leader.start()
+        while not conductor.compile_flight.in_flight():
+            time.sleep(0.001)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(conductor.compile, "neural networks", "general") for _ in range(3)]
+            time.sleep(0.05)
+            token.cancel("client disconnected")
+            records = [f.result() for f in futures]
+        leader.join()
+
+        assert leader_errors and all(r.artifact.populated_layers() for r in records)
+        assert conductor.compile_flight.stats["executions"] == 2
+
+    def test_different_requests_share_identical_layers(self):
+        client = _SlowClient(delay=0.1)
+        conductor = CognitiveConductor(ai_client=client, profiles_dir=PROFILES_DIR)
+        # Weight overrides change the compile key but not any layer's prompt
+        records = _run_concurrently(
+            lambda i: conductor.compile("neural networks", "general", overrides={"synthesis": {"weight": 1.0 + i}}),
+            2,
+        )
+
+        assert conductor.compile_flight.stats["executions"] == 2
+        assert conductor.layer_flight.stats["coalesced"] >= 1
+        outputs = [o for r in records for o in r.artifact.populated_layers().values()]
+        followers = [o for o in outputs if o.provenance.get("coalesced")]
+        assert followers and all("usage" not in o.provenance for o in followers)
+
+    def test_coalesce_off_runs_every_compile(self):
+        client = _SlowClient(delay=0.01)
+        conductor = CognitiveConductor(ai_client=client, profiles_dir=PROFILES_DIR, coalesce=False)
+        _run_concurrently(lambda i: conductor.compile("neural networks", "general"), 2)
+        assert conductor.compile_flight.stats["executions"] == 0
+        assert client.calls % 2 == 0 and client.calls > 0
@@ -0,0 +1,68 @@
+"""Unit tests for the SQLite ETL sink."""
+
+import pytest
+
+from cognitive_scaffolding.adapters.etl_adapter import ETLAdapter
+from cognitive_scaffolding.adapters.sqlite_sink import SQLiteSink
+from cognitive_scaffolding.core.models import (
+    ArtifactRecord,
+    AudienceProfile,
+    CognitiveArtifact,
+    EvaluationResult,
+    LayerName,
+    LayerOutput,
+)
+
+
+def _make_record(i: int) -> ArtifactRecord:
+    artifact = CognitiveArtifact(
+        topic=f"topic {i}",
+        audience=AudienceProfile(audience_id="general", name="General"),
+    )
+    artifact.set_layer(LayerName.METAPHOR, LayerOutput(
+        layer=LayerName.METAPHOR, content={"metaphor": "like a kitchen"}, confidence=0.6,
+    ))
+    artifact.evaluation = EvaluationResult(overall_score=i / 10, missing_required=["structure"])
+    return ArtifactRecord(artifact=artifact, profile_name="etl_explain")
+
+
+class TestSQLiteSink:
+    def test_bulk_write_streams_records(self, tmp_path):
+        records = (_make_record(i) for i in range(7))
+        with SQLiteSink(tmp_path / "etl.db", batch_size=3) as sink:
+            assert sink.write(records) == 7
+            assert sink.count() == 7
+
+    def test_rows_roundtrip_typed(self, tmp_path):
+        record = _make_record(4)
+        with SQLiteSink(tmp_path / "etl.db") as sink:
+            sink.write([record])
+            rows = sink.read_rows("record_id = ?", (record.record_id,))
+
+        assert rows == [ETLAdapter().format(record)]
+
+    def test_wal_mode_enabled(self, tmp_path):
+        with SQLiteSink(tmp_path / "etl.db") as sink:
+            mode = sink.connect().execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+
+    def test_schema_has_fixed_columns(self, tmp_path):
+        with SQLiteSink(tmp_path / "etl.db") as sink:
+            info = sink.connect().execute("PRAGMA table_info(artifacts)").fetchall()
+        types = {row[1]: row[2] for row in info}
+        assert types["cv_language_level"] == "REAL"
+        assert types["layer_structure_populated"] == "INTEGER"
+        assert types["layer_structure_confidence"] == "REAL"
+
+    def test_rewrite_replaces_by_record_id(self, tmp_path):
+        record = _make_record(1)
+        with SQLiteSink(tmp_path / "etl.db") as sink:
+            sink.write([record])
+            record.add_revision(changed_layers=["metaphor"])
+            sink.write([record])
+            assert sink.count() == 1
+            assert sink.read_rows()[0]["revision"] == 1
+
+    def test_invalid_table_name(self, tmp_path):
+        with pytest.raises(ValueError):
+            SQLiteSink(tmp_path / "etl.db", table="artifacts; DROP TABLE x")
@@ -0,0 +1,60 @@
+"""Unit tests for incremental JSON parsing of streamed output."""
+
+import json
+
+from cognitive_scaffolding.operators.streaming import IncrementalJSONParser
+
+
+DOC = {
+    "hook": 'Say "hi" \\ {not a brace}',
+    "count": 12,
+    "items": [1, {"x": "]"}, [2, 3]],
+    "nested": {"a": {"b": None}},
+    "flag": True,
+    "unicode": "café",
+}
+
+
+def _feed_all(text, size):
+    parser = IncrementalJSONParser()
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return parser, events
+
+
+class TestIncrementalJSONParser:
+    def test_any_chunking_yields_all_fields_in_order(self):
+        text = json.dumps(DOC, indent=2)
+        for size in (1, 2, 3, 7, len(text)):
+            parser, events = _feed_all(text, size)
+            assert parser.done and not parser.failed
+            assert events == list(DOC.items())
+            assert parser.fields == DOC
+
+    def test_field_emitted_before_object_closes(self):
+        parser = IncrementalJSONParser()
+        assert parser.feed('{"hook": "first"') == [("hook", "first")]
+        assert parser.feed(', "stakes": "se') == []
+        assert parser.feed('cond"}') == [("stakes", "second")]
+        assert parser.done
+
+    def test_numbers_wait_for_delimiter(self):
+        parser = IncrementalJSONParser()
+        assert parser.feed('{"n": 12') == []
+        assert parser.feed('3}') == [("n", 123)]
+
+    def test_code_fence_tolerated(self):
+        _, events = _feed_all('```json\n{"a": 1}\n```', 4)
+        assert events == [("a", 1)]
+
+    def test_prose_fails_fast(self):
+        parser = IncrementalJSONParser()
+        parser.feed("Sure! Here is")
+        assert parser.failed
+        assert parser.feed(' {"a": 1}') == []
+
+    def test_malformed_value_fails(self):
+        parser = IncrementalJSONParser()
+        parser.feed('{"a": tru, "b": 1}')
+        assert parser.failed
@@ -60,3 +60,63 @@ class TestToggleManager:
         a, b = mgr.create_experiment_variants(base, "activation")
         assert a["activation"].enabled is True
         assert b["activation"].enabled is False
+
+
+@pytest.fixture
+def budget_profiles_dir(tmp_path):
+    profile = {
+        "name": "budget",
+        "layers": {
+            "activation": {"enabled": True, "max_tokens": 300},
+            "structure": {"enabled": True},
+        },
+        "settings": {"max_tokens_per_layer": 900, "batch_mode": True},
+    }
+    with open(tmp_path / "budget.yaml", "w") as f:
+        yaml.dump(profile, f)
+    return tmp_path
+
+
+class TestTokenBudgets:
+    def test_settings_and_per_layer_override(self, budget_profiles_dir):
+        mgr = ToggleManager(str(budget_profiles_dir))
+        configs = mgr.load_profile("budget")
+        assert configs["activation"].max_tokens == 300
+        assert configs["structure"].max_tokens == 900
+        assert mgr.load_settings("budget")["batch_mode"] is True
+
+    def test_no_settings_means_no_budget(self, profiles_dir):
+        mgr = ToggleManager(str(profiles_dir))
+        assert mgr.load_profile("test_profile")["activation"].max_tokens is None
+        assert mgr.load_settings("test_profile") == {}
+
+    def test_budget_survives_overrides_and_variants(self, budget_profiles_dir):
+        mgr = ToggleManager(str(budget_profiles_dir))
+        base = mgr.load_profile("budget")
+        merged = mgr.apply_overrides(base, {"structure": {"max_tokens": 500}})
+        assert merged["structure"].max_tokens == 500
+        assert merged["activation"].max_tokens == 300
+        a, b = mgr.create_experiment_variants(base, "activation")
+        assert a["activation"].max_tokens == b["activation"].max_tokens == 300
+
+    def test_budget_reaches_generate(self, budget_profiles_dir):
+        from cognitive_scaffolding.orchestrator.conductor import CognitiveConductor
+
+        calls = []
+
+        class _Client:
+            last_usage = None
+
+            def is_available(self):
+                return True
+
+            def generate(self, prompt, **kwargs):
+                calls.append(kwargs.get("max_tokens"))
+                return "{}"
+
+        conductor = CognitiveConductor(ai_client=_Client(), profiles_dir=str(budget_profiles_dir))
+        record = conductor.compile("neural networks", "general", profile_name="budget")
+        assert 300 in calls
+        assert set(calls) <= {300, 900}
+        activation = record.artifact.get_layer(LayerName.ACTIVATION)
+        assert activation.provenance["config"]["max_tokens"] == 300
@@ -0,0 +1,115 @@
+"""Unit tests for the local vector index."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from cognitive_scaffolding.adapters.rag_adapter import RAGAdapter
+from cognitive_scaffolding.adapters.vector_index import HashingEmbedder, LocalVectorIndex
+from cognitive_scaffolding.core.models import (
+    ArtifactRecord,
+    AudienceProfile,
+    CognitiveArtifact,
+    LayerName,
+    LayerOutput,
+)
+
+TEXTS = {
+    "gradient": "Gradient descent updates weights by stepping against the loss gradient.",
+    "kitchen": "A kitchen brigade divides cooking work between specialized chefs.",
+    "attention": "Attention mechanisms weigh tokens by their relevance to each query.",
+    "forest": "Random forests average many decision trees trained on bootstrap samples.",
+}
+
+
+def _chunks():
+    return [
+        {"chunk_id": key, "content": text, "metadata": {"topic": key}}
+        for key, text in TEXTS.items()
+    ]
+
+
+class TestHashingEmbedder:
+    def test_deterministic_and_normalized(self):
+        embedder = HashingEmbedder(dim=256)
+        a = embedder.embed("neural networks learn weights")
+        b = embedder.embed("neural networks learn weights")
+        assert np.allclose(a, b)
+        assert np.linalg.norm(a) == pytest.approx(1.0, abs=1e-5)
+
+    def test_empty_text(self):
+        assert not HashingEmbedder(dim=16).embed("").any()
+
+
+class TestBruteForceIndex:
+    def test_search_ranks_relevant_chunk_first(self):
+        index = LocalVectorIndex()
+        index.add(_chunks())
+        index.build()
+        assert not index.is_ivf
+
+        results = index.search("how does gradient descent update the weights", k=2)
+        assert len(results) == 2
+        assert results[0][1]["chunk_id"] == "gradient"
+        assert results[0][0] > results[1][0]
+
+    def test_accepts_iter_chunks(self):
+        artifact = CognitiveArtifact(topic="metaphors", audience=AudienceProfile(audience_id="g", name="G"))
+        artifact.set_layer(LayerName.METAPHOR, LayerOutput(
+            layer=LayerName.METAPHOR, content={"metaphor": TEXTS["kitchen"]}, confidence=0.5,
+        ))
+        record = ArtifactRecord(artifact=artifact)
+
+        index = LocalVectorIndex()
+        assert index.add(RAGAdapter().iter_chunks([record])) == 1
+        (_, doc), = index.search("chefs in a kitchen", k=3)
+        assert doc["metadata"]["layer"] == "metaphor"
+
+
+class TestIVFIndex:
+    def test_ivf_finds_exact_duplicate(self):
+        docs = [{"chunk_id": str(i), "content": f"document number {i} about topic {i % 17}", "metadata": {}}
+                for i in range(300)]
+        docs.append({"chunk_id": "needle", "content": TEXTS["attention"], "metadata": {}})
+        index = LocalVectorIndex(ivf_threshold=100, n_probe=4)
+        index.add(docs)
+        index.build()
+
+        assert index.is_ivf
+        assert len(index.centroids) == int(len(docs) ** 0.5)
+        results = index.search(TEXTS["attention"], k=1)
+        assert results[0][1]["chunk_id"] == "needle"
+
+
+class TestPersistence:
+    def test_save_load_memory_mapped(self, tmp_path):
+        index = LocalVectorIndex()
+        index.add(_chunks())
+        index.save(tmp_path / "idx")
+
+        loaded = LocalVectorIndex.load(tmp_path / "idx")
+        assert isinstance(loaded.vectors, np.memmap)
+        assert len(loaded) == len(TEXTS)
+        query = "random forests and decision trees"
+        assert [d["chunk_id"] for _, d in loaded.search(query)] == [d["chunk_id"] for _, d in index.search(query)]
+
+        with pytest.raises(RuntimeError):
+            loaded.add(_chunks())
+
+    def test_brute_force_save_replaces_ivf_save(self, tmp_path):
+        docs = [{"chunk_id": str(i), "content": f"document number {i} about topic {i % 17}", "metadata": {}}
+                for i in range(300)]
+        ivf = LocalVectorIndex(ivf_threshold=100)
+        ivf.add(docs)
+        ivf.save(tmp_path / "idx")
+        assert (tmp_path / "idx" / "centroids.npy").exists()
+
+        brute = LocalVectorIndex(use_idf=False)
+        brute.add(_chunks())
+        brute.save(tmp_path / "idx")
+
+        loaded = LocalVectorIndex.load(tmp_path / "idx")
+        assert not loaded.is_ivf
+        assert loaded.idf is None
+        assert sorted((tmp_path / "idx").glob("*.npy")) == [tmp_path / "idx" / "vectors.npy"]
+        assert loaded.search(TEXTS["forest"], k=1)[0][1]["chunk_id"] == "forest"
@@ -1,8 +1,23 @@
 """Unified AI client for Anthropic and OpenAI - adapted from metaphor-mcp-server."""
 
+import functools
+import inspect
 import os
 import logging
-from typing import Optional
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+from utils.http_pool import PoolConfig, get_shared_http_client, pool_stats, sdk_httpx_module
+from utils.rate_limit import (
+    CircuitBreaker,
+    RateLimiter,
+    backoff_delay,
+    is_retryable,
+    is_timeout,
+    retry_after_of,
+    status_code_of,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,92 +33,458 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
+# Prefix of the sentinel string generate() returns instead of raising;
+# BaseOperator checks for it and switches to generate_fallback().
+FALLBACK_PREFIX = "[AI unavailable:"
+
+
+@functools.lru_cache(maxsize=64)
+def _accepts_argument(method: Callable, name: str) -> bool:
+    """Whether an SDK method takes ``name`` as a keyword (or any keyword)."""
+    try:
+        parameters = inspect.signature(method).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    return any(p.name == name or p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters)
+
 
 class AIClient:
-    """Unified AI client supporting Anthropic and OpenAI providers."""
+    """Unified AI client supporting Anthropic and OpenAI providers.
+
+    Provider SDK clients share one pooled HTTP transport (see utils.http_pool)
+    per PoolConfig and httpx flavour, so every AIClient in the process -
+    across providers and threads - reuses the same keep-alive connections.
+    Pass ``http_client`` to supply your own client instead; it must come from
+    the SDK's httpx package (``httpx2`` for current SDKs).
+
+    Retries are handled here rather than inside the SDKs: each call waits on
+    the optional RateLimiter (RPM/TPM, AIMD on 429), retryable errors are
+    retried ``pool_config.max_retries`` times with full-jitter backoff, and
+    the CircuitBreaker opens after repeated provider failures. While it is
+    open, is_available() is False so operators use generate_fallback().
+
+    A ``system`` prefix passed to generate() is sent as a cacheable system
+    prompt (Anthropic ``cache_control``; OpenAI caches long prefixes
+    automatically). Token usage of the calling thread's last request,
+    including cached input tokens, is exposed as ``last_usage``.
 
-    def __init__(self, provider: Optional[str] = None, model: Optional[str] = None):
+    ``base_url`` (default: AI_BASE_URL) points the SDK at another server,
+    e.g. utils.mock_llm_server for local load tests.
+
+    A ``cancel_token`` (orchestrator.cancellation.CancellationToken) passed
+    to generate() or stream() bounds the call: each attempt's timeout is
+    capped at the time the token has left, nothing is retried once it is
+    cancelled, and failures the token caused - including timeouts it set -
+    are not counted against the circuit breaker. generate() streams each
+    attempt under a token so the HTTP response is closed at the next event
+    after cancellation instead of running to completion.
+    """
+
+    def __init__(
+        self,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        pool_config: Optional[PoolConfig] = None,
+        http_client=None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ):
         self.provider = (provider or os.getenv("AI_PROVIDER", "anthropic")).lower()
         self.model = model
+        self.api_key = api_key
+        self.base_url = base_url or os.getenv("AI_BASE_URL") or None
+        self.pool_config = pool_config or PoolConfig.from_env()
+        self.http_client = http_client
+        self.rate_limiter = rate_limiter or RateLimiter.from_env()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
         self.client = None
         self._initialized = False
+        self._local = threading.local()
         try:
             self._initialize_client()
         except Exception as e:
             logger.error(f"Failed to initialize AI client: {e}")
 
+    def _sdk_kwargs(self, sdk) -> dict:
+        """Transport, timeout, and retry settings for an SDK package's client constructor.
+
+        The shared client is built from the SDK's own httpx module, since
+        SDKs on httpx2 refuse ``httpx.Client`` instances.
+        """
+        module = sdk_httpx_module(sdk)
+        if self.http_client is None and module is not None:
+            self.http_client = get_shared_http_client(self.pool_config, module)
+        # Retries happen in generate() so they go through the limiter and breaker
+        kwargs = {"max_retries": 0}
+        if self.base_url:
+            kwargs["base_url"] = self.base_url
+        if self.http_client is not None:
+            kwargs["http_client"] = self.http_client
+            kwargs["timeout"] = self.pool_config.timeout(module)
+        return kwargs
+
     def _initialize_client(self) -> None:
         if self.provider == "anthropic":
             if not ANTHROPIC_AVAILABLE:
                 raise ImportError("anthropic not installed")
-            api_key = os.getenv("ANTHROPIC_API_KEY")
+            api_key = self.api_key or os.getenv("ANTHROPIC_API_KEY")
             if not api_key:
                 raise ValueError("ANTHROPIC_API_KEY not set")
-            self.client = anthropic.Anthropic(api_key=api_key)
+            self.client = anthropic.Anthropic(api_key=api_key, **self._sdk_kwargs(anthropic))
             self.model = self.model or os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-5-20250929")
         elif self.provider == "openai":
             if not OPENAI_AVAILABLE:
                 raise ImportError("openai not installed")
-            api_key = os.getenv("OPENAI_API_KEY")
+            api_key = self.api_key or os.getenv("OPENAI_API_KEY")
             if not api_key:
                 raise ValueError("OPENAI_API_KEY not set")
-            self.client = openai.OpenAI(api_key=api_key)
+            self.client = openai.OpenAI(api_key=api_key, **self._sdk_kwargs(openai))
             self.model = self.model or os.getenv("OPENAI_MODEL", "gpt-4")
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
         self._initialized = True
 
+    @property
+    def last_usage(self) -> Optional[dict]:
+        """Token usage of this thread's most recent successful generate() call.
+
+        Keys: model, retries, input_tokens (uncached), output_tokens,
+        cache_creation_input_tokens, cache_read_input_tokens.
+        """
+        return getattr(self._local, "usage", None)
+
+    @property
+    def last_error(self) -> Optional[BaseException]:
+        """Provider exception behind this thread's most recent fallback sentinel, if any."""
+        return getattr(self._local, "error", None)
+
     def is_available(self) -> bool:
-        return self._initialized and self.client is not None
+        return self._initialized and self.client is not None and not self.circuit_breaker.is_open()
 
-    def generate(self, prompt: str, max_tokens: int = 2000, temperature: float = 0.7) -> str:
-        """Generate a response from the configured AI provider."""
-        if not self.is_available():
+    def generate(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        system: Optional[str] = None,
+        layer: Optional[str] = None,
+        cancel_token: Optional[Any] = None,
+    ) -> str:
+        """Generate a response from the configured AI provider.
+
+        Args:
+            timeout: Per-call timeout in seconds, overriding the pool's read timeout
+            system: Shared system prefix; identical prefixes across calls are
+                served from the provider's prompt cache
+            layer: Name of the calling layer, used for logging (and by
+                simulated clients to pick per-layer behavior)
+            cancel_token: CancellationToken bounding the call (see class docstring)
+        """
+        self._local.usage = None
+        self._local.error = None
+        tag = f" [{layer}]" if layer else ""
+        if not (self._initialized and self.client is not None):
             return self._fallback(f"AI client not initialized (provider={self.provider})")
         if not prompt or not prompt.strip():
             return ""
-        try:
-            if self.provider == "anthropic":
-                return self._call_anthropic(prompt, max_tokens, temperature)
-            elif self.provider == "openai":
-                return self._call_openai(prompt, max_tokens, temperature)
+        if self.provider not in ("anthropic", "openai"):
             return self._fallback(f"Unsupported provider: {self.provider}")
+
+        estimated_tokens = (len(prompt) + len(system or "")) // 4 + max_tokens
+        attempts = self.pool_config.max_retries + 1
+        for attempt in range(attempts):
+            if cancel_token is not None and cancel_token.cancelled:
+                return self._fallback(f"cancelled: {cancel_token.reason}")
+            attempt_timeout, token_bound = self._bounded_timeout(timeout, cancel_token)
+            if not self.circuit_breaker.allow_request():
+                return self._fallback("circuit open: provider unhealthy")
+            if self.rate_limiter and not self.rate_limiter.acquire(estimated_tokens, timeout=attempt_timeout):
+                self.circuit_breaker.release_probe()
+                return self._fallback("rate limit wait exceeded timeout")
+            try:
+                if cancel_token is not None:
+                    text = self._call_cancellable(
+                        prompt, max_tokens, temperature, attempt_timeout, system, cancel_token,
+                    )
+                elif self.provider == "anthropic":
+                    text = self._call_anthropic(prompt, max_tokens, temperature, attempt_timeout, system)
+                else:
+                    text = self._call_openai(prompt, max_tokens, temperature, attempt_timeout, system)
+            except Exception as e:
+                if self._caused_by_token(e, cancel_token, token_bound):
+                    self.circuit_breaker.release_probe()
+                    logger.info(f"AI call cancelled{tag}: {cancel_token.reason or e}")
+                    return self._fallback(f"cancelled: {cancel_token.reason or e}", e)
+                if not is_retryable(e):
+                    logger.error(f"AI generation error{tag}: {e}")
+                    return self._fallback(str(e), e)
+                self.circuit_breaker.record_failure()
+                if status_code_of(e) == 429 and self.rate_limiter:
+                    self.rate_limiter.on_throttled()
+                if attempt == attempts - 1:
+                    logger.error(f"AI generation failed after {attempts} attempts{tag}: {e}")
+                    return self._fallback(str(e), e)
+                delay = retry_after_of(e) or backoff_delay(attempt)
+                logger.warning(f"Retryable AI error ({e}); retry {attempt + 1}/{attempts - 1} in {delay:.2f}s")
+                if cancel_token is not None:
+                    cancel_token.wait(delay)
+                else:
+                    time.sleep(delay)
+                continue
+            if text is None:
+                self.circuit_breaker.release_probe()
+                return self._fallback(f"cancelled: {cancel_token.reason}")
+            self.circuit_breaker.record_success()
+            if self.rate_limiter:
+                self.rate_limiter.on_success()
+            if self._local.usage is not None:
+                self._local.usage["retries"] = attempt
+            return text
+        return self._fallback("retries exhausted")
+
+    def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        system: Optional[str] = None,
+        layer: Optional[str] = None,
+        cancel_token: Optional[Any] = None,
+    ) -> Iterator[str]:
+        """Yield response text incrementally as the provider streams it.
+
+        Errors before the first chunk yield the FALLBACK_PREFIX sentinel (like
+        generate()); errors mid-stream are raised, since the text so far is
+        truncated. Closing the generator early closes the HTTP stream, which
+        is how callers cancel a response. Streams are not retried; a
+        ``cancel_token`` caps the timeout and keeps the failures it causes
+        off the circuit breaker.
+        """
+        self._local.usage = None
+        self._local.error = None
+        tag = f" [{layer}]" if layer else ""
+        if not (self._initialized and self.client is not None):
+            yield self._fallback(f"AI client not initialized (provider={self.provider})")
+            return
+        if not prompt or not prompt.strip():
+            return
+        if self.provider not in ("anthropic", "openai"):
+            yield self._fallback(f"Unsupported provider: {self.provider}")
+            return
+        if cancel_token is not None and cancel_token.cancelled:
+            yield self._fallback(f"cancelled: {cancel_token.reason}")
+            return
+        timeout, token_bound = self._bounded_timeout(timeout, cancel_token)
+        if not self.circuit_breaker.allow_request():
+            yield self._fallback("circuit open: provider unhealthy")
+            return
+        estimated_tokens = (len(prompt) + len(system or "")) // 4 + max_tokens
+        if self.rate_limiter and not self.rate_limiter.acquire(estimated_tokens, timeout=timeout):
+            self.circuit_breaker.release_probe()
+            yield self._fallback("rate limit wait exceeded timeout")
+            return
+
+        if self.provider == "anthropic":
+            chunks = self._stream_anthropic(prompt, max_tokens, temperature, timeout, system)
+        else:
+            chunks = self._stream_openai(prompt, max_tokens, temperature, timeout, system)
+        started = False
+        try:
+            for text in chunks:
+                started = True
+                yield text
+        except GeneratorExit:
+            chunks.close()
+            self.circuit_breaker.release_probe()
+            raise
         except Exception as e:
-            logger.error(f"AI generation error: {e}")
-            return self._fallback(str(e))
-
-    def _call_anthropic(self, prompt: str, max_tokens: int, temperature: float) -> str:
-        message = self.client.messages.create(
-            model=self.model,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            messages=[{"role": "user", "content": prompt}],
+            if self._caused_by_token(e, cancel_token, token_bound):
+                self.circuit_breaker.release_probe()
+            elif is_retryable(e):
+                self.circuit_breaker.record_failure()
+                if status_code_of(e) == 429 and self.rate_limiter:
+                    self.rate_limiter.on_throttled()
+            if started:
+                raise
+            logger.error(f"AI stream error{tag}: {e}")
+            yield self._fallback(str(e), e)
+            return
+        self.circuit_breaker.record_success()
+        if self.rate_limiter:
+            self.rate_limiter.on_success()
+
+    def _stream_anthropic(
+        self, prompt: str, max_tokens: int, temperature: float, timeout: Optional[float], system: Optional[str],
+    ) -> Iterator[str]:
+        stream_method = self.client.messages.stream
+        params = self._anthropic_params(prompt, max_tokens, temperature, timeout, system, stream_method)
+        with stream_method(**params) as stream:
+            for text in stream.text_stream:
+                if text:
+                    yield text
+            final = stream.get_final_message()
+        self._local.usage = self._anthropic_usage(getattr(final, "usage", None))
+
+    def _stream_openai(
+        self, prompt: str, max_tokens: int, temperature: float, timeout: Optional[float], system: Optional[str],
+    ) -> Iterator[str]:
+        params = self._openai_params(prompt, max_tokens, temperature, timeout, system)
+        response = self.client.chat.completions.create(
+            stream=True, stream_options={"include_usage": True}, **params,
         )
+        try:
+            for chunk in response:
+                if getattr(chunk, "usage", None) is not None:
+                    self._local.usage = self._openai_usage(chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
+
+    @staticmethod
+    def _bounded_timeout(timeout: Optional[float], token) -> Tuple[Optional[float], bool]:
+        """(timeout capped at the token's time left, whether the token set it)."""
+        remaining = token.remaining() if token is not None else None
+        if remaining is None or (timeout is not None and timeout < remaining):
+            return timeout, False
+        return remaining, True
+
+    @staticmethod
+    def _caused_by_token(error: BaseException, token, token_bound: bool) -> bool:
+        """Whether a failed call was ended by the caller's token rather than the provider."""
+        return token is not None and (token.cancelled or (token_bound and is_timeout(error)))
+
+    def _call_cancellable(
+        self, prompt: str, max_tokens: int, temperature: float, timeout: Optional[float], system: Optional[str], token,
+    ) -> Optional[str]:
+        """Stream one attempt, closing the response once ``token`` is cancelled (returns None then)."""
+        if self.provider == "anthropic":
+            chunks = self._stream_anthropic(prompt, max_tokens, temperature, timeout, system)
+        else:
+            chunks = self._stream_openai(prompt, max_tokens, temperature, timeout, system)
+        parts = []
+        try:
+            for text in chunks:
+                if token.cancelled:
+                    return None
+                parts.append(text)
+        finally:
+            chunks.close()
+        return "".join(parts)
+
+    @staticmethod
+    def _call_options(timeout: Optional[float]) -> dict:
+        return {"timeout": timeout} if timeout is not None else {}
+
+    def _anthropic_params(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        timeout: Optional[float],
+        system: Optional[str],
+        method: Optional[Callable] = None,
+    ) -> dict:
+        params = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}],
+            **self._call_options(timeout),
+        }
+        # Newer SDKs dropped the typed temperature argument; send it in the body
+        if method is not None and not _accepts_argument(method, "temperature"):
+            params["extra_body"] = {"temperature": params.pop("temperature")}
+        if system:
+            params["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+        return params
+
+    def _openai_params(
+        self, prompt: str, max_tokens: int, temperature: float, timeout: Optional[float], system: Optional[str],
+    ) -> dict:
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        return {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": messages,
+            **self._call_options(timeout),
+        }
+
+    def _anthropic_usage(self, usage) -> Optional[dict]:
+        if usage is None:
+            return None
+        return {
+            "model": self.model,
+            "retries": 0,
+            "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        }
+
+    def _openai_usage(self, usage) -> Optional[dict]:
+        if usage is None:
+            return None
+        # OpenAI counts cached tokens inside prompt_tokens; report them separately
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0
+        return {
+            "model": self.model,
+            "retries": 0,
+            "input_tokens": (getattr(usage, "prompt_tokens", 0) or 0) - cached,
+            "output_tokens": getattr(usage, "completion_tokens", 0) or 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": cached,
+        }
+
+    def _call_anthropic(
+        self, prompt: str, max_tokens: int, temperature: float, timeout: Optional[float], system: Optional[str],
+    ) -> str:
+        create = self.client.messages.create
+        message = create(**self._anthropic_params(prompt, max_tokens, temperature, timeout, system, create))
+        self._local.usage = self._anthropic_usage(getattr(message, "usage", None))
         if message.content:
             return message.content[0].text
         return ""
 
-    def _call_openai(self, prompt: str, max_tokens: int, temperature: float) -> str:
+    def _call_openai(
+        self, prompt: str, max_tokens: int, temperature: float, timeout: Optional[float], system: Optional[str],
+    ) -> str:
         response = self.client.chat.completions.create(
-            model=self.model,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            messages=[{"role": "user", "content": prompt}],
+            **self._openai_params(prompt, max_tokens, temperature, timeout, system),
         )
+        self._local.usage = self._openai_usage(getattr(response, "usage", None))
         if response.choices:
             return response.choices[0].message.content or ""
         return ""
 
-    @staticmethod
-    def _fallback(error_msg: str) -> str:
+    def _fallback(self, error_msg: str, error: Optional[BaseException] = None) -> str:
         logger.warning(f"AI fallback: {error_msg}")
-        return f"[AI unavailable: {error_msg}]"
+        self._local.error = error
+        return f"{FALLBACK_PREFIX} {error_msg}]"
+
+    def get_pool_stats(self) -> dict:
+        """Connection pool usage: in-flight/peak requests, open and idle connections."""
+        return pool_stats(self.http_client) if self.http_client is not None else {}
 
     def get_status(self) -> dict:
         return {
             "initialized": self._initialized,
             "provider": self.provider,
             "model": self.model,
+            "base_url": self.base_url,
             "anthropic_available": ANTHROPIC_AVAILABLE,
             "openai_available": OPENAI_AVAILABLE,
+            "pool": self.get_pool_stats(),
+            "circuit": self.circuit_breaker.snapshot(),
+            "rate_scale": self.rate_limiter.scale if self.rate_limiter else None,
         }
@@ -0,0 +1,295 @@
+"""Cross-request micro-batching for AIClient.
+
+BatchingAIClient wraps an AIClient and exposes the same generate() /
+is_available() interface, so operators and the conductor use it unchanged.
+Concurrent generate() calls - e.g. many compiles running in parallel during
+a catalog precompile - are held for a short window, coalesced into one
+batch, submitted through a BatchBackend, and the results fanned back out to
+the waiting callers.
+
+Backends:
+- LocalBatchBackend: runs the batch through the wrapped client's normal
+  generate() on a thread pool; a stand-in with the same interface
+- AnthropicBatchBackend: Anthropic Message Batches API (batch pricing,
+  asynchronous; results can take minutes)
+"""
+
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from utils.ai_client import FALLBACK_PREFIX, AIClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchRequest:
+    """One queued generate() call."""
+    custom_id: str
+    prompt: str
+    max_tokens: int = 2000
+    temperature: float = 0.7
+    system: Optional[str] = None
+    usage: Optional[dict] = None  # set by the backend (AIClient.last_usage keys)
+
+
+def _failed(reason: str) -> str:
+    return f"{FALLBACK_PREFIX} {reason}]"
+
+
+class BatchBackend(ABC):
+    """Submits a batch of requests and returns response text per custom_id.
+
+    Requests that fail must map to a FALLBACK_PREFIX sentinel string rather
+    than raise, matching AIClient.generate(). Backends that learn a request's
+    token usage store it on ``request.usage`` for the waiting caller.
+    """
+
+    @abstractmethod
+    def submit(self, requests: List[BatchRequest]) -> Dict[str, str]:
+        ...
+
+
+class LocalBatchBackend(BatchBackend):
+    """Executes each request through AIClient.generate() on a thread pool."""
+
+    def __init__(self, client: AIClient, max_workers: int = 8):
+        self.client = client
+        self.max_workers = max_workers
+
+    def submit(self, requests: List[BatchRequest]) -> Dict[str, str]:
+        def run(request: BatchRequest) -> str:
+            text = self.client.generate(
+                request.prompt,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+                system=request.system,
+            )
+            request.usage = getattr(self.client, "last_usage", None)
+            return text
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(requests))) as pool:
+            texts = list(pool.map(run, requests))
+        return {request.custom_id: text for request, text in zip(requests, texts)}
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Anthropic Message Batches API backend.
+
+    Args:
+        client: Initialized AIClient with provider="anthropic"
+        poll_interval: Seconds between batch status checks
+        max_wait: Give up (and return fallbacks) after this many seconds
+    """
+
+    def __init__(self, client: AIClient, poll_interval: float = 5.0, max_wait: float = 3600.0):
+        if client.provider != "anthropic":
+            raise ValueError("AnthropicBatchBackend requires an anthropic AIClient")
+        self.client = client
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+
+    def _params(self, request: BatchRequest) -> dict:
+        params = {
+            "model": self.client.model,
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature,
+            "messages": [{"role": "user", "content": request.prompt}],
+        }
+        if request.system:
+            params["system"] = [
+                {"type": "text", "text": request.system, "cache_control": {"type": "ephemeral"}},
+            ]
+        return params
+
+    def submit(self, requests: List[BatchRequest]) -> Dict[str, str]:
+        batches = self.client.client.messages.batches
+        batch = batches.create(requests=[
+            {"custom_id": request.custom_id, "params": self._params(request)} for request in requests
+        ])
+        deadline = time.monotonic() + self.max_wait
+        while batch.processing_status != "ended":
+            if time.monotonic() >= deadline:
+                logger.error(f"Batch {batch.id} still {batch.processing_status} after {self.max_wait}s")
+                return {request.custom_id: _failed("batch timed out") for request in requests}
+            time.sleep(self.poll_interval)
+            batch = batches.retrieve(batch.id)
+
+        by_id = {request.custom_id: request for request in requests}
+        results = {}
+        for entry in batches.results(batch.id):
+            result = entry.result
+            if result.type == "succeeded" and result.message.content:
+                results[entry.custom_id] = result.message.content[0].text
+                if entry.custom_id in by_id:
+                    by_id[entry.custom_id].usage = self._usage(getattr(result.message, "usage", None))
+            else:
+                results[entry.custom_id] = _failed(f"batch request {result.type}")
+        return results
+
+    def _usage(self, usage) -> Optional[dict]:
+        """AIClient.last_usage-style dict for one batch result, flagged as batch-priced."""
+        if usage is None:
+            return None
+        return {
+            "model": self.client.model,
+            "retries": 0,
+            "batched": True,
+            "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        }
+
+
+class BatchingAIClient:
+    """AIClient drop-in that coalesces concurrent generate() calls into batches.
+
+    Args:
+        client: The AIClient to wrap (availability checks and the local backend use it)
+        backend: BatchBackend to submit through (default: LocalBatchBackend)
+        window: Seconds to keep collecting after the first queued request
+        max_batch_size: Submit immediately once this many requests are queued
+        max_inflight_batches: Batches that may be outstanding at once
+        result_timeout: Max seconds generate() waits for its result (None = forever)
+    """
+
+    def __init__(
+        self,
+        client: AIClient,
+        backend: Optional[BatchBackend] = None,
+        window: float = 0.05,
+        max_batch_size: int = 100,
+        max_inflight_batches: int = 4,
+        result_timeout: Optional[float] = None,
+    ):
+        self.client = client
+        self.backend = backend or LocalBatchBackend(client)
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.result_timeout = result_timeout
+
+        self._pending: List[tuple] = []
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight_batches, thread_name_prefix="ai-batch")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="ai-batch-dispatch", daemon=True)
+        self.batches_submitted = 0
+        self.requests_submitted = 0
+        self._dispatcher.start()
+
+    @property
+    def provider(self) -> str:
+        return self.client.provider
+
+    @property
+    def model(self) -> Optional[str]:
+        return self.client.model
+
+    @property
+    def last_usage(self) -> Optional[dict]:
+        """Token usage the backend reported for this thread's most recent generate() call."""
+        return getattr(self._local, "usage", None)
+
+    def is_available(self) -> bool:
+        return not self._closed and self.client.is_available()
+
+    def generate(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        system: Optional[str] = None,
+        layer: Optional[str] = None,
+    ) -> str:
+        """Queue a request and block until its batch completes.
+
+        ``timeout`` bounds the wait for this result (defaults to result_timeout).
+        A request still queued when the wait gives up is withdrawn, so it is
+        never submitted.
+        """
+        self._local.usage = None
+        if not prompt or not prompt.strip():
+            return ""
+        future: Future = Future()
+        request = BatchRequest(uuid.uuid4().hex, prompt, max_tokens, temperature, system)
+        with self._cond:
+            if self._closed:
+                return _failed("batching client closed")
+            self._pending.append((request, future))
+            self._cond.notify()
+        try:
+            text, self._local.usage = future.result(timeout=timeout if timeout is not None else self.result_timeout)
+        except FutureTimeoutError:
+            with self._cond:
+                if (request, future) in self._pending:
+                    self._pending.remove((request, future))
+            return _failed("timed out waiting for batch result")
+        return text
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending:
+                    return
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+            if not batch:  # every request in the window was withdrawn
+                continue
+            self.batches_submitted += 1
+            self.requests_submitted += len(batch)
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: List[tuple]) -> None:
+        requests = [request for request, _ in batch]
+        try:
+            results = self.backend.submit(requests)
+        except Exception as e:
+            logger.error(f"Batch of {len(batch)} failed: {e}")
+            results = {}
+            reason = str(e)
+        else:
+            reason = "missing from batch results"
+        for request, future in batch:
+            future.set_result((results.get(request.custom_id, _failed(reason)), request.usage))
+
+    def close(self) -> None:
+        """Flush queued requests and stop the dispatcher."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "BatchingAIClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get_status(self) -> dict:
+        status = self.client.get_status()
+        status["batching"] = {
+            "backend": type(self.backend).__name__,
+            "window": self.window,
+            "batches_submitted": self.batches_submitted,
+            "requests_submitted": self.requests_submitted,
+        }
+        return status
@@ -0,0 +1,295 @@
+"""Load balancing and failover across several AIClient endpoints.
+
+AIClientPool presents the AIClient interface (generate / stream /
+is_available / last_usage / get_status) over a list of endpoints - any mix
+of providers, API keys and models. Each call is routed to the healthy
+endpoint with the best score:
+
+    score = ewma_latency * (1 + in_flight) * (1 + ERROR_PENALTY * ewma_error_rate)
+            / (weight * rate_scale)
+
+so slow, busy, failing or rate-throttled endpoints get less traffic.
+Endpoints not measured yet are scored with the fastest measured latency
+(PRIOR_LATENCY_MS before any measurement) and win ties, so they are
+explored early while their in-flight count still spreads a cold-start
+burst across the pool. A call that
+fails transiently (429, 5xx, timeouts, an open circuit) fails over to the
+next-best endpoint; a non-retryable error such as a 400 is returned as is,
+since every endpoint would reject the same request. Every endpoint keeps its own rate
+limiter and circuit breaker, so aggregate throughput scales with the number
+of keys. Health and the recent routing decisions are exposed via
+get_status().
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils.ai_client import FALLBACK_PREFIX, AIClient
+from utils.rate_limit import is_retryable
+
+logger = logging.getLogger(__name__)
+
+ERROR_PENALTY = 10.0
+PRIOR_LATENCY_MS = 1000.0  # latency assumed for every endpoint until one is measured
+
+
+class Endpoint:
+    """One AIClient plus its routing statistics."""
+
+    def __init__(self, name: str, client: AIClient, weight: float = 1.0, alpha: float = 0.2):
+        self.name = name
+        self.client = client
+        self.weight = weight
+        self.alpha = alpha
+        self.latency_ms: Optional[float] = None  # EWMA of successful call latency
+        self.error_rate = 0.0  # EWMA of failure indicator
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self.last_error = ""
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return self.client.is_available()
+
+    def score(self, prior_latency_ms: float = PRIOR_LATENCY_MS) -> float:
+        """Routing cost (lower is better); ``prior_latency_ms`` stands in until a call is measured."""
+        with self._lock:
+            latency = self.latency_ms if self.latency_ms is not None else prior_latency_ms
+            in_flight = self.in_flight
+            error_rate = self.error_rate
+        limiter = getattr(self.client, "rate_limiter", None)
+        rate_scale = limiter.scale if limiter else 1.0
+        return latency * (1 + in_flight) * (1 + ERROR_PENALTY * error_rate) / (self.weight * rate_scale)
+
+    def begin(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.calls += 1
+
+    def finish(self, latency_ms: Optional[float], ok: bool, error: str = "") -> None:
+        """Record a finished call; ``latency_ms`` None skips the latency update."""
+        with self._lock:
+            self.in_flight -= 1
+            self.error_rate += self.alpha * ((0.0 if ok else 1.0) - self.error_rate)
+            if ok and latency_ms is not None:
+                if self.latency_ms is None:
+                    self.latency_ms = latency_ms
+                else:
+                    self.latency_ms += self.alpha * (latency_ms - self.latency_ms)
+            elif not ok:
+                self.errors += 1
+                self.last_error = error
+
+    def snapshot(self, prior_latency_ms: float = PRIOR_LATENCY_MS) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "name": self.name,
+                "provider": self.client.provider,
+                "model": self.client.model,
+                "weight": self.weight,
+                "latency_ewma_ms": round(self.latency_ms, 1) if self.latency_ms is not None else None,
+                "error_rate": round(self.error_rate, 3),
+                "in_flight": self.in_flight,
+                "calls": self.calls,
+                "errors": self.errors,
+                "last_error": self.last_error,
+            }
+        stats["available"] = self.is_available()
+        stats["score"] = round(self.score(prior_latency_ms), 1)
+        breaker = getattr(self.client, "circuit_breaker", None)
+        stats["circuit"] = breaker.state if breaker else None
+        return stats
+
+
+class AIClientPool:
+    """Routes AIClient calls across endpoints by latency, load and error rate.
+
+    Args:
+        clients: AIClients to balance over
+        weights: Optional relative capacity per client (default 1.0 each)
+        names: Optional endpoint names (default "<provider>:<model>#<i>")
+        alpha: EWMA smoothing factor for latency and error rate
+        log_size: Routing decisions kept for get_status()
+    """
+
+    def __init__(
+        self,
+        clients: List[AIClient],
+        weights: Optional[List[float]] = None,
+        names: Optional[List[str]] = None,
+        alpha: float = 0.2,
+        log_size: int = 200,
+    ):
+        if not clients:
+            raise ValueError("AIClientPool needs at least one client")
+        weights = weights or [1.0] * len(clients)
+        names = names or [f"{c.provider}:{c.model}#{i}" for i, c in enumerate(clients)]
+        self.endpoints = [Endpoint(n, c, w, alpha) for n, c, w in zip(names, clients, weights)]
+        self.routing_log: deque = deque(maxlen=log_size)
+        self._local = threading.local()
+        self._route_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "AIClientPool":
+        """Build from AI_ENDPOINTS, e.g. ``anthropic:claude-sonnet-4-5:ANTHROPIC_KEY_2,openai:gpt-4o``.
+
+        Each entry is ``provider[:model[:API_KEY_ENV_VAR]]``; the key variable
+        defaults to the provider's standard one.
+        """
+        spec = os.getenv("AI_ENDPOINTS", "")
+        clients = []
+        for entry in filter(None, (e.strip() for e in spec.split(","))):
+            provider, model, key_var = (entry.split(":") + [None, None])[:3]
+            api_key = os.getenv(key_var) if key_var else None
+            clients.append(AIClient(provider=provider, model=model or None, api_key=api_key))
+        if not clients:
+            clients = [AIClient()]
+        return cls(clients, **kwargs)
+
+    def _shared(self, attr: str) -> Optional[str]:
+        values = sorted({str(getattr(e.client, attr)) for e in self.endpoints if getattr(e.client, attr, None)})
+        return ",".join(values) or None
+
+    @property
+    def provider(self) -> Optional[str]:
+        """The endpoints' provider, or a comma-joined list when they differ."""
+        return self._shared("provider")
+
+    @property
+    def model(self) -> Optional[str]:
+        """The endpoints' model, or a comma-joined list when they differ."""
+        return self._shared("model")
+
+    @property
+    def last_usage(self) -> Optional[dict]:
+        """Usage of this thread's last call, tagged with the endpoint that served it."""
+        return getattr(self._local, "usage", None)
+
+    def is_available(self) -> bool:
+        return any(endpoint.is_available() for endpoint in self.endpoints)
+
+    def prior_latency_ms(self) -> float:
+        """Latency assumed for unmeasured endpoints: the fastest measured one."""
+        measured = [e.latency_ms for e in self.endpoints if e.latency_ms is not None]
+        return min(measured) if measured else PRIOR_LATENCY_MS
+
+    def ranked(self) -> List[Endpoint]:
+        """Available endpoints, best score first (unmeasured ones win ties)."""
+        prior = self.prior_latency_ms()
+        candidates = [e for e in self.endpoints if e.is_available()]
+        return sorted(candidates, key=lambda e: (e.score(prior), e.latency_ms is not None))
+
+    def _route(self) -> List[Endpoint]:
+        """Rank endpoints and begin() a call on the best one atomically, so a
+        burst of concurrent callers sees each other's in-flight counts."""
+        with self._route_lock:
+            ranked = self.ranked()
+            if ranked:
+                ranked[0].begin()
+        return ranked
+
+    def _log(self, endpoint: Endpoint, attempt: int, outcome: str, latency_ms: float) -> None:
+        self.routing_log.append({
+            "time": time.time(),
+            "endpoint": endpoint.name,
+            "attempt": attempt,
+            "outcome": outcome,
+            "latency_ms": round(latency_ms, 1),
+        })
+
+    def _tag_usage(self, endpoint: Endpoint) -> None:
+        usage = getattr(endpoint.client, "last_usage", None)
+        self._local.usage = {**usage, "endpoint": endpoint.name} if usage else None
+
+    @staticmethod
+    def _fails_over(endpoint: Endpoint, error: Optional[BaseException]) -> bool:
+        """Whether a failed call may be retried elsewhere.
+
+        Failures without an exception (open circuit, rate-limit wait, client
+        not initialized) are endpoint-local and always fail over.
+        """
+        error = error or getattr(endpoint.client, "last_error", None)
+        return error is None or is_retryable(error)
+
+    def generate(self, prompt: str, **kwargs) -> str:
+        """Generate via the best endpoint, failing over to the next on transient errors."""
+        self._local.usage = None
+        ranked = self._route()
+        if not ranked:
+            return f"{FALLBACK_PREFIX} no healthy endpoints]"
+        result = ""
+        for attempt, endpoint in enumerate(ranked):
+            if attempt:
+                endpoint.begin()
+            start = time.monotonic()
+            error = None
+            try:
+                result = endpoint.client.generate(prompt, **kwargs)
+            except Exception as e:
+                error = e
+                result = f"{FALLBACK_PREFIX} {e}]"
+            latency_ms = (time.monotonic() - start) * 1000
+            ok = not result.startswith(FALLBACK_PREFIX)
+            endpoint.finish(latency_ms, ok, "" if ok else result)
+            self._log(endpoint, attempt, "ok" if ok else "failed", latency_ms)
+            if ok:
+                self._tag_usage(endpoint)
+                return result
+            if not self._fails_over(endpoint, error):
+                logger.error(f"Endpoint {endpoint.name} rejected the request: {result}")
+                return result
+            logger.warning(f"Endpoint {endpoint.name} failed, failing over: {result}")
+        return result
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream via the best endpoint; fails over only before the first chunk."""
+        self._local.usage = None
+        ranked = self._route()
+        if not ranked:
+            yield f"{FALLBACK_PREFIX} no healthy endpoints]"
+            return
+        for attempt, endpoint in enumerate(ranked):
+            if attempt:
+                endpoint.begin()
+            start = time.monotonic()
+            chunks = endpoint.client.stream(prompt, **kwargs)
+            ok, cancelled, error = False, False, ""
+            try:
+                first = next(chunks, "")
+                if first.startswith(FALLBACK_PREFIX):
+                    error = first
+                    if attempt < len(ranked) - 1 and self._fails_over(endpoint, None):
+                        continue
+                    yield first
+                    return
+                if first:
+                    yield first
+                yield from chunks
+                ok = True
+            except GeneratorExit:
+                ok = cancelled = True  # caller cancelled; not the endpoint's fault
+                raise
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                chunks.close()
+                latency_ms = (time.monotonic() - start) * 1000
+                # A cancelled stream's duration says nothing about endpoint latency
+                endpoint.finish(None if cancelled else latency_ms, ok, error)
+                self._log(endpoint, attempt, "cancelled" if cancelled else ("ok" if ok else "failed"), latency_ms)
+                if ok:
+                    self._tag_usage(endpoint)
+            return
+
+    def get_status(self) -> dict:
+        return {
+            "available": self.is_available(),
+            "endpoints": [endpoint.snapshot(self.prior_latency_ms()) for endpoint in self.endpoints],
+            "routing_log": list(self.routing_log)[-20:],
+        }
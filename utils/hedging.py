@@ -0,0 +1,205 @@
+"""Hedged requests for AIClient tail-latency control.
+
+HedgedAIClient wraps an AIClient (or pool) and, for calls made with
+``hedge=True``, sends a duplicate request once the primary has been
+outstanding longer than the layer's observed p95 latency; whichever
+successful response arrives first is returned and the other is left to
+finish in the background. Hedges draw on a global budget: every call earns
+``hedge_budget`` credits (capped at ``max_credit``) and each hedge spends
+one, so duplicates stay a bounded fraction of traffic (10% by default).
+
+Operators request hedging per profile: set ``settings.hedge_requests: true``
+in the profile YAML and the conductor marks every step of that profile.
+Until a layer has ``min_samples`` latency observations it is not hedged.
+stream() is passed through unhedged.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+from utils.ai_client import FALLBACK_PREFIX
+
+logger = logging.getLogger(__name__)
+
+
+def _quantile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class HedgedAIClient:
+    """AIClient wrapper that hedges slow calls against a global budget.
+
+    Args:
+        client: Wrapped AIClient (or any object with its interface)
+        hedge_budget: Hedge credits earned per call (0.1 = at most ~10% extra requests)
+        max_credit: Cap on accumulated credits (bounds bursts of hedges)
+        quantile: Latency quantile after which a call is hedged
+        min_samples: Observations a layer needs before it can be hedged
+        window: Latest successful latencies kept per layer
+        min_delay_ms: Lower bound on the hedge delay
+        hedge_by_default: Hedge calls that don't pass ``hedge`` explicitly
+        max_workers: Threads running primary and hedge requests
+    """
+
+    supports_hedging = True
+
+    def __init__(
+        self,
+        client,
+        hedge_budget: float = 0.1,
+        max_credit: float = 10.0,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+        min_delay_ms: float = 50.0,
+        hedge_by_default: bool = False,
+        max_workers: int = 16,
+    ):
+        self.client = client
+        self.hedge_budget = hedge_budget
+        self.max_credit = max_credit
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay_ms = min_delay_ms
+        self.hedge_by_default = hedge_by_default
+        self._credit = 0.0
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-hedge")
+        self.stats = {
+            "calls": 0, "hedged": 0, "hedge_wins": 0, "budget_exhausted": 0,
+            "wasted_input_tokens": 0, "wasted_output_tokens": 0,
+        }
+
+    @property
+    def provider(self) -> str:
+        return self.client.provider
+
+    @property
+    def model(self) -> Optional[str]:
+        return self.client.model
+
+    @property
+    def last_usage(self) -> Optional[dict]:
+        """Usage of this thread's last call; ``hedged`` is True if a duplicate was sent."""
+        return getattr(self._local, "usage", None)
+
+    def is_available(self) -> bool:
+        return self.client.is_available()
+
+    def hedge_delay_ms(self, layer: Optional[str]) -> Optional[float]:
+        """The layer's current hedge trigger, or None while it has too few samples."""
+        with self._lock:
+            samples = self._latencies.get(layer or "default")
+            if not samples or len(samples) < self.min_samples:
+                return None
+            return max(self.min_delay_ms, _quantile(samples, self.quantile))
+
+    def _observe(self, layer: Optional[str], latency_ms: float) -> None:
+        with self._lock:
+            samples = self._latencies.setdefault(layer or "default", deque(maxlen=self.window))
+            samples.append(latency_ms)
+
+    def _take_credit(self) -> bool:
+        with self._lock:
+            if self._credit >= 1.0:
+                self._credit -= 1.0
+                self.stats["hedged"] += 1
+                return True
+            self.stats["budget_exhausted"] += 1
+            return False
+
+    def _call(self, prompt: str, layer: Optional[str], kwargs: dict) -> Tuple[str, Optional[dict]]:
+        start = time.monotonic()
+        text = self.client.generate(prompt, layer=layer, **kwargs)
+        ok = bool(text) and not text.startswith(FALLBACK_PREFIX)
+        if ok:
+            self._observe(layer, (time.monotonic() - start) * 1000)
+        return text, getattr(self.client, "last_usage", None) if ok else None
+
+    def _count_waste(self, future: Future) -> None:
+        """Done-callback for the losing request: its tokens were billed for nothing."""
+        try:
+            _, usage = future.result()
+        except Exception:
+            return
+        if usage:
+            with self._lock:
+                self.stats["wasted_input_tokens"] += usage.get("input_tokens", 0)
+                self.stats["wasted_output_tokens"] += usage.get("output_tokens", 0)
+
+    def generate(self, prompt: str, hedge: Optional[bool] = None, layer: Optional[str] = None, **kwargs) -> str:
+        """Generate text, sending a hedge if the call outlives the layer's p95."""
+        self._local.usage = None
+        with self._lock:
+            self.stats["calls"] += 1
+            self._credit = min(self.max_credit, self._credit + self.hedge_budget)
+
+        delay_ms = self.hedge_delay_ms(layer) if (self.hedge_by_default if hedge is None else hedge) else None
+        if delay_ms is None:
+            text, usage = self._call(prompt, layer, kwargs)
+            self._local.usage = usage
+            return text
+
+        primary = self._executor.submit(self._call, prompt, layer, kwargs)
+        done, _ = wait([primary], timeout=delay_ms / 1000)
+        if done or not self._take_credit():
+            text, usage = primary.result()
+            self._local.usage = usage
+            return text
+
+        logger.debug(f"Hedging {layer or 'call'} after {delay_ms:.0f}ms")
+        backup = self._executor.submit(self._call, prompt, layer, kwargs)
+        pending = {primary, backup}
+        text, usage = "", None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                text, usage = future.result()
+                if text and not text.startswith(FALLBACK_PREFIX):
+                    break
+            else:
+                continue
+            for loser in pending:
+                loser.add_done_callback(self._count_waste)
+            if future is backup:
+                with self._lock:
+                    self.stats["hedge_wins"] += 1
+            break
+        self._local.usage = {**usage, "hedged": True} if usage else None
+        return text
+
+    def stream(self, prompt: str, hedge: Optional[bool] = None, **kwargs) -> Iterator[str]:
+        """Streams are not hedged: the first chunk already bounds perceived latency."""
+        self._local.usage = None
+        yield from self.client.stream(prompt, **kwargs)
+        self._local.usage = getattr(self.client, "last_usage", None)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self) -> "HedgedAIClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get_status(self) -> dict:
+        status = self.client.get_status()
+        with self._lock:
+            stats = dict(self.stats)
+            stats["credit"] = round(self._credit, 2)
+            stats["p95_ms"] = {
+                layer: round(_quantile(samples, self.quantile), 1)
+                for layer, samples in self._latencies.items()
+                if len(samples) >= self.min_samples
+            }
+        status["hedging"] = stats
+        return status
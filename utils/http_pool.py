@@ -0,0 +1,175 @@
+"""Shared HTTP connection pool for AI provider clients.
+
+Both the anthropic and openai SDKs sit on httpx - or, in newer releases,
+on its successor package ``httpx2``, which rejects plain ``httpx.Client``
+objects. Handing an SDK one shared client built from its own httpx module
+gives every provider and every thread the same keep-alive pool, so
+concurrent compiles reuse connections instead of churning them. The
+transport is metered so pool usage can be inspected when sizing workers.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from types import ModuleType
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection pool, timeout, and retry settings for provider HTTP clients."""
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 120.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 10.0
+    max_retries: int = 2
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """Build from AI_POOL_* environment variables, falling back to defaults."""
+        defaults = cls()
+        values = {}
+        for name, default in asdict(defaults).items():
+            raw = os.getenv(f"AI_POOL_{name.upper()}")
+            if raw is None:
+                continue
+            try:
+                values[name] = type(default)(raw)
+            except ValueError:
+                logger.warning(f"Ignoring invalid AI_POOL_{name.upper()}={raw!r}")
+        return cls(**values)
+
+    def timeout(self, module: Optional[ModuleType] = None):
+        return (module or httpx).Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    def limits(self, module: Optional[ModuleType] = None):
+        return (module or httpx).Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class _Metered:
+    """Mixin for an HTTPTransport that counts requests and tracks in-flight concurrency."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self.total_errors = 0
+
+    def handle_request(self, request):
+        with self._lock:
+            self.in_flight += 1
+            self.total_requests += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return super().handle_request(request)
+        except Exception:
+            with self._lock:
+                self.total_errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        connections = list(getattr(self._pool, "connections", []))
+        idle = sum(1 for c in connections if getattr(c, "is_idle", lambda: False)())
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "total_requests": self.total_requests,
+                "total_errors": self.total_errors,
+                "open_connections": len(connections),
+                "idle_connections": idle,
+            }
+
+
+if HTTPX_AVAILABLE:
+
+    class MeteredTransport(_Metered, httpx.HTTPTransport):
+        """httpx.HTTPTransport with request and concurrency metering."""
+
+
+_transport_classes: Dict[str, type] = {}
+
+
+def _transport_class(module: ModuleType) -> type:
+    if HTTPX_AVAILABLE and module is httpx:
+        return MeteredTransport
+    if module.__name__ not in _transport_classes:
+        _transport_classes[module.__name__] = type("MeteredTransport", (_Metered, module.HTTPTransport), {})
+    return _transport_classes[module.__name__]
+
+
+def sdk_httpx_module(sdk: Any) -> Optional[ModuleType]:
+    """The httpx flavour (``httpx2`` or ``httpx``) an SDK package builds its clients from.
+
+    Falls back to httpx when the SDK does not say (e.g. test doubles).
+    """
+    base_client = getattr(sdk, "_base_client", None)
+    for name in ("httpx2", "httpx"):
+        module = getattr(base_client, name, None)
+        if isinstance(module, ModuleType):
+            return module
+    return httpx if HTTPX_AVAILABLE else None
+
+
+_shared_clients: Dict[Tuple[PoolConfig, str], Tuple[Any, _Metered]] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_http_client(config: Optional[PoolConfig] = None, module: Optional[ModuleType] = None):
+    """Return the process-wide client for this pool config and httpx module (created once)."""
+    if module is None:
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx not installed")
+        module = httpx
+    config = config or PoolConfig()
+    key = (config, module.__name__)
+    with _shared_lock:
+        entry = _shared_clients.get(key)
+        if entry is None or entry[0].is_closed:
+            transport = _transport_class(module)(limits=config.limits(module))
+            client = module.Client(transport=transport, timeout=config.timeout(module))
+            entry = (client, transport)
+            _shared_clients[key] = entry
+        return entry[0]
+
+
+def pool_stats(client) -> Dict[str, int]:
+    """Usage metrics for a client created by get_shared_http_client()."""
+    transport = getattr(client, "_transport", None)
+    if isinstance(transport, _Metered):
+        return transport.stats()
+    return {}
+
+
+def close_shared_clients() -> None:
+    """Close every shared client (e.g. at process shutdown or between tests)."""
+    with _shared_lock:
+        for client, _ in _shared_clients.values():
+            client.close()
+        _shared_clients.clear()
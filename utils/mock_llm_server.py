@@ -0,0 +1,420 @@
+"""Local mock LLM HTTP server for end-to-end load testing.
+
+Speaks enough of the Anthropic Messages (POST .../v1/messages) and OpenAI
+Chat Completions (POST .../chat/completions) wire formats - including SSE
+streaming and usage blocks - for AIClient and the provider SDKs to run
+against it unchanged. Point AIClient at it with ``base_url=server.base_url``
+(or AI_BASE_URL) to load-test connection pooling, rate limiting, retries
+and streaming without a network.
+
+Knobs: fixed + jittered latency, streaming speed (tokens/sec), a
+requests-per-minute cap and a concurrency cap (both answered with 429 and
+Retry-After), and random 429 injection. The default responder answers
+operator prompts with a JSON object containing every key the prompt lists
+(``- "key": ...``), so compiles produce schema-valid layers.
+
+Run standalone::
+
+    python -m utils.mock_llm_server --port 8089 --latency-ms 400 --rate-429 0.05
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+_LISTED_KEY = re.compile(r'^\s*-\s*"(\w+)"\s*:(.*)$', re.MULTILINE)
+_LAYER_SECTION = re.compile(r'^## Layer "(\w+)"\n', re.MULTILINE)
+
+Responder = Callable[[str, Optional[str], str], str]
+
+
+def schema_responder(prompt: str, system: Optional[str], model: str) -> str:
+    """Answer with a JSON object holding every key the prompt lists.
+
+    Each value follows the type the key's description names (list, dict,
+    boolean, float - text otherwise). Fused prompts (one ``## Layer "<name>"``
+    section per layer) get one nested object per layer.
+    """
+    def fill(text: str) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for key, description in _LISTED_KEY.findall(text):
+            values.setdefault(key, _mock_value(key, description))
+        return values
+
+    sections = _LAYER_SECTION.split(prompt)
+    if len(sections) > 1:
+        layers = dict(zip(sections[1::2], sections[2::2]))
+        return json.dumps({layer: fill(text) for layer, text in layers.items()})
+    keys = fill(prompt)
+    return json.dumps(keys or {"text": f"Mock response to a {len(prompt)}-character prompt."})
+
+
+def _mock_value(key: str, description: str) -> Any:
+    text = f"Mock {key.replace('_', ' ')}."
+    description = description.strip().lower()
+    if description.startswith("list") or "(list" in description:
+        return [text]
+    if description.startswith("dict") or "(dict" in description:
+        return {key: text}
+    if description.startswith("boolean"):
+        return False
+    if description.startswith("float"):
+        return 0.5
+    return text
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _chunks(text: str, size: int = 12) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+class MockLLMServer:
+    """Threaded local server emulating the Anthropic and OpenAI chat APIs.
+
+    Args:
+        host, port: Bind address (port 0 picks a free port)
+        latency_ms: Base delay before a response (or before the first stream event)
+        jitter_ms: Uniform extra delay in [0, jitter_ms]
+        tokens_per_second: Streaming speed; None streams as fast as possible
+        rpm: Requests-per-minute cap; excess requests get 429 + Retry-After
+        max_concurrency: In-flight cap; excess requests get 429 + Retry-After
+        rate_429: Probability of a random 429 regardless of load
+        responder: Callable(prompt, system, model) -> response text
+        seed: RNG seed for jitter and 429 injection
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        tokens_per_second: Optional[float] = None,
+        rpm: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        rate_429: float = 0.0,
+        responder: Optional[Responder] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_second = tokens_per_second
+        self.max_concurrency = max_concurrency
+        self.rate_429 = rate_429
+        self.responder = responder or schema_responder
+        self._bucket = TokenBucket(rpm, rpm / 60.0) if rpm else None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cached_prefixes: set = set()
+        self.stats = {
+            "requests": 0, "anthropic": 0, "openai": 0, "streamed": 0,
+            "rejected_429": 0, "in_flight": 0, "peak_in_flight": 0, "connections": 0,
+        }
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    # ── Lifecycle ───────────────────────────────────────────────
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="mock-llm", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    # ── Request handling ────────────────────────────────────────
+
+    def _admit(self) -> Optional[float]:
+        """Count the request in; return a Retry-After (seconds) if it must be rejected."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.max_concurrency is not None and self.stats["in_flight"] >= self.max_concurrency:
+                return 1.0
+            if self.rate_429 > 0 and self._rng.random() < self.rate_429:
+                return 1.0
+            if self._bucket is not None:
+                wait = self._bucket.try_acquire()
+                if wait > 0:
+                    return wait
+            self.stats["in_flight"] += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+        return None
+
+    def _release(self) -> None:
+        with self._lock:
+            self.stats["in_flight"] -= 1
+
+    def _delay(self) -> None:
+        with self._lock:
+            jitter = self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        if self.latency_ms or jitter:
+            time.sleep((self.latency_ms + jitter) / 1000)
+
+    def _token_gap(self, text: str) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return _count_tokens(text) / self.tokens_per_second
+
+    def _cache_tokens(self, system: Optional[str], cacheable: bool) -> Tuple[int, int]:
+        """(cache_creation, cache_read) tokens for a system prefix."""
+        if not system or not cacheable:
+            return 0, 0
+        tokens = _count_tokens(system)
+        with self._lock:
+            if system in self._cached_prefixes:
+                return 0, tokens
+            self._cached_prefixes.add(system)
+        return tokens, 0
+
+    @staticmethod
+    def _text_of(content) -> str:
+        if isinstance(content, str):
+            return content
+        return "".join(block.get("text", "") for block in content or [] if isinstance(block, dict))
+
+    def _anthropic(self, body: dict) -> Tuple[dict, Optional[Iterator[str]]]:
+        system_blocks = body.get("system")
+        system = self._text_of(system_blocks) if system_blocks else None
+        cacheable = isinstance(system_blocks, list) and any("cache_control" in b for b in system_blocks)
+        prompt = "\n".join(self._text_of(m.get("content")) for m in body.get("messages", []) if m.get("role") == "user")
+        model = body.get("model", "mock")
+        text = self.responder(prompt, system, model)
+        created, read = self._cache_tokens(system, cacheable)
+        usage = {
+            "input_tokens": _count_tokens(prompt) + (_count_tokens(system) - created - read if system else 0),
+            "output_tokens": _count_tokens(text),
+            "cache_creation_input_tokens": created,
+            "cache_read_input_tokens": read,
+        }
+        message = {
+            "id": f"msg_mock_{uuid.uuid4().hex[:20]}",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": usage,
+        }
+        if not body.get("stream"):
+            return message, None
+
+        def events() -> Iterator[str]:
+            start = {**message, "content": [], "stop_reason": None, "usage": {**usage, "output_tokens": 0}}
+            yield self._sse({"type": "message_start", "message": start}, "message_start")
+            yield self._sse({"type": "content_block_start", "index": 0,
+                             "content_block": {"type": "text", "text": ""}}, "content_block_start")
+            for piece in _chunks(text):
+                time.sleep(self._token_gap(piece))
+                yield self._sse({"type": "content_block_delta", "index": 0,
+                                 "delta": {"type": "text_delta", "text": piece}}, "content_block_delta")
+            yield self._sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+            yield self._sse({"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                             "usage": {"output_tokens": usage["output_tokens"]}}, "message_delta")
+            yield self._sse({"type": "message_stop"}, "message_stop")
+
+        return message, events()
+
+    def _openai(self, body: dict) -> Tuple[dict, Optional[Iterator[str]]]:
+        messages = body.get("messages", [])
+        system = "\n".join(self._text_of(m.get("content")) for m in messages if m.get("role") == "system") or None
+        prompt = "\n".join(self._text_of(m.get("content")) for m in messages if m.get("role") == "user")
+        model = body.get("model", "mock")
+        text = self.responder(prompt, system, model)
+        _, cached = self._cache_tokens(system, cacheable=True)
+        prompt_tokens = _count_tokens(prompt) + (_count_tokens(system) if system else 0)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": _count_tokens(text),
+            "total_tokens": prompt_tokens + _count_tokens(text),
+            "prompt_tokens_details": {"cached_tokens": cached},
+        }
+        completion_id = f"chatcmpl-mock{uuid.uuid4().hex[:20]}"
+        created = int(time.time())
+        if not body.get("stream"):
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop", "logprobs": None}],
+                "usage": usage,
+            }, None
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(delta: dict, finish: Optional[str] = None, chunk_usage: Optional[dict] = None) -> str:
+            choices = [] if chunk_usage else [{"index": 0, "delta": delta, "finish_reason": finish, "logprobs": None}]
+            return self._sse({"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                              "model": model, "choices": choices, "usage": chunk_usage})
+
+        def events() -> Iterator[str]:
+            yield chunk({"role": "assistant", "content": ""})
+            for piece in _chunks(text):
+                time.sleep(self._token_gap(piece))
+                yield chunk({"content": piece})
+            yield chunk({}, finish="stop")
+            if include_usage:
+                yield chunk({}, chunk_usage=usage)
+            yield "data: [DONE]\n\n"
+
+        return {}, events()
+
+    @staticmethod
+    def _sse(data: dict, event: Optional[str] = None) -> str:
+        prefix = f"event: {event}\n" if event else ""
+        return f"{prefix}data: {json.dumps(data)}\n\n"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.stats["connections"] += 1
+
+            def log_message(self, format, *args):
+                logger.debug("mock-llm: " + format, *args)
+
+            def _send_json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/stats"):
+                    self._send_json(200, server.get_stats())
+                else:
+                    self._send_json(200, {"status": "ok"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send_json(400, {"error": {"type": "invalid_request_error", "message": "invalid JSON"}})
+                    return
+
+                path = self.path.split("?")[0].rstrip("/")
+                if path.endswith("/messages"):
+                    api = "anthropic"
+                elif path.endswith("/chat/completions"):
+                    api = "openai"
+                else:
+                    self._send_json(404, {"error": {"type": "not_found_error", "message": self.path}})
+                    return
+
+                retry_after = server._admit()
+                if retry_after is not None:
+                    with server._lock:
+                        server.stats["rejected_429"] += 1
+                    error = {"type": "rate_limit_error", "message": "mock rate limit exceeded"}
+                    if api == "anthropic":
+                        payload = {"type": "error", "error": error}
+                    else:
+                        payload = {"error": {**error, "code": "rate_limit_exceeded"}}
+                    self._send_json(429, payload, {"retry-after": f"{retry_after:.3f}"})
+                    return
+
+                try:
+                    with server._lock:
+                        server.stats[api] += 1
+                    server._delay()
+                    payload, events = (server._anthropic if api == "anthropic" else server._openai)(body)
+                    if events is None:
+                        self._send_json(200, payload)
+                        return
+                    with server._lock:
+                        server.stats["streamed"] += 1
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Cache-Control", "no-cache")
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    self.close_connection = True
+                    for event in events:
+                        self.wfile.write(event.encode("utf-8"))
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+                finally:
+                    server._release()
+
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local mock Anthropic/OpenAI server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument("--rpm", type=float, default=None)
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockLLMServer(
+        host=args.host, port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        tokens_per_second=args.tokens_per_second, rpm=args.rpm, max_concurrency=args.max_concurrency,
+        rate_429=args.rate_429, seed=args.seed,
+    )
+    logger.info(f"Mock LLM server listening on {server.base_url} (set AI_BASE_URL to use it)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Client-side rate limiting, retry backoff, and circuit breaking for AI calls.
+
+- RateLimiter: requests-per-minute + tokens-per-minute token buckets with
+  AIMD adaptation (halve the rate on a 429, creep back up on success)
+- backoff_delay: full-jitter exponential backoff
+- CircuitBreaker: opens after consecutive provider failures so callers can
+  switch to template fallbacks, half-opens after a cooldown to probe recovery
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+RETRYABLE_ERROR_NAMES = {
+    "APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError",
+    "ConnectError", "ConnectTimeout", "ReadTimeout", "ReadError", "RemoteProtocolError",
+    "TimeoutError", "ConnectionError",
+}
+TIMEOUT_ERROR_NAMES = {"APITimeoutError", "ConnectTimeout", "ReadTimeout", "TimeoutException", "TimeoutError"}
+
+
+def status_code_of(exc: BaseException) -> Optional[int]:
+    """Best-effort HTTP status extraction from SDK / httpx exceptions."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def retry_after_of(exc: BaseException) -> Optional[float]:
+    """Seconds from a Retry-After header on the exception's response, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient provider errors worth retrying: 429, 5xx, timeouts, connection drops."""
+    status = status_code_of(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(exc).__mro__)
+
+
+def is_timeout(exc: BaseException) -> bool:
+    """Whether the error is a client-side timeout (as opposed to a provider error response)."""
+    return any(cls.__name__ in TIMEOUT_ERROR_NAMES for cls in type(exc).__mro__)
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0, rng: Optional[random.Random] = None) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    rng = rng or random
+    return rng.uniform(0.0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate`` tokens/sec."""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """Take ``amount`` tokens if available; otherwise return seconds to wait (0.0 on success)."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            if self.rate <= 0:
+                return float("inf")
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until ``amount`` tokens are taken; False if ``timeout`` expires first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(amount)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or wait > remaining:
+                    return False
+            time.sleep(min(wait, 1.0))
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter with AIMD adaptation.
+
+    Args:
+        rpm: Max requests per minute (None = unlimited)
+        tpm: Max tokens (prompt estimate + max_tokens) per minute (None = unlimited)
+        min_scale: Lowest fraction of the configured rate AIMD may throttle to
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None, min_scale: float = 0.1):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.min_scale = min_scale
+        self.scale = 1.0
+        self._lock = threading.Lock()
+        self._requests = TokenBucket(rpm, rpm / 60.0) if rpm else None
+        self._tokens = TokenBucket(tpm, tpm / 60.0) if tpm else None
+
+    @classmethod
+    def from_env(cls) -> Optional["RateLimiter"]:
+        """Build from AI_RPM / AI_TPM; None when neither is set."""
+        rpm = os.getenv("AI_RPM")
+        tpm = os.getenv("AI_TPM")
+        if not rpm and not tpm:
+            return None
+        return cls(rpm=float(rpm) if rpm else None, tpm=float(tpm) if tpm else None)
+
+    def acquire(self, tokens: int = 0, timeout: Optional[float] = None) -> bool:
+        """Block until one request (and ``tokens`` tokens) fit under the limits."""
+        if self._requests and not self._requests.acquire(1, timeout):
+            return False
+        if self._tokens and tokens and not self._tokens.acquire(tokens, timeout):
+            return False
+        return True
+
+    def _apply_scale(self) -> None:
+        if self._requests:
+            self._requests.rate = self.rpm / 60.0 * self.scale
+        if self._tokens:
+            self._tokens.rate = self.tpm / 60.0 * self.scale
+
+    def on_throttled(self) -> None:
+        """Multiplicative decrease after a 429."""
+        with self._lock:
+            self.scale = max(self.min_scale, self.scale * 0.5)
+            self._apply_scale()
+        logger.warning(f"Rate limited by provider; client rate scaled to {self.scale:.2f}")
+
+    def on_success(self) -> None:
+        """Additive increase back toward the configured rate."""
+        if self.scale >= 1.0:
+            return
+        with self._lock:
+            self.scale = min(1.0, self.scale + 0.05)
+            self._apply_scale()
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    closed -> open after ``failure_threshold`` failures in a row;
+    open -> half_open once ``reset_timeout`` seconds have passed;
+    half_open -> closed on the next success, back to open on a failure.
+
+    While half-open only one caller at a time is admitted as a probe; the
+    rest are refused until it reports back. A probe that never reports
+    (cancelled, or failed without a record_* call) is replaced after another
+    ``reset_timeout``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if now - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Whether the caller may contact the provider; claims the probe when half-open."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state != self.HALF_OPEN:
+                return state == self.CLOSED
+            if self._probe_started is not None and now - self._probe_started < self.reset_timeout:
+                return False
+            self._probe_started = now
+            return True
+
+    def is_open(self) -> bool:
+        """Whether requests are being refused, without claiming a probe."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == self.HALF_OPEN:
+                return self._probe_started is not None and now - self._probe_started < self.reset_timeout
+            return state == self.OPEN
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe that ended without a verdict, e.g. one the caller cancelled."""
+        with self._lock:
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            half_open = self._opened_at is not None
+            if half_open or self._failures >= self.failure_threshold:
+                if not half_open:
+                    logger.error(f"Circuit opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+
+    def snapshot(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self._failures}
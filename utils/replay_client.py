@@ -0,0 +1,269 @@
+"""Record/replay AI clients for offline benchmarks with realistic timing.
+
+RecordingAIClient wraps a live AIClient and appends every successful
+response to a JSONL cassette. ReplayAIClient is a drop-in AIClient that
+serves those responses by prompt hash, sleeping for a latency sampled from a
+per-layer distribution and injecting errors at a configured rate, so
+conductor concurrency, caching and streaming changes can be benchmarked in
+CI without network access - unlike generate_fallback(), which returns
+instantly and hides latency problems.
+
+Cassette line format::
+
+    {"key": "<sha256>", "layer": "activation", "prompt": "<first 200 chars>",
+     "response": "...", "usage": {...}, "latency_ms": 812.4}
+"""
+
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Optional, Union
+
+from utils.ai_client import FALLBACK_PREFIX
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_key(prompt: str, system: Optional[str] = None) -> str:
+    """Cassette key: sha256 of the system prefix and the prompt."""
+    digest = hashlib.sha256()
+    digest.update((system or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_cassette(path: Union[str, Path]) -> Dict[str, dict]:
+    """Read a cassette into {key: entry}; later entries win."""
+    entries: Dict[str, dict] = {}
+    path = Path(path)
+    if not path.exists():
+        return entries
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                entries[entry["key"]] = entry
+    return entries
+
+
+@dataclass(frozen=True)
+class LognormalLatency:
+    """Lognormal latency with the given median (ms) and log-space sigma."""
+    median_ms: float
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.median_ms), self.sigma)
+
+
+class RecordingAIClient:
+    """Wraps a live client and records successful responses to a cassette."""
+
+    def __init__(self, client, cassette_path: Union[str, Path]):
+        self.client = client
+        self.cassette_path = Path(cassette_path)
+        self.cassette_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @property
+    def last_usage(self) -> Optional[dict]:
+        return getattr(self.client, "last_usage", None)
+
+    def is_available(self) -> bool:
+        return self.client.is_available()
+
+    def generate(self, prompt: str, system: Optional[str] = None, layer: Optional[str] = None, **kwargs) -> str:
+        start = time.monotonic()
+        text = self.client.generate(prompt, system=system, layer=layer, **kwargs)
+        if text and not text.startswith(FALLBACK_PREFIX):
+            self._record(prompt, system, layer, text, (time.monotonic() - start) * 1000)
+        return text
+
+    def _record(self, prompt: str, system: Optional[str], layer: Optional[str], text: str, latency_ms: float) -> None:
+        entry = {
+            "key": prompt_key(prompt, system),
+            "layer": layer,
+            "prompt": prompt[:200],
+            "response": text,
+            "usage": self.last_usage,
+            "latency_ms": round(latency_ms, 1),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock, open(self.cassette_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def get_status(self) -> dict:
+        status = self.client.get_status()
+        status["recording_to"] = str(self.cassette_path)
+        return status
+
+
+class ReplayAIClient:
+    """Drop-in AIClient serving cassette responses with simulated latency and errors.
+
+    Args:
+        cassette_path: JSONL cassette written by RecordingAIClient
+        latency: One LognormalLatency for every call, or a mapping of layer
+            name to LognormalLatency with an optional "default" entry
+            (None = no delay)
+        error_rate: Probability of an injected provider failure, globally or
+            per layer (mapping with optional "default")
+        on_miss: "fallback" returns the AI-unavailable sentinel for unknown
+            prompts (operators use their template fallback); "raise" raises KeyError
+        time_scale: Multiplier on every sampled delay (e.g. 0.01 in CI)
+        stream_chunk_chars: Chunk size stream() splits responses into
+        ttft_fraction: Share of the latency spent before the first streamed chunk
+        seed: RNG seed for reproducible latency/error sequences
+    """
+
+    def __init__(
+        self,
+        cassette_path: Union[str, Path],
+        latency: Union[LognormalLatency, Mapping[str, LognormalLatency], None] = None,
+        error_rate: Union[float, Mapping[str, float]] = 0.0,
+        on_miss: str = "fallback",
+        time_scale: float = 1.0,
+        stream_chunk_chars: int = 16,
+        ttft_fraction: float = 0.3,
+        seed: Optional[int] = None,
+    ):
+        if on_miss not in ("fallback", "raise"):
+            raise ValueError("on_miss must be 'fallback' or 'raise'")
+        self.cassette_path = Path(cassette_path)
+        self.entries = load_cassette(cassette_path)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.on_miss = on_miss
+        self.time_scale = time_scale
+        self.stream_chunk_chars = stream_chunk_chars
+        self.ttft_fraction = ttft_fraction
+        self.provider = "replay"
+        self.model = "replay"
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {"calls": 0, "hits": 0, "misses": 0, "injected_errors": 0, "simulated_ms": 0.0}
+
+    @property
+    def last_usage(self) -> Optional[dict]:
+        return getattr(self._local, "usage", None)
+
+    def is_available(self) -> bool:
+        return True
+
+    @staticmethod
+    def _for_layer(setting, layer: Optional[str]):
+        if isinstance(setting, Mapping):
+            return setting.get(layer, setting.get("default")) if layer else setting.get("default")
+        return setting
+
+    def _delay_ms(self, layer: Optional[str]) -> float:
+        model = self._for_layer(self.latency, layer)
+        if model is None:
+            return 0.0
+        with self._rng_lock:
+            return model.sample(self._rng) * self.time_scale
+
+    def _inject_error(self, layer: Optional[str]) -> bool:
+        rate = self._for_layer(self.error_rate, layer) or 0.0
+        with self._rng_lock:
+            return self._rng.random() < rate
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _lookup(self, prompt: str, system: Optional[str], layer: Optional[str]):
+        """Return (text, delay_ms, ok); text is a sentinel when not ok."""
+        self._count("calls")
+        delay = self._delay_ms(layer)
+        self._count("simulated_ms", delay)
+        if self._inject_error(layer):
+            self._count("injected_errors")
+            return f"{FALLBACK_PREFIX} injected error (replay)]", delay, False
+        entry = self.entries.get(prompt_key(prompt, system))
+        if entry is None:
+            self._count("misses")
+            if self.on_miss == "raise":
+                raise KeyError(f"No cassette entry for prompt (layer={layer}): {prompt[:80]!r}")
+            return f"{FALLBACK_PREFIX} cassette miss (replay)]", delay, False
+        self._count("hits")
+        self._local.usage = entry.get("usage")
+        return entry["response"], delay, True
+
+    def generate(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        system: Optional[str] = None,
+        layer: Optional[str] = None,
+        cancel_token=None,
+    ) -> str:
+        self._local.usage = None
+        if not prompt or not prompt.strip():
+            return ""
+        text, delay_ms, _ = self._lookup(prompt, system, layer)
+        if timeout is not None and delay_ms / 1000 > timeout:
+            self._sleep(timeout, cancel_token)
+            self._local.usage = None
+            return f"{FALLBACK_PREFIX} timed out after {timeout}s (replay)]"
+        if self._sleep(delay_ms / 1000, cancel_token):
+            self._local.usage = None
+            return f"{FALLBACK_PREFIX} cancelled: {cancel_token.reason} (replay)]"
+        return text
+
+    @staticmethod
+    def _sleep(seconds: float, token) -> bool:
+        """Sleep, cut short if ``token`` is cancelled; return whether it was."""
+        if token is None:
+            time.sleep(seconds)
+            return False
+        return token.wait(seconds)
+
+    def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        system: Optional[str] = None,
+        layer: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Yield the replayed response in chunks, spreading the sampled latency."""
+        self._local.usage = None
+        if not prompt or not prompt.strip():
+            return
+        text, delay_ms, ok = self._lookup(prompt, system, layer)
+        usage = self._local.usage
+        time.sleep(delay_ms * (self.ttft_fraction if ok else 1.0) / 1000)
+        if not ok:
+            yield text
+            return
+        size = max(1, self.stream_chunk_chars)
+        chunks = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        gap = delay_ms * (1 - self.ttft_fraction) / 1000 / max(1, len(chunks) - 1)
+        for i, chunk in enumerate(chunks):
+            if i:
+                time.sleep(gap)
+            yield chunk
+        self._local.usage = usage
+
+    def get_status(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {
+            "provider": self.provider,
+            "cassette": str(self.cassette_path),
+            "entries": len(self.entries),
+            **stats,
+        }